@@ -0,0 +1,62 @@
+"""Measure the cost of a key press with shortcuts, as the number of widgets grows.
+
+A key press matching a shortcut is handled by the accelerator table of the manager, while
+one without a shortcut goes to every widget, e.g.::
+
+    python benchmarks/accelerators.py --counts 10 1000 10000
+"""
+
+import argparse
+from time import perf_counter
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    "--counts", type=int, nargs="+", default=[10, 1000, 10000], help="widget counts"
+)
+parser.add_argument("--presses", type=int, default=1000, help="number of key presses")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.window import Window, key
+
+from goldenui.manager import GUIManager
+from goldenui.widget import TextButton
+
+
+def measure(manager: GUIManager, symbol: int, modifiers: int) -> float:
+    start = perf_counter()
+    for _ in range(args.presses):
+        manager.on_key_press(symbol, modifiers)
+    return (perf_counter() - start) / args.presses
+
+
+if __name__ == "__main__":
+    window = Window(400, 300, "Benchmark - Accelerators", visible=False)
+    for count in args.counts:
+        manager = GUIManager(window)
+        manager.add(
+            *(
+                TextButton(
+                    "Button",
+                    (i % 100) * 130,
+                    (i // 100) * 40,
+                    120,
+                    30,
+                    batch=manager._batch,
+                )
+                for i in range(count)
+            )
+        )
+        for symbol in (key.A, key.B, key.C, key.D, key.E):
+            manager.accelerators.add((symbol, key.MOD_CTRL), lambda: None)
+        matched = measure(manager, key.A, key.MOD_CTRL)
+        unmatched = measure(manager, key.Z, key.MOD_CTRL)
+        print(
+            f"{count:>6} widgets: shortcut {matched * 1e6:8.2f} us, "
+            f"no shortcut {unmatched * 1e6:8.2f} us"
+        )
+        manager.enabled = False
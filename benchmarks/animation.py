@@ -0,0 +1,62 @@
+"""Measure the cost of animating many widgets.
+
+Tween the position of a lot of TextButtons at once and report the time of one animation
+tick, which must fit in a frame at 60 fps with room for drawing, e.g.::
+
+    python benchmarks/animation.py --count 5000
+"""
+
+import argparse
+from time import perf_counter
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--count", type=int, default=5000, help="number of widgets")
+parser.add_argument("--ticks", type=int, default=120, help="number of ticks")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.window import Window
+
+from goldenui.animation import Animator
+from goldenui.manager import GUIManager
+from goldenui.widget import TextButton
+
+if __name__ == "__main__":
+    window = Window(400, 300, "Benchmark - Animation", visible=False)
+    manager = GUIManager(window)
+    widgets = [
+        TextButton(
+            "Button",
+            (i % 100) * 130,
+            (i // 100) * 40,
+            120,
+            30,
+            batch=manager._batch,
+        )
+        for i in range(args.count)
+    ]
+    manager.add(*widgets)
+    animator = Animator()
+    easings = ["linear", "out_cubic", "out_back"]
+    for i, widget in enumerate(widgets):
+        animator.tween(
+            widget,
+            args.ticks / 60 + 1,
+            x=widget.x + 100,
+            y=widget.y + 50,
+            easing=easings[i % len(easings)],
+        )
+    # The first tick gathers vertex lists of all widgets.
+    start = perf_counter()
+    animator.tick(1 / 60)
+    first = perf_counter() - start
+    start = perf_counter()
+    for _ in range(args.ticks - 1):
+        animator.tick(1 / 60)
+    per_tick = (perf_counter() - start) / (args.ticks - 1)
+    print(f"{args.count} widgets: first tick {first * 1000:.2f} ms")
+    print(f"{args.count} widgets: {per_tick * 1000:.2f} ms/tick")
@@ -0,0 +1,117 @@
+"""Create and dispose widgets over and over, and watch what stays behind.
+
+Every round adds a batch of buttons, text inputs, containers, plots and image views to a
+manager, then disposes them. Python heap bytes (traced by tracemalloc), vertex domains,
+allocated vertices, live widgets and live textures should stay flat from round to
+round. Exit with status 1 if they grow after the first round, e.g.::
+
+    python benchmarks/churn.py --total 100000 --batch 1000
+
+Pass ``--remove`` to only remove widgets from the manager instead of disposing them, and
+leave them to the garbage collector.
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from weakref import WeakSet
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--total", type=int, default=100000, help="widgets in total")
+parser.add_argument("--batch", type=int, default=1000, help="widgets per round")
+parser.add_argument(
+    "--remove", action="store_true", help="remove widgets instead of disposing them"
+)
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.gl import glIsTexture
+from pyglet.window import Window
+
+from goldenui.manager import GUIManager
+from goldenui.widget import CenterContainer, ImageView, Plot, TextButton, TextInput
+from goldenui.widget.base import WidgetBase, _get_detached_batch
+
+# Every widget ever created, to count the ones which are still alive.
+created: WeakSet[WidgetBase] = WeakSet()
+
+
+def create(window: Window, i: int) -> WidgetBase:
+    x, y = (i % 20) * 60, (i // 20 % 20) * 30
+    kind = i % 100
+    if kind == 0:
+        widget = ImageView((16, 16), x, y, 50, 25)
+    elif kind == 1:
+        widget = Plot(x, y, 50, 25, series=2)
+        widget.append(0.5, 0.25)
+    elif kind < 20:
+        button = TextButton("Inner", 0, 0, 40, 20)
+        created.add(button)
+        widget = CenterContainer(window, button, x, y, 50, 25)
+    elif kind < 40:
+        widget = TextInput("Text", x, y, 50, 25)
+    else:
+        widget = TextButton("Button", x, y, 50, 25)
+    created.add(widget)
+    return widget
+
+
+def vertex_domains(manager: GUIManager) -> tuple[int, int]:
+    """The number of vertex domains, and of vertices allocated in them."""
+    domains = vertices = 0
+    for batch in [layer.batch for layer in manager.layers] + [_get_detached_batch()]:
+        for domain_map in batch.group_map.values():
+            for domain in domain_map.values():
+                domains += 1
+                vertices += sum(domain.allocator.get_allocated_regions()[1])
+    return domains, vertices
+
+
+if __name__ == "__main__":
+    window = Window(1200, 600, "Benchmark - Churn", visible=False)
+    manager = GUIManager(window)
+    tracemalloc.start()
+    rounds = []
+    # Names of every texture created, to count the ones which still exist.
+    textures: list[int] = []
+    for start in range(0, args.total, args.batch):
+        widgets = [create(window, i) for i in range(start, start + args.batch)]
+        manager.add(*widgets)
+        manager.draw()
+        textures.extend(w.texture.id for w in widgets if isinstance(w, ImageView))
+        for widget in widgets:
+            if args.remove:
+                manager.remove(widget)
+            else:
+                widget.dispose()
+        del widgets, widget
+        gc.collect()
+        # Like a frame: the clock drops unscheduled functions, e.g. blinking of carets,
+        # and the draw list of a batch, which drops empty domains, is updated by drawing.
+        pyglet.clock.tick()
+        manager.draw()
+        record = (
+            tracemalloc.get_traced_memory()[0],
+            *vertex_domains(manager),
+            len(created),
+            sum(bool(glIsTexture(texture)) for texture in textures),
+        )
+        rounds.append(record)
+        if len(rounds) in (1, 2) or len(rounds) % 10 == 0:
+            print(
+                f"{start + args.batch:>7} widgets: heap {record[0] / 1e6:7.2f} MB, "
+                f"domains {record[1]:>5}, vertices {record[2]:>7}, "
+                f"live widgets {record[3]:>6}, live textures {record[4]:>5}"
+            )
+    tracemalloc.stop()
+    # The first round warms up caches like glyphs and shader programs.
+    first, last = rounds[min(1, len(rounds) - 1)], rounds[-1]
+    grown = last[0] > first[0] * 1.1 or any(a > b for a, b in zip(last[1:], first[1:]))
+    if grown:
+        print("resources grew while churning")
+        sys.exit(1)
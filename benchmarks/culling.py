@@ -0,0 +1,66 @@
+"""Measure drawing a board much larger than the window, with and without culling.
+
+Lay out TextButtons on a board ten times the size of the window, scroll the view across
+it and report the time of a frame, e.g.::
+
+    python benchmarks/culling.py --count 20000
+"""
+
+import argparse
+from time import perf_counter
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--count", type=int, default=20000, help="number of widgets")
+parser.add_argument("--frames", type=int, default=60, help="number of frames")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.math import Mat4, Vec3
+from pyglet.window import Window
+
+from goldenui.manager import GUIManager
+from goldenui.widget import TextButton
+
+
+def measure(window: Window, culling: bool) -> tuple[float, dict]:
+    manager = GUIManager(window, culling=culling)
+    columns = 200
+    manager.add(
+        *(
+            TextButton(
+                f"Button {i}",
+                (i % columns) * 130,
+                (i // columns) * 40,
+                120,
+                30,
+                batch=manager._batch,
+            )
+            for i in range(args.count)
+        )
+    )
+    start = perf_counter()
+    for frame in range(args.frames):
+        scroll = frame * 40
+        window.view = Mat4.from_translation(Vec3(-scroll, 0, 0))
+        manager.viewport = (scroll, 0, window.width, window.height)
+        manager.draw()
+    pyglet.gl.glFinish()
+    elapsed = (perf_counter() - start) / args.frames
+    stats = manager.stats()["culling"]
+    manager.remove(*manager._ranges)
+    window.view = Mat4()
+    return elapsed, stats
+
+
+if __name__ == "__main__":
+    window = Window(1280, 720, "Benchmark - Culling", visible=False)
+    for culling in (False, True):
+        elapsed, stats = measure(window, culling)
+        print(
+            f"culling {'on' if culling else 'off':>3}: {elapsed * 1000:.2f} ms/frame, "
+            f"{stats['visible']} visible, {stats['culled']} culled"
+        )
@@ -0,0 +1,83 @@
+"""Measure streaming frames into an image view, against new images per frame.
+
+The naive way creates an ``ImageData`` for every frame and gives it to a sprite, which
+creates a new texture each time. ``ImageView`` uploads into one texture through pixel
+buffer objects, e.g.::
+
+    python benchmarks/image_view.py --size 1280 720 --frames 200
+"""
+
+import argparse
+from time import perf_counter
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    "--size", type=int, nargs=2, default=[640, 480], help="width and height of frames"
+)
+parser.add_argument("--frames", type=int, default=200, help="number of frames")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+import numpy as np
+from pyglet.gl import glFinish
+from pyglet.image import ImageData
+from pyglet.sprite import Sprite
+from pyglet.window import Window
+
+from goldenui.manager import GUIManager
+from goldenui.widget import ImageView
+
+if __name__ == "__main__":
+    width, height = args.size
+    window = Window(width, height, "Benchmark - Image View", visible=False)
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, (height, width, 4), np.uint8) for _ in range(4)]
+
+    manager = GUIManager(window)
+    sprite = Sprite(ImageData(width, height, "RGBA", frames[0].tobytes()))
+    start = perf_counter()
+    for i in range(args.frames):
+        frame = frames[i % len(frames)]
+        sprite.image = ImageData(width, height, "RGBA", frame.tobytes())
+        sprite.draw()
+    glFinish()
+    naive = (perf_counter() - start) / args.frames
+
+    view = ImageView((width, height), 0, 0)
+    manager.add(view)
+    start = perf_counter()
+    for i in range(args.frames):
+        view.submit(frames[i % len(frames)])
+        manager.draw()
+    glFinish()
+    streamed = (perf_counter() - start) / args.frames
+
+    # A producer submitting several frames per drawn frame.
+    start = perf_counter()
+    for i in range(args.frames):
+        for j in range(4):
+            view.submit(frames[j])
+        manager.draw()
+    glFinish()
+    outrun = (perf_counter() - start) / args.frames
+
+    start = perf_counter()
+    for i in range(args.frames):
+        view.submit(frames[i % len(frames)][:64, :64].copy(), rect=(0, 0, 64, 64))
+        manager.draw()
+    glFinish()
+    partial = (perf_counter() - start) / args.frames
+
+    print(f"{width}x{height}, {args.frames} frames")
+    for name, seconds in [
+        ("new image per frame", naive),
+        ("image view", streamed),
+        ("4 submits per frame", outrun),
+        ("64x64 rect per frame", partial),
+    ]:
+        print(f"{name + ':':<22}{seconds * 1e3:6.2f} ms/frame")
+    print("stats:", view.stats())
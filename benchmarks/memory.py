@@ -0,0 +1,86 @@
+"""Measure how many bytes a widget costs.
+
+Create a lot of TextButtons in a manager and report Python heap bytes (traced by
+tracemalloc, including the CPU side copies of vertex buffers) per widget. Exit with
+status 1 if a budget is given and exceeded, e.g.::
+
+    python benchmarks/memory.py --count 10000 --count 100000 --budget 16000
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    "--count",
+    type=int,
+    action="append",
+    help="number of widgets, can be given several times (default: 10000 and 100000)",
+)
+parser.add_argument(
+    "--budget", type=float, default=16000, help="maximum bytes per widget"
+)
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.window import Window
+
+from goldenui.manager import GUIManager
+from goldenui.widget import TextButton
+
+
+def vertex_bytes(manager: GUIManager) -> int:
+    total = 0
+    for domain_map in manager._batch.group_map.values():
+        for domain in domain_map.values():
+            for buffer in domain.attrib_name_buffers.values():
+                total += buffer.size
+    return total
+
+
+def measure(window: Window, count: int) -> tuple[float, float]:
+    manager = GUIManager(window)
+    # Create the first widget outside of tracing, so that shared data like the skin
+    # images and shader programs are not counted.
+    manager.add(TextButton("Button", 0, 0, 120, 30, batch=manager._batch))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    widgets = [
+        TextButton(
+            "Button",
+            (i % 100) * 130,
+            (i // 100) * 40,
+            120,
+            30,
+            batch=manager._batch,
+        )
+        for i in range(count)
+    ]
+    manager.add(*widgets)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count, vertex_bytes(manager) / (count + 1)
+
+
+if __name__ == "__main__":
+    window = Window(400, 300, "Benchmark - Memory", visible=False)
+    exceeded = False
+    for count in args.count or [10000, 100000]:
+        per_widget, per_widget_vertex = measure(window, count)
+        print(
+            f"{count:>7} widgets: {per_widget:10.1f} bytes/widget "
+            f"({per_widget_vertex:.1f} bytes/widget in vertex buffers)"
+        )
+        if per_widget > args.budget:
+            exceeded = True
+    if exceeded:
+        print(f"budget of {args.budget:.0f} bytes/widget exceeded")
+        sys.exit(1)
@@ -0,0 +1,130 @@
+"""Measure plots fed at kHz rates, against rebuilding lines every frame.
+
+Every frame appends the samples of one frame at the given rate to every plot, then draws
+them, e.g.::
+
+    python benchmarks/plot.py --plots 1 10 50 --rate 1000
+
+Exit with status 1 if a plot isn't drawn.
+"""
+
+import argparse
+import math
+import sys
+from collections import deque
+from time import perf_counter
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    "--plots", type=int, nargs="+", default=[1, 10, 50], help="plot counts"
+)
+parser.add_argument("--rate", type=int, default=1000, help="samples per second")
+parser.add_argument("--history", type=int, default=2000, help="samples shown")
+parser.add_argument("--frames", type=int, default=60, help="number of frames")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.gl import glFinish
+from pyglet.graphics import Batch
+from pyglet.image import get_buffer_manager
+from pyglet.shapes import Line
+from pyglet.window import Window
+
+from goldenui.manager import GUIManager
+from goldenui.widget import Plot
+
+width, height = 300, 40
+per_frame = args.rate // 60
+
+
+def samples(frame: int) -> list[tuple[float, float]]:
+    start = frame * per_frame
+    return [
+        (math.sin(i / 50), math.cos(i / 70)) for i in range(start, start + per_frame)
+    ]
+
+
+def naive(count: int) -> float:
+    """Rebuild a line per pair of pixel columns of every series each frame."""
+    histories = [deque(maxlen=args.history) for _ in range(count)]
+    start = perf_counter()
+    for frame in range(args.frames):
+        batch = Batch()
+        lines = []
+        new_samples = samples(frame)
+        for i, history in enumerate(histories):
+            history.extend(new_samples)
+            y0 = (i % 20) * (height + 2)
+            step = max(1, len(history) // width)
+            points = list(history)[::step]
+            for series in range(2):
+                for x, (a, b) in enumerate(zip(points, points[1:])):
+                    lines.append(
+                        Line(
+                            x,
+                            y0 + (a[series] + 1) * height / 2,
+                            x + 1,
+                            y0 + (b[series] + 1) * height / 2,
+                            batch=batch,
+                        )
+                    )
+        batch.draw()
+    glFinish()
+    return (perf_counter() - start) / args.frames
+
+
+def streamed(count: int) -> float:
+    manager = GUIManager(window)
+    plots = [
+        Plot(
+            0,
+            (i % 20) * (height + 2),
+            width,
+            height,
+            series=2,
+            history=args.history,
+            y_range=(-1.0, 1.0),
+        )
+        for i in range(count)
+    ]
+    manager.add(*plots)
+    start = perf_counter()
+    for frame in range(args.frames):
+        new_samples = samples(frame)
+        window.clear()
+        for plot in plots:
+            plot.extend(new_samples)
+        manager.draw()
+    glFinish()
+    elapsed = (perf_counter() - start) / args.frames
+    check_drawn(plots[:20])
+    manager.dispose()
+    return elapsed
+
+
+def check_drawn(plots: list[Plot]):
+    """Exit with status 1 if a plot left its area blank."""
+    buffer = get_buffer_manager().get_color_buffer().get_image_data()
+    pixels = buffer.get_data("RGBA", buffer.width * 4)
+    for i, plot in enumerate(plots):
+        lit = 0
+        for y in range(plot.y, plot.y + plot.height):
+            row = pixels[y * buffer.width * 4 : (y + 1) * buffer.width * 4]
+            lit += sum(1 for x in range(plot.x, plot.x + plot.width) if row[4 * x + 1])
+        if not lit:
+            print(f"plot {i} was not drawn")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    window = Window(width, 20 * (height + 2), "Benchmark - Plot", visible=False)
+    print(f"{per_frame} samples per frame, {args.history} samples shown, 2 series")
+    for count in args.plots:
+        print(
+            f"{count:>4} plots: rebuilt lines {naive(count) * 1e3:8.2f} ms/frame, "
+            f"plot {streamed(count) * 1e3:6.2f} ms/frame"
+        )
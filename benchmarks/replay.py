@@ -0,0 +1,81 @@
+"""Replay an input trace against a standard set of widgets.
+
+Record a trace with goldenui.trace.TraceRecorder in a window showing the same widgets as
+this benchmark, or generate a synthetic one, then replay it as fast as possible and report
+throughput, latency percentiles and the digest of widget states, e.g.::
+
+    python benchmarks/replay.py --generate session.trace --events 20000
+    python benchmarks/replay.py session.trace
+
+The same trace must give the same digest on every version.
+"""
+
+import argparse
+import random
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("trace", help="path of the trace")
+parser.add_argument("--count", type=int, default=1000, help="number of widgets")
+parser.add_argument("--generate", action="store_true", help="write a synthetic trace")
+parser.add_argument("--events", type=int, default=20000, help="events to generate")
+parser.add_argument("--realtime", action="store_true", help="keep timing of the trace")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.window import Window, mouse
+
+from goldenui.manager import GUIManager
+from goldenui.trace import TraceRecorder, replay
+from goldenui.widget import TextButton
+
+
+def generate(manager: GUIManager, path: str, events: int):
+    """Write random mouse moves and clicks over the widgets, with some typing."""
+    rng = random.Random(0)
+    width = min(args.count, 100) * 130
+    height = (args.count // 100 + 1) * 40
+    with TraceRecorder(manager, path) as recorder:
+        x, y = 0, 0
+        for i in range(events):
+            nx, ny = rng.randrange(width), rng.randrange(height)
+            if i % 10 == 0:
+                recorder.record("on_mouse_press", nx, ny, mouse.LEFT, 0)
+                recorder.record("on_mouse_release", nx, ny, mouse.LEFT, 0)
+            elif i % 25 == 0:
+                recorder.record("on_text", "a")
+            else:
+                recorder.record("on_mouse_motion", nx, ny, nx - x, ny - y)
+            x, y = nx, ny
+
+
+if __name__ == "__main__":
+    window = Window(400, 300, "Benchmark - Replay", visible=False)
+    manager = GUIManager(window)
+    manager.add(
+        *(
+            TextButton(
+                f"Button {i}",
+                (i % 100) * 130,
+                (i // 100) * 40,
+                120,
+                30,
+                batch=manager._batch,
+            )
+            for i in range(args.count)
+        )
+    )
+    if args.generate:
+        generate(manager, args.trace, args.events)
+    else:
+        report = replay(args.trace, manager, realtime=args.realtime)
+        latency = report["latency"]
+        print(f"{report['events']} events in {report['time']:.3f} s")
+        print(f"{report['events_per_second']:.0f} events/s")
+        print(
+            "latency: " + ", ".join(f"{k} {v * 1e6:.1f} us" for k, v in latency.items())
+        )
+        print(f"digest: {report['digest']}")
@@ -0,0 +1,74 @@
+"""Measure the time from loading a UI file to the first frame.
+
+Generate a file with many TextButtons, then load it through goldenui.declarative without
+the compiled cache, and twice with it (the first run writes the cache), e.g.::
+
+    python benchmarks/startup.py --count 2000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from time import perf_counter
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--count", type=int, default=2000, help="number of widgets")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.window import Window
+
+from goldenui import declarative
+from goldenui.manager import GUIManager
+
+
+def measure(
+    window: Window, path: str, cache_dir: str, cache: bool
+) -> tuple[float, float]:
+    manager = GUIManager(window)
+    start = perf_counter()
+    declarative.load(path, manager, cache=cache, cache_dir=cache_dir)
+    loaded = perf_counter()
+    manager.draw()
+    pyglet.gl.glFinish()
+    end = perf_counter()
+    # Stop the manager from handling window events and drawing during later runs.
+    manager.dispose()
+    manager.enabled = False
+    return loaded - start, end - start
+
+
+if __name__ == "__main__":
+    window = Window(400, 300, "Benchmark - Startup", visible=False)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "ui.json")
+        widgets = [
+            {
+                "type": "TextButton",
+                "id": f"button{i}",
+                "text": f"Button {i}",
+                "x": (i % 100) * 130,
+                "y": (i // 100) * 40,
+                "width": 120,
+                "height": 30,
+            }
+            for i in range(args.count)
+        ]
+        with open(path, "w") as file:
+            json.dump({"widgets": widgets}, file)
+        cache_dir = os.path.join(temp_dir, "cache")
+        for name, cache in [
+            ("no cache", False),
+            ("cold cache", True),
+            ("warm cache", True),
+        ]:
+            load_time, frame_time = measure(window, path, cache_dir, cache)
+            print(
+                f"{name:>10}: {load_time * 1000:8.1f} ms to load, "
+                f"{frame_time * 1000:8.1f} ms to first frame"
+            )
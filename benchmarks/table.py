@@ -0,0 +1,72 @@
+"""Measure a table of columnar data, as the number of rows grows.
+
+Scrolling should cost the same for any number of rows, sorting and filtering are done
+by NumPy without a Python object per row, e.g.::
+
+    python benchmarks/table.py --counts 10000 1000000
+"""
+
+import argparse
+from time import perf_counter
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    "--counts", type=int, nargs="+", default=[10000, 1000000], help="row counts"
+)
+parser.add_argument("--steps", type=int, default=50, help="number of scroll steps")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+import numpy as np
+from pyglet.window import Window
+
+from goldenui.manager import GUIManager
+from goldenui.widget.container import Table
+
+
+def timed(function, *function_args) -> float:
+    start = perf_counter()
+    function(*function_args)
+    return perf_counter() - start
+
+
+if __name__ == "__main__":
+    window = Window(640, 480, "Benchmark - Table", visible=False)
+    rng = np.random.default_rng(0)
+    for count in args.counts:
+        manager = GUIManager(window)
+        columns = [
+            np.arange(count),
+            rng.random(count) * 1000,
+            rng.integers(0, 100, count),
+        ]
+        start = perf_counter()
+        table = Table(
+            window, ["id", "latency", "code"], 10, 10, 620, 460, columns=columns
+        )
+        create = perf_counter() - start
+        manager.add(table)
+        start = perf_counter()
+        for _ in range(args.steps):
+            manager.on_mouse_scroll(100, 100, 0, -1)
+        scroll = (perf_counter() - start) / args.steps
+        sort = timed(table.sort, 1)
+        resort = timed(table.sort, 1, True)
+        filtering = timed(table.filter, 2, lambda code: code < 50)
+        append = timed(
+            table.append,
+            np.arange(count, count + 1000),
+            rng.random(1000),
+            rng.integers(0, 100, 1000),
+        )
+        print(
+            f"{count:>8} rows: create {create * 1e3:7.2f} ms, "
+            f"scroll {scroll * 1e3:6.2f} ms, sort {sort * 1e3:7.2f} ms, "
+            f"cached sort {resort * 1e3:6.2f} ms, filter {filtering * 1e3:7.2f} ms, "
+            f"append 1000 {append * 1e3:6.2f} ms"
+        )
+        manager.enabled = False
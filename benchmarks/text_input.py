@@ -0,0 +1,59 @@
+"""Measure a multi-line text input, as the number of lines grows.
+
+Creating, scrolling, typing and appending should cost about the same for any number of
+lines, e.g.::
+
+    python benchmarks/text_input.py --counts 1000 100000
+"""
+
+import argparse
+from time import perf_counter
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    "--counts", type=int, nargs="+", default=[1000, 100000], help="line counts"
+)
+parser.add_argument("--steps", type=int, default=50, help="number of each operation")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.window import Window, key
+
+from goldenui.manager import GUIManager
+from goldenui.widget import TextInput
+
+
+def measure(function, *function_args) -> float:
+    start = perf_counter()
+    for _ in range(args.steps):
+        function(*function_args)
+    return (perf_counter() - start) / args.steps
+
+
+if __name__ == "__main__":
+    window = Window(400, 300, "Benchmark - Text Input", visible=False)
+    for count in args.counts:
+        manager = GUIManager(window)
+        text = "\n".join(f"{i:>8}: the quick brown fox jumps" for i in range(count))
+        start = perf_counter()
+        text_input = TextInput(text, 10, 10, 380, 280, multiline=True)
+        create = perf_counter() - start
+        manager.add(text_input)
+        text_input.focused = True
+        text_input.scroll_to_line(count // 2)
+        scroll = measure(manager.on_mouse_scroll, 100, 100, 0, -1)
+        motion = measure(manager.on_text_motion, key.MOTION_DOWN)
+        typing = measure(manager.on_text, "x")
+        # Appending costs something only at the end, where a log is followed.
+        text_input.scroll_to_line(text_input.line_count)
+        append = measure(text_input.append_text, "\nappended line")
+        print(
+            f"{count:>7} lines: create {create * 1e3:8.2f} ms, "
+            f"scroll {scroll * 1e3:6.2f} ms, down {motion * 1e3:6.2f} ms, "
+            f"type {typing * 1e3:6.2f} ms, append {append * 1e3:6.2f} ms"
+        )
+        manager.enabled = False
@@ -0,0 +1,71 @@
+"""Measure the cost of switching themes, as the number of widgets grows.
+
+The first switch to a theme bakes its images into atlas pages, later switches only
+retarget widgets, and switches keeping the look of widgets leave them alone, e.g.::
+
+    python benchmarks/theme.py --counts 100 1000 5000
+"""
+
+import argparse
+from time import perf_counter
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument(
+    "--counts", type=int, nargs="+", default=[100, 1000, 5000], help="widget counts"
+)
+parser.add_argument("--switches", type=int, default=10, help="number of switches")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.window import Window
+
+from goldenui.manager import GUIManager
+from goldenui.theme import Theme, set_theme
+from goldenui.widget import TextButton
+from goldenui.widget.button import default_style
+
+if __name__ == "__main__":
+    window = Window(400, 300, "Benchmark - Theme", visible=False)
+    for count in args.counts:
+        manager = GUIManager(window)
+        buttons = [
+            TextButton(
+                "Button",
+                (i % 100) * 130,
+                (i // 100) * 40,
+                120,
+                30,
+                batch=manager._batch,
+            )
+            for i in range(count)
+        ]
+        manager.add(*buttons)
+        theme = Theme(
+            "dark", {TextButton: default_style._replace(text_color=(0, 0, 0, 255))}
+        )
+        start = perf_counter()
+        set_theme(theme)
+        first = perf_counter() - start
+        start = perf_counter()
+        for i in range(args.switches):
+            set_theme(None if i % 2 == 0 else theme)
+        later = (perf_counter() - start) / args.switches
+        # Switching to a theme without a button style keeps the built-in look.
+        plain = Theme("plain", {})
+        set_theme(None)
+        start = perf_counter()
+        for i in range(args.switches):
+            set_theme(None if i % 2 == 0 else plain)
+        unchanged = (perf_counter() - start) / args.switches
+        print(
+            f"{count:>6} widgets: first switch {first * 1e3:8.2f} ms, "
+            f"later switches {later * 1e3:8.2f} ms, "
+            f"unchanged look {unchanged * 1e3:8.2f} ms"
+        )
+        set_theme(None)
+        manager.remove(*buttons)
+        manager.enabled = False
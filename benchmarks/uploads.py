@@ -0,0 +1,55 @@
+"""Count buffer uploads issued by drawing, while some buttons move every frame.
+
+Vertex data is changed in system memory and every dirty buffer is uploaded once right
+before it is drawn, no matter how many writes changed it, e.g.::
+
+    python benchmarks/uploads.py --buttons 1000 --moving 0 1 10 100
+"""
+
+import argparse
+
+import pyglet
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--buttons", type=int, default=1000, help="number of buttons")
+parser.add_argument(
+    "--moving",
+    type=int,
+    nargs="+",
+    default=[0, 1, 10, 100],
+    help="buttons moved every frame",
+)
+parser.add_argument("--frames", type=int, default=60, help="number of frames")
+parser.add_argument("--headless", action="store_true", help="run without a display")
+args = parser.parse_args()
+if args.headless:
+    pyglet.options["headless"] = True
+
+from pyglet.window import Window
+
+from goldenui.manager import GUIManager
+from goldenui.widget import TextButton
+
+if __name__ == "__main__":
+    window = Window(1200, 600, "Benchmark - Uploads", visible=False)
+    manager = GUIManager(window)
+    buttons = [
+        TextButton(f"B{i}", (i % 20) * 60, (i // 20 % 20) * 30, 50, 25)
+        for i in range(args.buttons)
+    ]
+    manager.add(*buttons)
+    manager.profiling = True
+    manager.draw()
+    for moving in args.moving:
+        manager.profiler.reset()
+        for frame in range(args.frames):
+            step = 1 if frame % 2 == 0 else -1
+            for button in buttons[:moving]:
+                button.x += step
+            manager.draw()
+        draw = manager.profiler.stats()["draw"]
+        print(
+            f"{moving:>5} moving: {draw['uploads'] / args.frames:6.1f} uploads, "
+            f"{draw['upload_bytes'] / args.frames / 1024:8.1f} KiB, "
+            f"{draw['time'] / args.frames * 1000:6.2f} ms per frame"
+        )
@@ -0,0 +1,222 @@
+"""Keyboard shortcuts looked up in a table.
+
+Every :py:class:`~goldenui.manager.GUIManager` has an :py:class:`AcceleratorTable` as
+:py:attr:`~goldenui.manager.GUIManager.accelerators`. A key press is looked up in it
+before widgets see it, and it only goes to widgets when no shortcut matches::
+
+    manager.accelerators.add("accel+s", save)
+    manager.accelerators.add("escape", close_dialog, scope=dialog)
+
+A shortcut has a scope, which is either ``None`` for the whole window, or a widget, e.g. a
+container, in which case it is only active while the focused widget of the manager is the
+scope or inside it. When shortcuts of several scopes match, the innermost scope wins.
+"""
+
+from collections.abc import Callable
+from typing import Any, Optional
+
+from pyglet.window import key
+
+from goldenui.widget.base import WidgetBase
+
+# Modifiers which take part in shortcuts, lock keys are ignored.
+_modifier_mask = (
+    key.MOD_SHIFT
+    | key.MOD_CTRL
+    | key.MOD_ALT
+    | key.MOD_COMMAND
+    | key.MOD_OPTION
+    | key.MOD_WINDOWS
+    | key.MOD_FUNCTION
+)
+_modifier_names = {
+    "shift": key.MOD_SHIFT,
+    "ctrl": key.MOD_CTRL,
+    "alt": key.MOD_ALT,
+    "command": key.MOD_COMMAND,
+    "option": key.MOD_OPTION,
+    "windows": key.MOD_WINDOWS,
+    "function": key.MOD_FUNCTION,
+    "accel": key.MOD_ACCEL,
+}
+
+
+def normalize_modifiers(modifiers: int) -> int:
+    """Drop lock keys like Caps Lock and Num Lock from modifiers."""
+    return modifiers & _modifier_mask
+
+
+def parse_shortcut(shortcut: str | tuple[int, int]) -> tuple[int, int]:
+    """Get ``(symbol, modifiers)`` of a shortcut.
+
+    Args:
+        shortcut:
+            ``(symbol, modifiers)``, or a string like ``"ctrl+shift+s"``, where the last
+            part is the name of a constant in :py:mod:`pyglet.window.key` and others are
+            ``shift``, ``ctrl``, ``alt``, ``command``, ``option``, ``windows``,
+            ``function`` or ``accel`` (Command on macOS, Ctrl elsewhere), in any case.
+
+    Raises:
+        ValueError: The string contains an unknown name.
+    """
+    if not isinstance(shortcut, str):
+        symbol, modifiers = shortcut
+        return symbol, normalize_modifiers(modifiers)
+    *modifier_names, symbol_name = shortcut.replace(" ", "").split("+")
+    modifiers = 0
+    for name in modifier_names:
+        if name.lower() not in _modifier_names:
+            raise ValueError(f"unknown modifier {name!r} in {shortcut!r}")
+        modifiers |= _modifier_names[name.lower()]
+    symbol_name = symbol_name.upper()
+    if symbol_name.isdigit():
+        symbol_name = f"_{symbol_name}"
+    symbol = getattr(key, symbol_name, None)
+    if not isinstance(symbol, int) or symbol_name.startswith("MOD_"):
+        raise ValueError(f"unknown key {symbol_name!r} in {shortcut!r}")
+    return symbol, modifiers
+
+
+class AcceleratorTable:
+    """Shortcuts mapped to actions by ``(symbol, modifiers)`` and scope.
+
+    Looking up a key press costs one hash lookup, plus one check per ancestor of the
+    focused widget when the key has scoped shortcuts, no matter how many widgets there are.
+    """
+
+    def __init__(self):
+        # (symbol, modifiers) -> {scope: action}
+        self._table: dict[tuple[int, int], dict[Optional[WidgetBase], Callable]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(actions) for actions in self._table.values())
+
+    def add(
+        self,
+        shortcut: str | tuple[int, int],
+        action: Callable[[], Any],
+        *,
+        scope: Optional[WidgetBase] = None,
+    ):
+        """Add a shortcut.
+
+        Args:
+            shortcut:
+                The shortcut, see :py:func:`parse_shortcut`.
+            action:
+                Function called without arguments when the shortcut is pressed.
+            scope:
+                Widget whose subtree should contain the focused widget, the whole
+                window if not given.
+
+        Raises:
+            ValueError: The shortcut already has an action in the scope.
+        """
+        actions = self._table.setdefault(parse_shortcut(shortcut), {})
+        if scope in actions:
+            raise ValueError(f"{shortcut!r} already has an action in this scope")
+        actions[scope] = action
+
+    def remove(
+        self, shortcut: str | tuple[int, int], *, scope: Optional[WidgetBase] = None
+    ):
+        """Remove a shortcut, nothing happens if it doesn't exist.
+
+        Args:
+            shortcut:
+                The shortcut, see :py:func:`parse_shortcut`.
+            scope:
+                Scope the shortcut was added with.
+        """
+        keys = parse_shortcut(shortcut)
+        actions = self._table.get(keys)
+        if actions is None:
+            return
+        actions.pop(scope, None)
+        if not actions:
+            del self._table[keys]
+
+    def remove_scope(self, scope: WidgetBase):
+        """Remove all shortcuts of a scope.
+
+        Args:
+            scope:
+                The scope.
+        """
+        for keys in list(self._table):
+            actions = self._table[keys]
+            actions.pop(scope, None)
+            if not actions:
+                del self._table[keys]
+
+    def find(
+        self,
+        symbol: int,
+        modifiers: int,
+        focus: Optional[WidgetBase] = None,
+        accept: Optional[Callable[[Optional[WidgetBase]], bool]] = None,
+    ) -> Optional[Callable[[], Any]]:
+        """The action of a key press, if any.
+
+        Scopes are tried from the focused widget outwards through its parents, then the
+        whole window. Hidden or disabled scopes are skipped.
+
+        Args:
+            symbol:
+                The key symbol.
+            modifiers:
+                Modifiers of the key press.
+            focus:
+                The focused widget.
+            accept:
+                Scopes for which it returns ``False`` are skipped, ``None`` stands for
+                the whole window, e.g. the scopes blocked by a modal layer.
+        """
+        actions = self._table.get((symbol, modifiers & _modifier_mask))
+        if actions is None:
+            return None
+        if len(actions) > 1 or None not in actions:
+            widget = focus
+            while widget is not None:
+                if (
+                    widget in actions
+                    and widget._visible
+                    and widget._enabled
+                    and (accept is None or accept(widget))
+                ):
+                    return actions[widget]
+                widget = widget._parent
+        if accept is not None and not accept(None):
+            return None
+        return actions.get(None)
+
+    def dispatch(
+        self,
+        symbol: int,
+        modifiers: int,
+        focus: Optional[WidgetBase] = None,
+        accept: Optional[Callable[[Optional[WidgetBase]], bool]] = None,
+    ) -> bool:
+        """Call the action of a key press.
+
+        Args:
+            symbol:
+                The key symbol.
+            modifiers:
+                Modifiers of the key press.
+            focus:
+                The focused widget.
+            accept:
+                Scopes for which it returns ``False`` are skipped, see :py:meth:`.find`.
+
+        Returns:
+            Whether a shortcut matched.
+        """
+        action = self.find(symbol, modifiers, focus, accept)
+        if action is None:
+            return False
+        action()
+        return True
+
+
+__all__ = "AcceleratorTable", "normalize_modifiers", "parse_shortcut"
@@ -0,0 +1,271 @@
+"""Run asyncio coroutines alongside pyglet.
+
+After :py:func:`install`, an asyncio event loop is stepped by :py:mod:`pyglet.clock`,
+so coroutines run between frames while :py:func:`pyglet.app.run` keeps rendering.
+Coroutine functions can then be used as event handlers of widgets::
+
+    goldenui.aio.install()
+
+    @button.event
+    async def on_click():
+        data = await fetch_something()
+        button.text = data
+
+And events of widgets can be awaited::
+
+    async def wait_for_ok():
+        await ok_button.clicked()
+
+Tasks started by a widget's handlers, and awaitables returned by it, belong to the
+widget. They are cancelled when the widget is removed from its manager, unless
+``cancel_on_remove=False`` is given to :py:func:`install`.
+"""
+
+import asyncio
+import inspect
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import TYPE_CHECKING, Any, Optional
+from weakref import WeakMethod
+
+import pyglet
+
+if TYPE_CHECKING:
+    from goldenui.widget.base import WidgetBase
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_cancel_on_remove = True
+# owner -> tasks and futures it owns, owners without any are not kept.
+_owned: dict[Any, set[asyncio.Future]] = {}
+
+
+def install(
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+    interval: float = 1 / 120,
+    *,
+    cancel_on_remove: bool = True,
+) -> asyncio.AbstractEventLoop:
+    """Step an asyncio event loop with the pyglet clock.
+
+    The loop runs one iteration every ``interval`` seconds, without blocking, so a
+    coroutine handler starts at most ``interval`` seconds after its event. If the loop is
+    already running, e.g. pyglet is driven from a coroutine, it is never stepped.
+
+    Args:
+        loop:
+            The loop to use, a new one will be created if not given.
+        interval:
+            Seconds between two iterations of the loop.
+        cancel_on_remove:
+            Whether to cancel tasks of a widget when it is removed from its manager.
+
+    Returns:
+        The installed loop.
+    """
+    global _loop, _cancel_on_remove
+    if _loop is not None:
+        uninstall()
+    _loop = asyncio.new_event_loop() if loop is None else loop
+    _cancel_on_remove = cancel_on_remove
+    pyglet.clock.schedule_interval(_step, interval)
+    return _loop
+
+
+def uninstall():
+    """Cancel all owned tasks and stop stepping the loop.
+
+    The loop is not closed.
+    """
+    global _loop
+    if _loop is None:
+        return
+    pyglet.clock.unschedule(_step)
+    for owner in list(_owned):
+        cancel_tasks(owner)
+    _step(0)
+    _loop = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The installed loop.
+
+    Raises:
+        RuntimeError: :py:func:`install` hasn't been called.
+    """
+    if _loop is None:
+        raise RuntimeError("asyncio integration is not installed")
+    return _loop
+
+
+def _step(dt: float):
+    if _loop.is_running() or _loop.is_closed():
+        return
+    # `stop` is called after the callbacks which are ready now, so it is one iteration.
+    _loop.call_soon(_loop.stop)
+    _loop.run_forever()
+
+
+def _own(future: asyncio.Future, owner: Any):
+    futures = _owned.get(owner)
+    if futures is None:
+        futures = _owned[owner] = set()
+    futures.add(future)
+    future.add_done_callback(lambda f: _disown(f, owner))
+
+
+def _disown(future: asyncio.Future, owner: Any):
+    futures = _owned.get(owner)
+    if futures is not None:
+        futures.discard(future)
+        if not futures:
+            del _owned[owner]
+
+
+def _report(task: asyncio.Task):
+    if task.cancelled() or task.exception() is None:
+        return
+    task.get_loop().call_exception_handler(
+        {
+            "message": "Exception in coroutine event handler",
+            "exception": task.exception(),
+            "task": task,
+        }
+    )
+
+
+def spawn(coro: Coroutine, owner: Any = None) -> asyncio.Task:
+    """Run a coroutine on the installed loop.
+
+    Exceptions raised by the coroutine are passed to the exception handler of the loop.
+
+    Args:
+        coro:
+            The coroutine to run.
+        owner:
+            The task will be cancelled by :py:func:`cancel_tasks` of the owner, usually a
+            widget.
+
+    Raises:
+        RuntimeError: :py:func:`install` hasn't been called.
+    """
+    if _loop is None:
+        coro.close()
+        raise RuntimeError("asyncio integration is not installed")
+    task = _loop.create_task(coro)
+    task.add_done_callback(_report)
+    if owner is not None:
+        _own(task, owner)
+    return task
+
+
+def cancel_tasks(owner: Any) -> int:
+    """Cancel tasks and awaitables of an owner.
+
+    Args:
+        owner:
+            Owner of the tasks.
+
+    Returns:
+        The number of cancelled tasks and awaitables.
+    """
+    futures = _owned.pop(owner, None)
+    if not futures:
+        return 0
+    for future in futures:
+        future.cancel()
+    return len(futures)
+
+
+def _on_remove(widget: "WidgetBase"):
+    """Apply the cancellation policy to a widget removed from its manager."""
+    if _cancel_on_remove and _owned:
+        cancel_tasks(widget)
+
+
+def next_event(widget: "WidgetBase", event_type: str) -> Awaitable[tuple]:
+    """Wait for the next event of a widget.
+
+    Args:
+        widget:
+            The widget to watch.
+        event_type:
+            The event to wait for.
+
+    Returns:
+        An awaitable which results in the arguments of the event.
+
+    Raises:
+        RuntimeError: :py:func:`install` hasn't been called.
+    """
+    future = get_loop().create_future()
+
+    def handler(*args: Any):
+        if not future.done():
+            future.set_result(args)
+
+    widget.push_handlers(**{event_type: handler})
+    future.add_done_callback(lambda f: widget.remove_handlers(**{event_type: handler}))
+    _own(future, widget)
+    return future
+
+
+def is_coroutine_handler(handler: Callable) -> bool:
+    """Whether an event handler is a coroutine function.
+
+    Args:
+        handler:
+            A function, a method or a :py:class:`~weakref.WeakMethod`.
+    """
+    if isinstance(handler, WeakMethod):
+        handler = handler()
+    return inspect.iscoroutinefunction(handler)
+
+
+class CoroutineHandler:
+    """Wrap a coroutine function as an event handler.
+
+    Calling it starts a task owned by the widget and returns immediately, so a coroutine
+    handler never stops propagation of an event. The wrapper is equal to the wrapped
+    handler, so it can be removed with the original function.
+    """
+
+    __slots__ = ("_owner", "_handler")
+
+    def __init__(self, owner: Any, handler: Callable):
+        """Create a ``CoroutineHandler``.
+
+        Args:
+            owner:
+                Owner of started tasks.
+            handler:
+                A coroutine function, method or a :py:class:`~weakref.WeakMethod` to
+                one.
+        """
+        self._owner = owner
+        self._handler = handler
+
+    def __call__(self, *args: Any):
+        handler = self._handler
+        if isinstance(handler, WeakMethod):
+            handler = handler()
+            if handler is None:
+                return
+        spawn(handler(*args), self._owner)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, CoroutineHandler):
+            other = other._handler
+        return self._handler == other
+
+    __hash__ = None
+
+
+__all__ = (
+    "install",
+    "uninstall",
+    "get_loop",
+    "spawn",
+    "cancel_tasks",
+    "next_event",
+    "is_coroutine_handler",
+    "CoroutineHandler",
+)
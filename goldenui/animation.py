@@ -0,0 +1,360 @@
+"""Animate properties of widgets.
+
+:py:class:`Animator` keeps all its tweens in NumPy arrays and advances them with one clock
+callback, evaluating easing for every tween at once::
+
+    animator = Animator()
+    animator.tween(button, 0.5, x=200, easing="out_cubic")
+
+Positions of widgets which support it (e.g. :py:class:`~goldenui.widget.TextButton`) are
+written straight into the vertex buffers of their batch, without touching the widgets.
+Their ``x`` and ``y`` keep the old values until the tween settles, and so does the spatial
+hash of the manager, which is only updated when a tween settles for all widgets.
+
+NumPy is required by this module.
+"""
+
+import ctypes
+from collections.abc import Callable
+from typing import Any, Optional
+
+import pyglet
+from pyglet.event import EventDispatcher
+
+from goldenui import is_sphinx_run
+from goldenui.widget.base import WidgetBase
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("goldenui.animation requires NumPy to be installed") from None
+
+
+def _out_back(t):
+    s = 1.70158
+    t = t - 1
+    return t * t * ((s + 1) * t + s) + 1
+
+
+def _out_elastic(t):
+    return np.where(
+        (t <= 0) | (t >= 1),
+        t,
+        2 ** (-10 * t) * np.sin((t * 10 - 0.75) * (2 * np.pi / 3)) + 1,
+    )
+
+
+#: Easing functions by name, they take and return arrays of progress.
+easings: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": lambda t: t,
+    "in_quad": lambda t: t * t,
+    "out_quad": lambda t: t * (2 - t),
+    "in_out_quad": lambda t: np.where(t < 0.5, 2 * t * t, 1 - (-2 * t + 2) ** 2 / 2),
+    "in_cubic": lambda t: t**3,
+    "out_cubic": lambda t: 1 - (1 - t) ** 3,
+    "in_out_cubic": lambda t: np.where(t < 0.5, 4 * t**3, 1 - (-2 * t + 2) ** 3 / 2),
+    "out_back": _out_back,
+    "out_elastic": _out_elastic,
+}
+_easing_names = list(easings)
+
+# Properties set through private fields and `_update_position`, without rehashing.
+_geometry = {"position": ("_x", "_y"), "width": ("_width",), "height": ("_height",)}
+# Arrays of tweens, rows beyond the number of tweens are unused.
+_arrays = ("_start", "_end", "_begin", "_duration", "_easing", "_values")
+
+
+class Animator(EventDispatcher):
+    """Run tweens of widget properties.
+
+    A property can be ``x``, ``y``, ``position``, ``width``, ``height`` or any other
+    property with a number or a tuple of up to four numbers as value, e.g. a color.
+    Tweening a property which is already being tweened starts from its current value.
+    """
+
+    def __init__(self, capacity: int = 64):
+        """Create an ``Animator``.
+
+        Args:
+            capacity:
+                Number of tweens to allocate arrays for, they grow when needed.
+        """
+        self._time = 0.0
+        self._count = 0
+        self._start = np.zeros((capacity, 4))
+        self._end = np.zeros((capacity, 4))
+        self._begin = np.zeros(capacity)
+        self._duration = np.zeros(capacity)
+        self._easing = np.zeros(capacity, dtype=np.intp)
+        self._values = np.zeros((capacity, 4))
+        # Per tween: (widget, name, number of components), and its row by (widget, name).
+        self._tweens: list[tuple[WidgetBase, str, int]] = []
+        self._rows: dict[tuple[WidgetBase, str], int] = {}
+        # Rows of position tweens written into vertex buffers, how to write them, and
+        # rows applied one by one.
+        self._fast_rows = np.zeros(0, dtype=np.intp)
+        self._slow_rows: list[int] = []
+        self._plan: Optional[list[tuple]] = None
+        self._scheduled = False
+
+    @property
+    def active(self) -> int:
+        """Number of running tweens."""
+        return self._count
+
+    def is_animating(self, widget: WidgetBase, name: Optional[str] = None) -> bool:
+        """Whether a widget, or a property of it, is being tweened.
+
+        Args:
+            widget:
+                The widget.
+            name:
+                Name of the property, any property if not given.
+        """
+        if name is not None:
+            if name in ("x", "y"):
+                name = "position"
+            return (widget, name) in self._rows
+        return any(tween[0] is widget for tween in self._tweens)
+
+    def tween(
+        self,
+        widget: WidgetBase,
+        duration: float,
+        *,
+        easing: str = "out_quad",
+        delay: float = 0.0,
+        **values: Any,
+    ):
+        """Tween properties of a widget to new values.
+
+        Args:
+            widget:
+                The widget to animate.
+            duration:
+                Seconds the tween takes.
+            easing:
+                Name of an easing function in :py:data:`easings`.
+            delay:
+                Seconds to wait before starting.
+            values:
+                Target values by property name.
+        """
+        if easing not in easings:
+            raise ValueError(f"unknown easing {easing!r}")
+        if "x" in values or "y" in values:
+            x, y = self._target(widget, "position")
+            values["position"] = values.pop("x", x), values.pop("y", y)
+        easing_id = _easing_names.index(easing)
+        begin = self._time + delay
+        for name, value in values.items():
+            end = np.atleast_1d(np.asarray(value, dtype=float))
+            if end.size > 4:
+                raise ValueError(f"{name} has more than four components")
+            row = self._rows.get((widget, name))
+            if row is None:
+                row = self._add(widget, name, end.size)
+                start = self._current(widget, name)
+                self._values[row, : end.size] = start
+            else:
+                start = self._values[row, : end.size].copy()
+            self._start[row, : end.size] = start
+            self._end[row, : end.size] = end
+            self._begin[row] = begin
+            self._duration[row] = duration
+            self._easing[row] = easing_id
+        if not self._scheduled:
+            pyglet.clock.schedule(self.tick)
+            self._scheduled = True
+
+    def cancel(self, widget: WidgetBase, *names: str, finish: bool = False):
+        """Stop tweens of a widget.
+
+        Args:
+            widget:
+                The widget.
+            names:
+                Properties to stop, all properties if not given.
+            finish:
+                Jump to the target values, otherwise stay at the current values.
+        """
+        names = {"position" if name in ("x", "y") else name for name in names}
+        done = np.zeros(self._count, dtype=bool)
+        for row, (tween_widget, name, _) in enumerate(self._tweens):
+            if tween_widget is widget and (not names or name in names):
+                done[row] = True
+                if finish:
+                    self._values[row] = self._end[row]
+        if done.any():
+            self._settle(done)
+
+    def _add(self, widget: WidgetBase, name: str, components: int) -> int:
+        row = self._count
+        if row == len(self._begin):
+            capacity = 2 * row
+            for attr in _arrays:
+                array = getattr(self, attr)
+                grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+                grown[:row] = array
+                setattr(self, attr, grown)
+        self._count += 1
+        self._tweens.append((widget, name, components))
+        self._rows[(widget, name)] = row
+        self._plan = None
+        if name == "position":
+            widget._animator = self
+            # It may move into sight, and is culled again when it settles if not.
+            widget._set_culled(False)
+        return row
+
+    def _current(self, widget: WidgetBase, name: str) -> tuple:
+        if name in _geometry:
+            return tuple(getattr(widget, attr) for attr in _geometry[name])
+        return tuple(np.atleast_1d(getattr(widget, name)))
+
+    def _target(self, widget: WidgetBase, name: str) -> tuple:
+        row = self._rows.get((widget, name))
+        if row is None:
+            return self._current(widget, name)
+        return tuple(self._end[row, : self._tweens[row][2]])
+
+    def _invalidate(self):
+        """Vertex lists of an animated widget were recreated or moved."""
+        self._plan = None
+
+    def _build_plan(self):
+        """Gather where positions of widgets are in vertex buffers."""
+        fast_rows, per_buffer = [], {}
+        self._slow_rows = []
+        # Offsets of vertices depend on the size, so resized widgets are moved slowly.
+        resized = {w for w, name, _ in self._tweens if name in ("width", "height")}
+        for row, (widget, name, _) in enumerate(self._tweens):
+            targets = None
+            if name == "position" and widget not in resized:
+                targets = widget._vertex_targets()
+            if targets is None:
+                self._slow_rows.append(row)
+                continue
+            fast_rows.append(row)
+            index = len(fast_rows) - 1
+            for vertex_list, attribute, dx, dy in targets:
+                buffer = vertex_list.domain.attrib_name_buffers[attribute]
+                entry = per_buffer.get(id(buffer))
+                if entry is None:
+                    entry = per_buffer[id(buffer)] = (buffer, [])
+                entry[1].append((vertex_list.start, vertex_list.count, index, dx, dy))
+        self._fast_rows = np.array(fast_rows, dtype=np.intp)
+        self._plan = []
+        for buffer, lists in per_buffer.values():
+            starts, counts, rows, dxs, dys = np.array(lists).T
+            # Index of every vertex: its list's start plus its place in the list.
+            before = np.cumsum(counts) - counts
+            vertices = np.arange(counts.sum()) + np.repeat(starts - before, counts)
+            indices = vertices * buffer.count
+            offsets = np.repeat(np.column_stack((dxs, dys)), counts, axis=0)
+            size = ctypes.sizeof(buffer.c_type)
+            byte_range = int(indices.min()) * size, (int(indices.max()) + 2) * size
+            self._plan.append(
+                (buffer, indices, np.repeat(rows, counts), offsets, byte_range)
+            )
+
+    def _write_vertices(self):
+        if not len(self._fast_rows):
+            return
+        positions = self._values[self._fast_rows, :2]
+        for buffer, indices, rows, offsets, (low, high) in self._plan:
+            data = np.frombuffer(buffer.data, dtype=np.float32)
+            values = positions[rows] + offsets
+            data[indices] = values[:, 0]
+            data[indices + 1] = values[:, 1]
+            buffer._dirty_min = min(buffer._dirty_min, low)
+            buffer._dirty_max = max(buffer._dirty_max, high)
+            buffer._dirty = True
+
+    def _apply(self, row: int, values: np.ndarray):
+        widget, name, components = self._tweens[row]
+        if name in _geometry:
+            for attr, value in zip(_geometry[name], values.tolist()):
+                setattr(widget, attr, int(value) if value.is_integer() else value)
+            widget._update_position()
+        elif components == 1:
+            setattr(widget, name, float(values[0]))
+        else:
+            setattr(widget, name, tuple(values[:components].tolist()))
+
+    def tick(self, dt: float = 0.0):
+        """Advance all tweens, it is called by the pyglet clock while tweens run.
+
+        Args:
+            dt:
+                Seconds since the last tick.
+        """
+        self._time += dt
+        count = self._count
+        if count == 0:
+            return
+        duration = self._duration[:count]
+        elapsed = self._time - self._begin[:count]
+        progress = np.clip(
+            np.divide(elapsed, duration, out=np.ones(count), where=duration > 0), 0, 1
+        )
+        easing = self._easing[:count]
+        eased = progress
+        for easing_id in np.unique(easing).tolist():
+            if easing_id == 0:
+                continue
+            mask = easing == easing_id
+            eased = eased.copy() if eased is progress else eased
+            eased[mask] = easings[_easing_names[easing_id]](progress[mask])
+        start = self._start[:count]
+        self._values[:count] = start + (self._end[:count] - start) * eased[:, None]
+
+        if self._plan is None:
+            self._build_plan()
+        for row in self._slow_rows:
+            self._apply(row, self._values[row])
+        self._write_vertices()
+        done = progress >= 1
+        if done.any():
+            self._settle(done)
+
+    def _settle(self, done: np.ndarray):
+        """Finish tweens, update the spatial hash and remove them."""
+        settled = []
+        for row in np.flatnonzero(done).tolist():
+            widget, name, _ = self._tweens[row]
+            self._apply(row, self._values[row])
+            settled.append((widget, name))
+        keep = ~done
+        self._count = int(keep.sum())
+        for attr in _arrays:
+            array = getattr(self, attr)
+            array[: self._count] = array[: len(keep)][keep]
+        self._tweens = [tween for tween, k in zip(self._tweens, keep.tolist()) if k]
+        self._rows = {(w, n): row for row, (w, n, _) in enumerate(self._tweens)}
+        self._plan = None
+        animated = {tween[0] for tween in self._tweens if tween[1] == "position"}
+        for widget, name in settled:
+            if name == "position" and widget not in animated:
+                widget._animator = None
+            if name in _geometry:
+                widget._repositioned()
+            self.dispatch_event("on_settle", widget, name)
+        if self._count == 0 and self._scheduled:
+            pyglet.clock.unschedule(self.tick)
+            self._scheduled = False
+
+    if is_sphinx_run:
+
+        def on_settle(self, widget: WidgetBase, name: str):
+            """A tween finished or was cancelled.
+
+            ``x`` and ``y`` are reported as ``position``.
+            """
+            pass
+
+
+Animator.register_event_type("on_settle")
+
+
+__all__ = "Animator", "easings"
@@ -0,0 +1,278 @@
+"""Build widgets from JSON or TOML files.
+
+A file describes a list of widgets. Every widget is a table with a ``type``, an optional
+``id`` and the arguments of its constructor. A table as an argument is a widget too, and
+containers can have ``children``, which are added to them after they are created::
+
+    {
+        "widgets": [
+            {"type": "TextButton", "id": "quit", "text": "Quit", "width": 120, "height": 30},
+            {
+                "type": "CenterContainer",
+                "filled": true,
+                "widget": {"type": "TextButton", "id": "start", "text": "Start"}
+            }
+        ]
+    }
+
+The window, batch and groups are given by :py:func:`load`. Parsing and validating a file
+is done once, the result is compiled into a cache file named after the hash of the file,
+so that later launches only read the cache.
+"""
+
+import hashlib
+import inspect
+import json
+import marshal
+import os
+from collections.abc import Mapping
+from typing import Any, Optional
+
+import pyglet
+from pyglet.window import Window
+
+from goldenui.manager import GUIManager
+from goldenui.widget import CenterContainer, TextButton, TextInput
+from goldenui.widget.base import WidgetBase
+from goldenui.widget.container.base import ContainerBase
+
+# Bump it when the compiled form changes.
+_format_version = 1
+# Arguments given by the loader rather than the file.
+_reserved = frozenset({"toplevel", "batch", "group"})
+
+#: Widget types which can be used in files, by name.
+widget_types: dict[str, type[WidgetBase]] = {
+    "TextButton": TextButton,
+    "TextInput": TextInput,
+    "CenterContainer": CenterContainer,
+}
+# Constructor parameters by widget class, see _parameters_of.
+_parameters: dict[type[WidgetBase], Mapping[str, inspect.Parameter]] = {}
+
+
+def register_widget_type(cls: type[WidgetBase], name: Optional[str] = None):
+    """Allow a widget type to be used in files.
+
+    Args:
+        cls:
+            The widget class.
+        name:
+            Name used as ``type`` in files, the name of the class if not given.
+    """
+    widget_types[name or cls.__name__] = cls
+
+
+def _parameters_of(cls: type[WidgetBase]) -> Mapping[str, inspect.Parameter]:
+    """Get the constructor parameters of a widget class, once per class."""
+    parameters = _parameters.get(cls)
+    if parameters is None:
+        parameters = _parameters[cls] = inspect.signature(cls.__init__).parameters
+    return parameters
+
+
+def _parse(data: bytes, path: str) -> dict[str, Any]:
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ImportError(
+                    "loading TOML on Python 3.10 requires tomli to be installed"
+                ) from None
+        return tomllib.loads(data.decode("utf-8"))
+    return json.loads(data)
+
+
+def _compile_node(node: Any, where: str, ids: set[str]) -> tuple:
+    """Validate a widget table and compile it to nested tuples.
+
+    Returns:
+        ``(type, id, arguments, widget arguments, children)``.
+    """
+    if not isinstance(node, dict):
+        raise ValueError(f"{where}: a widget should be a table")
+    node = dict(node)
+    type_name = node.pop("type", None)
+    if type_name not in widget_types:
+        raise ValueError(f"{where}: unknown widget type {type_name!r}")
+    cls = widget_types[type_name]
+    is_container = issubclass(cls, ContainerBase)
+
+    widget_id = node.pop("id", None)
+    if widget_id is not None:
+        if not isinstance(widget_id, str):
+            raise ValueError(f"{where}: id should be a string")
+        if widget_id in ids:
+            raise ValueError(f"{where}: duplicate id {widget_id!r}")
+        ids.add(widget_id)
+
+    children = node.pop("children", [])
+    if children and not is_container:
+        raise ValueError(f"{where}: {type_name} can't have children")
+    if not isinstance(children, list):
+        raise ValueError(f"{where}: children should be a list")
+
+    parameters = _parameters_of(cls)
+    accepts_any = any(p.kind is p.VAR_KEYWORD for p in parameters.values())
+    arguments, widget_arguments = {}, []
+    for name, value in node.items():
+        if name in _reserved or (name not in parameters and not accepts_any):
+            raise ValueError(f"{where}: {type_name} has no argument {name!r}")
+        if isinstance(value, dict):
+            child = _compile_node(value, f"{where}.{name}", ids)
+            if issubclass(widget_types[child[0]], ContainerBase):
+                raise ValueError(
+                    f"{where}.{name}: a container can only be one of children"
+                )
+            widget_arguments.append((name, child))
+        else:
+            arguments[name] = value
+    for name, parameter in parameters.items():
+        if (
+            name != "self"
+            and name not in _reserved
+            and parameter.default is parameter.empty
+            and parameter.kind not in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD)
+            and name not in node
+        ):
+            raise ValueError(f"{where}: missing argument {name!r} of {type_name}")
+
+    compiled_children = tuple(
+        _compile_node(child, f"{where}.children[{i}]", ids)
+        for i, child in enumerate(children)
+    )
+    return type_name, widget_id, arguments, tuple(widget_arguments), compiled_children
+
+
+def compile_ui(data: bytes, path: str = "<ui>.json") -> tuple:
+    """Parse and validate a file.
+
+    Args:
+        data:
+            Content of the file.
+        path:
+            Name of the file, it is TOML if it ends with ``.toml``, otherwise JSON.
+
+    Returns:
+        The compiled form, which :py:func:`build` accepts.
+
+    Raises:
+        ValueError: The file is not a valid description of widgets.
+    """
+    document = _parse(data, path)
+    if not isinstance(document, dict) or not isinstance(document.get("widgets"), list):
+        raise ValueError(f"{path}: there should be a list named widgets")
+    ids: set[str] = set()
+    return tuple(
+        _compile_node(node, f"{path}: widgets[{i}]", ids)
+        for i, node in enumerate(document["widgets"])
+    )
+
+
+def _cache_key(data: bytes) -> str:
+    digest = hashlib.sha256(data)
+    digest.update(f"{_format_version}:{sorted(widget_types)}".encode())
+    return digest.hexdigest()
+
+
+def _build_node(
+    node: tuple,
+    toplevel: Window | ContainerBase,
+    manager: GUIManager,
+    ids: dict[str, WidgetBase],
+) -> WidgetBase:
+    type_name, widget_id, arguments, widget_arguments, children = node
+    cls = widget_types[type_name]
+    kwargs = dict(arguments)
+    for name, child in widget_arguments:
+        kwargs[name] = _build_node(child, toplevel, manager, ids)
+    if issubclass(cls, ContainerBase):
+        kwargs["toplevel"] = toplevel
+    # Creating widgets in the batch avoids moving their vertices later.
+    widget = cls(batch=manager._batch, **kwargs)
+    if children:
+        widget.add(*(_build_node(child, widget, manager, ids) for child in children))
+    if widget_id is not None:
+        ids[widget_id] = widget
+    return widget
+
+
+def build(compiled: tuple, manager: GUIManager) -> dict[str, WidgetBase]:
+    """Create widgets from a compiled form and add them to a manager all at once.
+
+    Args:
+        compiled:
+            Result of :py:func:`compile_ui`.
+        manager:
+            The manager to add widgets to. Containers belong to its window.
+
+    Returns:
+        Widgets which have an ``id``, by id.
+    """
+    ids: dict[str, WidgetBase] = {}
+    widgets = [_build_node(node, manager._window, manager, ids) for node in compiled]
+    manager.add(*widgets)
+    return ids
+
+
+def load(
+    path: str,
+    manager: GUIManager,
+    *,
+    cache: bool = True,
+    cache_dir: Optional[str] = None,
+) -> dict[str, WidgetBase]:
+    """Build widgets described by a file and add them to a manager.
+
+    Args:
+        path:
+            Path of a JSON or TOML file.
+        manager:
+            The manager to add widgets to.
+        cache:
+            Whether to use and write the compiled cache.
+        cache_dir:
+            Directory of cache files, a ``ui-cache`` directory in
+            ``pyglet.resource.get_data_path("goldenui")`` if not given.
+
+    Returns:
+        Widgets which have an ``id``, by id.
+
+    Raises:
+        ValueError: The file is not a valid description of widgets.
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if not cache:
+        return build(compile_ui(data, path), manager)
+
+    if cache_dir is None:
+        cache_dir = os.path.join(pyglet.resource.get_data_path("goldenui"), "ui-cache")
+    cache_path = os.path.join(cache_dir, _cache_key(data) + ".bin")
+    try:
+        with open(cache_path, "rb") as file:
+            compiled = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        compiled = compile_ui(data, path)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write then rename, so that a half-written file is never read.
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as file:
+                marshal.dump(compiled, file)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass
+    return build(compiled, manager)
+
+
+__all__ = (
+    "widget_types",
+    "register_widget_type",
+    "compile_ui",
+    "build",
+    "load",
+)
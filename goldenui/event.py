@@ -0,0 +1,166 @@
+"""Pointer events propagated along the widget tree.
+
+When :py:attr:`~goldenui.manager.GUIManager.propagation` is enabled, a pointer event is
+only given to widgets on the path from a top-level widget down to the innermost widget
+under the pointer, like events of the DOM:
+
+1. In the capture phase, ancestors receive :py:meth:`~.WidgetBase.on_pointer` from the
+   outermost one inwards.
+2. In the target phase, the target receives :py:meth:`~.WidgetBase.on_pointer`, then its
+   usual handler like ``on_mouse_press`` unless the event is :py:attr:`~.handled`.
+3. In the bubble phase, ancestors receive :py:meth:`~.WidgetBase.on_pointer` again from the
+   innermost one outwards.
+
+A handler calls :py:meth:`PointerEvent.stop_propagation` to stop passing the event on::
+
+    @dialog.event
+    def on_pointer(event):
+        if event.phase == CAPTURE and event.type == "on_mouse_scroll":
+            event.stop_propagation()
+"""
+
+from typing import Any
+
+from goldenui.widget.base import WidgetBase
+
+#: The event goes from the outermost ancestor to the parent of the target.
+CAPTURE = 1
+#: The event is at the target.
+TARGET = 2
+#: The event goes from the parent of the target to the outermost ancestor.
+BUBBLE = 3
+
+
+class PointerEvent:
+    """A pointer event on its way along the widget tree."""
+
+    __slots__ = (
+        "_type",
+        "_path",
+        "_args",
+        "_phase",
+        "_current",
+        "_x",
+        "_y",
+        "_stopped",
+        "handled",
+    )
+
+    def __init__(self, event_type: str, path: tuple[WidgetBase, ...], args: tuple):
+        """Create a ``PointerEvent``.
+
+        Args:
+            event_type:
+                Name of the pyglet event, e.g. ``"on_mouse_press"``.
+            path:
+                Widgets from the outermost one to the target.
+            args:
+                Arguments of the event after the coordinates.
+        """
+        self._type = event_type
+        self._path = path
+        self._args = args
+        self._phase = CAPTURE
+        self._current = path[0]
+        self._x = self._y = 0
+        self._stopped = False
+        #: Whether a handler has dealt with the event. The usual handler of the target
+        #: isn't called if it is set before the target phase, and it is set when a usual
+        #: handler returns ``pyglet.event.EVENT_HANDLED``.
+        self.handled = False
+
+    @property
+    def type(self) -> str:
+        """Name of the pyglet event, e.g. ``"on_mouse_press"``."""
+        return self._type
+
+    @property
+    def path(self) -> tuple[WidgetBase, ...]:
+        """Widgets from the outermost one to the target."""
+        return self._path
+
+    @property
+    def target(self) -> WidgetBase:
+        """The innermost widget under the pointer."""
+        return self._path[-1]
+
+    @property
+    def current_target(self) -> WidgetBase:
+        """The widget whose handler is being called."""
+        return self._current
+
+    @property
+    def phase(self) -> int:
+        """:py:data:`CAPTURE`, :py:data:`TARGET` or :py:data:`BUBBLE`."""
+        return self._phase
+
+    @property
+    def x(self) -> int:
+        """X coordinate in the space of :py:attr:`current_target`'s position."""
+        return self._x
+
+    @property
+    def y(self) -> int:
+        """Y coordinate in the space of :py:attr:`current_target`'s position."""
+        return self._y
+
+    @property
+    def args(self) -> tuple[Any, ...]:
+        """Arguments of the pyglet event after the coordinates."""
+        return self._args
+
+    @property
+    def propagation_stopped(self) -> bool:
+        """Whether :py:meth:`stop_propagation` has been called."""
+        return self._stopped
+
+    def stop_propagation(self):
+        """Don't pass the event to further widgets."""
+        self._stopped = True
+
+    def _visit(self, widget: WidgetBase, phase: int, x: int, y: int):
+        self._current = widget
+        self._phase = phase
+        self._x = x
+        self._y = y
+        widget.dispatch_event("on_pointer", self)
+
+
+def propagate(
+    path: list[tuple[WidgetBase, int, int]], event_type: str, x: int, y: int, *args: Any
+) -> PointerEvent:
+    """Pass a pointer event along a path of widgets.
+
+    Args:
+        path:
+            ``(widget, dx, dy)`` from the outermost widget to the target, where
+            ``(x - dx, y - dy)`` is the pointer in the space of the widget's position.
+        event_type:
+            Name of the pyglet event.
+        x:
+            X coordinate of the pointer in the window.
+        y:
+            Y coordinate of the pointer in the window.
+        args:
+            Other arguments of the event.
+
+    Returns:
+        The event after it is passed along.
+    """
+    event = PointerEvent(event_type, tuple(widget for widget, _, _ in path), args)
+    for widget, dx, dy in path[:-1]:
+        event._visit(widget, CAPTURE, x - dx, y - dy)
+        if event._stopped:
+            return event
+    target, dx, dy = path[-1]
+    event._visit(target, TARGET, x - dx, y - dy)
+    if not event.handled and target.dispatch_event(event_type, x - dx, y - dy, *args):
+        event.handled = True
+    for widget, dx, dy in reversed(path[:-1]):
+        if event._stopped:
+            break
+        event._visit(widget, BUBBLE, x - dx, y - dy)
+    return event
+
+
+__all__ = "PointerEvent", "propagate", "CAPTURE", "TARGET", "BUBBLE"
@@ -0,0 +1,273 @@
+"""Geometry of widgets in contiguous arrays.
+
+:py:class:`GeometryStore` keeps bounding boxes, z-order and flags of many widgets in NumPy
+arrays, so that hit testing and selection queries are array operations instead of Python
+loops. Pass ``geometry=True`` to :py:class:`~goldenui.manager.GUIManager` to let it
+maintain a store.
+
+NumPy is required by this module.
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import Optional
+
+from goldenui.widget.base import WidgetBase
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("goldenui.geometry requires NumPy to be installed") from None
+
+#: The widget is enabled.
+FLAG_ENABLED = 1
+#: The widget is visible.
+FLAG_VISIBLE = 2
+
+
+class GeometryStore:
+    """Bounding boxes, z-order and flags of widgets, in a struct of arrays.
+
+    Rows are kept contiguous: removing a widget moves the last row into its place.
+    """
+
+    def __init__(self, capacity: int = 256):
+        """Create a ``GeometryStore``.
+
+        Args:
+            capacity:
+                Number of widgets to allocate arrays for, they grow when needed.
+        """
+        self._count = 0
+        self._aabbs = np.zeros((capacity, 4))
+        self._z = np.zeros(capacity, dtype=np.int64)
+        self._flags = np.zeros(capacity, dtype=np.uint8)
+        self._widgets: list[WidgetBase] = []
+        self._rows: dict[WidgetBase, int] = {}
+        self._next_z = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, widget: WidgetBase) -> bool:
+        return widget in self._rows
+
+    @property
+    def aabbs(self) -> np.ndarray:
+        """``(x1, y1, x2, y2)`` of widgets, a read-only view of shape ``(n, 4)``."""
+        view = self._aabbs[: self._count]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def z(self) -> np.ndarray:
+        """Z-order of widgets, larger is on top, a read-only view of shape ``(n,)``."""
+        view = self._z[: self._count]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def flags(self) -> np.ndarray:
+        """Flags of widgets, e.g. :py:data:`FLAG_ENABLED`, a read-only view."""
+        view = self._flags[: self._count]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def widgets(self) -> Sequence[WidgetBase]:
+        """Widgets in the same order as rows of the arrays."""
+        return self._widgets
+
+    def _reserve(self, count: int):
+        capacity = len(self._z)
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        for attr in ("_aabbs", "_z", "_flags"):
+            array = getattr(self, attr)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[: self._count] = array[: self._count]
+            setattr(self, attr, grown)
+
+    @staticmethod
+    def _get_flags(widget: WidgetBase) -> int:
+        return (FLAG_ENABLED if widget.enabled else 0) | (
+            FLAG_VISIBLE if widget.visible else 0
+        )
+
+    def add(self, widgets: Sequence[WidgetBase]) -> np.ndarray:
+        """Add widgets on top of the others.
+
+        Args:
+            widgets:
+                Widgets not in the store.
+
+        Returns:
+            Rows of the widgets.
+        """
+        start, count = self._count, len(widgets)
+        self._reserve(start + count)
+        stop = start + count
+        self._aabbs[start:stop] = [widget.aabb for widget in widgets]
+        self._z[start:stop] = np.arange(self._next_z, self._next_z + count)
+        self._flags[start:stop] = [self._get_flags(widget) for widget in widgets]
+        self._next_z += count
+        for row, widget in enumerate(widgets, start):
+            self._rows[widget] = row
+        self._widgets.extend(widgets)
+        self._count = stop
+        return np.arange(start, stop)
+
+    def remove(self, widgets: Iterable[WidgetBase]):
+        """Remove widgets.
+
+        Args:
+            widgets:
+                Widgets in the store.
+        """
+        rows = [self._rows.pop(widget) for widget in widgets]
+        if not rows:
+            return
+        if len(rows) == 1:
+            self._move_last(rows[0])
+            return
+        keep = np.ones(self._count, dtype=bool)
+        keep[rows] = False
+        self._count = int(keep.sum())
+        for attr in ("_aabbs", "_z", "_flags"):
+            array = getattr(self, attr)
+            array[: self._count] = array[: len(keep)][keep]
+        self._widgets = [w for w, k in zip(self._widgets, keep.tolist()) if k]
+        self._rows = {widget: row for row, widget in enumerate(self._widgets)}
+
+    def _move_last(self, row: int):
+        last = self._count - 1
+        if row != last:
+            self._aabbs[row] = self._aabbs[last]
+            self._z[row] = self._z[last]
+            self._flags[row] = self._flags[last]
+            widget = self._widgets[last]
+            self._widgets[row] = widget
+            self._rows[widget] = row
+        self._widgets.pop()
+        self._count = last
+
+    def update(self, widget: WidgetBase):
+        """Read the bounding box and flags of a widget again.
+
+        Args:
+            widget:
+                A widget in the store.
+        """
+        row = self._rows[widget]
+        self._aabbs[row] = widget.aabb
+        self._flags[row] = self._get_flags(widget)
+
+    def set_flags(self, widget: WidgetBase, flags: int):
+        """Set flags of a widget.
+
+        Args:
+            widget:
+                A widget in the store.
+            flags:
+                New flags.
+        """
+        self._flags[self._rows[widget]] = flags
+
+    def raise_to_top(self, widget: WidgetBase):
+        """Put a widget above all others.
+
+        Args:
+            widget:
+                A widget in the store.
+        """
+        self._z[self._rows[widget]] = self._next_z
+        self._next_z += 1
+
+    def cell_ranges(self, rows: np.ndarray, cell_size: int) -> np.ndarray:
+        """Cells covered by widgets of the spatial hash.
+
+        Args:
+            rows:
+                Rows of widgets.
+            cell_size:
+                Size of cells.
+
+        Returns:
+            ``(min_i, min_j, max_i, max_j)`` of every widget, in shape ``(n, 4)``.
+        """
+        return np.floor_divide(self._aabbs[rows], cell_size).astype(np.int64)
+
+    def _select(self, mask: np.ndarray, flags: int) -> list[WidgetBase]:
+        if flags:
+            mask &= (self._flags[: self._count] & flags) == flags
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(-self._z[rows], kind="stable")]
+        widgets = self._widgets
+        return [widgets[row] for row in rows.tolist()]
+
+    def query_point(self, x: float, y: float, flags: int = 0) -> list[WidgetBase]:
+        """Widgets containing a point, topmost first.
+
+        Like :py:meth:`~goldenui.widget.base.WidgetBase._check_hit`, points on edges are
+        outside.
+
+        Args:
+            x:
+                X coordinate of the point.
+            y:
+                Y coordinate of the point.
+            flags:
+                Only widgets having all these flags are returned.
+        """
+        aabbs = self._aabbs[: self._count]
+        mask = (
+            (aabbs[:, 0] < x)
+            & (x < aabbs[:, 2])
+            & (aabbs[:, 1] < y)
+            & (y < aabbs[:, 3])
+        )
+        return self._select(mask, flags)
+
+    def query_rect(
+        self, x1: float, y1: float, x2: float, y2: float, flags: int = 0
+    ) -> list[WidgetBase]:
+        """Widgets intersecting a rectangle, topmost first.
+
+        Args:
+            x1:
+                Left of the rectangle.
+            y1:
+                Bottom of the rectangle.
+            x2:
+                Right of the rectangle.
+            y2:
+                Top of the rectangle.
+            flags:
+                Only widgets having all these flags are returned.
+        """
+        aabbs = self._aabbs[: self._count]
+        mask = (
+            (aabbs[:, 0] < x2)
+            & (x1 < aabbs[:, 2])
+            & (aabbs[:, 1] < y2)
+            & (y1 < aabbs[:, 3])
+        )
+        return self._select(mask, flags)
+
+    def topmost(self, x: float, y: float, flags: int = 0) -> Optional[WidgetBase]:
+        """The topmost widget containing a point, if any.
+
+        Args:
+            x:
+                X coordinate of the point.
+            y:
+                Y coordinate of the point.
+            flags:
+                Only widgets having all these flags are considered.
+        """
+        widgets = self.query_point(x, y, flags)
+        return widgets[0] if widgets else None
+
+
+__all__ = "GeometryStore", "FLAG_ENABLED", "FLAG_VISIBLE"
@@ -1,15 +1,29 @@
 """Groups for internal use.
+
+Groups with the same state are interned by :py:func:`get_group`, so widgets sharing a
+parent share their groups, and the batch can draw them with the fewest draw calls.
 """
 
+from collections.abc import Iterable
 from typing import Optional
+from weakref import WeakValueDictionary
 
 from pyglet.gl import GL_SCISSOR_TEST, glDisable, glEnable, glIsEnabled, glScissor
-from pyglet.graphics import Group
+from pyglet.graphics import Batch, Group
+from pyglet.graphics.vertexdomain import VertexList
 from pyglet.math import Mat4, Vec3
 from pyglet.window import Window
 
+# (class, state...) -> canonical group, entries disappear with their groups.
+_group_cache: WeakValueDictionary = WeakValueDictionary()
+
 
 class ContainerGroup(Group):
+    """Clip and translate its children to the area of a container.
+
+    Every container has its own group, which is compared by identity, so the area can
+    change when the container moves without moving its children to another group.
+    """
 
     def __init__(
         self,
@@ -20,7 +34,7 @@ class ContainerGroup(Group):
     ):
         super().__init__(order, parent)
         self._window = window
-        self._area = area
+        self._area = tuple(area)
         self._prev_view = Mat4()
 
     @property
@@ -29,7 +43,7 @@ class ContainerGroup(Group):
 
     @area.setter
     def area(self, values: tuple[int, ...]):
-        self._area = values
+        self._area = tuple(values)
 
     def set_state(self):
         if not glIsEnabled(GL_SCISSOR_TEST):
@@ -43,5 +57,54 @@ class ContainerGroup(Group):
         if glIsEnabled(GL_SCISSOR_TEST):
             glDisable(GL_SCISSOR_TEST)
 
+    # Containers with the same parent mustn't be merged into one group.
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+
+def get_group(order: int = 0, parent: Optional[Group] = None) -> Group:
+    """Get the canonical ``Group(order, parent)``.
+
+    Args:
+        order:
+            Rendering order of the group.
+        parent:
+            Parent group of the group.
+    """
+    key = (Group, order, parent)
+    group = _group_cache.get(key)
+    if group is None:
+        group = Group(order, parent)
+        _group_cache[key] = group
+    return group
+
+
+def migrate_vertex_lists(
+    vertex_lists: Iterable[VertexList], source: Batch, target: Batch
+):
+    """Move vertex lists to another batch, keeping their groups and modes.
+
+    Unlike setting ``batch`` of a pyglet text layout, it doesn't lay out text again.
+
+    Args:
+        vertex_lists:
+            Vertex lists in the source batch.
+        source:
+            The batch they belong to.
+        target:
+            The batch to move them to.
+    """
+    owners = {}
+    for group, domains in source.group_map.items():
+        for (_, _, mode, _), domain in domains.items():
+            owners[domain] = group, mode
+    for vertex_list in vertex_lists:
+        group, mode = owners[vertex_list.domain]
+        source.migrate(vertex_list, mode, group, target)
+
 
-__all__ = ("ContainerGroup",)
+__all__ = (
+    "ContainerGroup",
+    "get_group",
+    "migrate_vertex_lists",
+)
@@ -0,0 +1,106 @@
+"""Layers of widgets drawn above each other.
+
+Every :py:class:`~goldenui.manager.GUIManager` has these layers, from bottom to top:
+
+============  =====  ==============================================================
+Name          Order  Rules
+============  =====  ==============================================================
+``base``      0      Widgets added without a layer.
+``popup``     100    Menus, drop-downs and other popups.
+``tooltip``   200    Tooltips.
+``modal``     300    Dialogs, widgets of lower layers get no events while it has any
+                     visible and enabled widget.
+``debug``     400    Overlays which are drawn but never receive events.
+============  =====  ==============================================================
+
+Each layer has its own batch, so widgets of an upper layer are always drawn above
+widgets of lower layers, and adding or removing them every frame doesn't touch the
+vertex domains of lower layers. Events go to upper layers first::
+
+    manager.add(menu, layer="popup")
+    manager.add(dialog, layer="modal")
+    manager.get_layer("debug").visible = False
+"""
+
+from pyglet.graphics import Batch
+
+from goldenui.widget.base import WidgetBase
+
+#: ``(name, order, modal, events)`` of layers every manager has.
+default_layers = (
+    ("base", 0, False, True),
+    ("popup", 100, False, True),
+    ("tooltip", 200, False, True),
+    ("modal", 300, True, True),
+    ("debug", 400, False, False),
+)
+
+
+class Layer:
+    """A named layer of a manager with its own batch."""
+
+    def __init__(
+        self, name: str, order: int, *, modal: bool = False, events: bool = True
+    ):
+        """Create a ``Layer``.
+
+        Use :py:meth:`.GUIManager.add_layer` instead of creating it directly.
+
+        Args:
+            name:
+                Name of the layer.
+            order:
+                Layers with a greater order are drawn above and receive events first.
+            modal:
+                Whether to stop events from going to lower layers while the layer has
+                visible and enabled widgets.
+            events:
+                Whether widgets of the layer receive events.
+        """
+        self._name = name
+        self._order = order
+        self._batch = Batch()
+        self._visible = True
+        #: Whether to stop events from going to lower layers while the layer has visible
+        #: and enabled widgets.
+        self.modal = modal
+        #: Whether widgets of the layer receive events.
+        self.events = events
+        # Visible and enabled widgets of the layer, the only ones events are routed to,
+        # in an ordered set.
+        self._routed: dict[WidgetBase, None] = {}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._name!r}, {self._order})"
+
+    @property
+    def name(self) -> str:
+        """Name of the layer."""
+        return self._name
+
+    @property
+    def order(self) -> int:
+        """Layers with a greater order are drawn above and receive events first."""
+        return self._order
+
+    @property
+    def batch(self) -> Batch:
+        """The batch which widgets of the layer are drawn from."""
+        return self._batch
+
+    @property
+    def visible(self) -> bool:
+        """Whether the layer is drawn and its widgets receive events."""
+        return self._visible
+
+    @visible.setter
+    def visible(self, new_visible: bool):
+        self._visible = new_visible
+
+    @property
+    def blocking(self) -> bool:
+        """Whether the layer is modal and stops events to lower layers right now."""
+        return self.modal and self._visible and bool(self._routed)
+
+
+__all__ = "Layer", "default_layers"
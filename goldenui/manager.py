@@ -3,10 +3,24 @@
 In this module, :py:class:`~.GUIManager` provides a way to control widgets.
 """
 
-from pyglet.graphics import Batch
+from collections.abc import Iterable
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Optional
+from weakref import WeakSet
+
+from pyglet.event import EVENT_HANDLED
 from pyglet.window import Window
 
-from goldenui.widget.base import WidgetBase
+from goldenui import aio
+from goldenui.accelerator import AcceleratorTable
+from goldenui.event import propagate
+from goldenui.layer import Layer, default_layers
+from goldenui.profiler import Profiler, batch_stats, pending_uploads
+from goldenui.updates import UpdateQueue
+from goldenui.widget.base import WidgetBase, _prune_detached_batch
+
+if TYPE_CHECKING:
+    from goldenui.geometry import GeometryStore
 
 
 class GUIManager:
@@ -18,7 +32,16 @@ class GUIManager:
     efficiency when a large quantity of widgets are in use.
     """
 
-    def __init__(self, window: Window, cell_size: int = 256):
+    def __init__(
+        self,
+        window: Window,
+        cell_size: int = 256,
+        *,
+        update_budget: Optional[float] = 0.002,
+        geometry: bool = False,
+        culling: bool = False,
+        propagation: bool = False,
+    ):
         """Create a ``GUIManager``.
 
         Args:
@@ -27,17 +50,62 @@ class GUIManager:
                 passed on to every added widgets.
             cell_size:
                 Size of the spatial hash.
+            update_budget:
+                Seconds spent at most on changes posted by :py:meth:`.post` per frame,
+                ``None`` means no limit.
+            geometry:
+                Whether to keep a :py:class:`~goldenui.geometry.GeometryStore`, which
+                requires NumPy.
+            culling:
+                Whether to stop drawing widgets outside the window, see
+                :py:attr:`.culling`.
+            propagation:
+                Whether to pass pointer events along the widget tree, see
+                :py:attr:`.propagation`.
         """
         self._window = window
-        self._batch = Batch()
-        self._another_behaviour = False
+        # Layers from bottom to top.
+        self._layers: list[Layer] = [
+            Layer(name, order, modal=modal, events=events)
+            for name, order, modal, events in default_layers
+        ]
+        self._layer_of: dict[WidgetBase, Layer] = {}
+        self._batch = self._layers[0].batch
         self._enabled = True
         if self._enabled:
             self._window.push_handlers(self)
         self._cell_size = cell_size
         self._cells: dict[tuple[int, int], set[WidgetBase]] = {}
+        # widget -> (min_i, min_j, max_i, max_j), the cells it was hashed into
+        self._ranges: dict[WidgetBase, tuple[int, int, int, int]] = {}
         self._active_widgets: set[WidgetBase] = set()
+        # Stacking order of widgets, the last added one is on top.
+        self._stacking: dict[WidgetBase, int] = {}
+        self._next_stacking = 0
+        self._propagation = propagation
+        self._accelerators = AcceleratorTable()
+        self._focus: Optional[WidgetBase] = None
+        # Paths of widgets, see `_hit_path`, under the pointer and pressed.
+        self._hover_path: list[tuple[WidgetBase, int, int]] = []
+        self._press_path: list[tuple[WidgetBase, int, int]] = []
         self._mouse_pos = (0, 0)
+        self._profiling = False
+        self._profiler = Profiler()
+        self._updates = UpdateQueue()
+        self._geometry = None
+        if geometry:
+            from goldenui.geometry import GeometryStore
+
+            self._geometry = GeometryStore()
+        self._culling = culling
+        self._viewport: Optional[tuple[int, int, int, int]] = None
+        # Widgets which are not culled while culling is enabled.
+        self._shown: set[WidgetBase] = set()
+        # Widgets with an `on_resize` method, which the manager passes window resizes to
+        # instead of pushing a handler per widget onto the window.
+        self._resize_widgets: WeakSet[WidgetBase] = WeakSet()
+        #: Seconds spent at most on posted changes per frame, ``None`` means no limit.
+        self.update_budget = update_budget
 
     @property
     def enabled(self) -> bool:
@@ -56,114 +124,747 @@ class GUIManager:
         else:
             self._window.remove_handlers(self)
 
+    @property
+    def profiling(self) -> bool:
+        """Whether to collect statistics of dispatching and drawing.
+
+        Statistics are available through :py:meth:`.stats` and the
+        :py:meth:`~goldenui.profiler.Profiler.on_stats` event of :py:attr:`.profiler`.
+        Collecting costs only a flag check per event and per frame when disabled.
+        """
+        return self._profiling
+
+    @profiling.setter
+    def profiling(self, new_profiling: bool):
+        self._profiling = new_profiling
+
+    @property
+    def profiler(self) -> Profiler:
+        """The profiler which collects statistics when :py:attr:`.profiling` is enabled."""
+        return self._profiler
+
+    def stats(self) -> dict[str, Any]:
+        """Statistics collected since profiling was enabled.
+
+        See :py:meth:`.Profiler.stats` for details. There is an extra ``batch`` key,
+        which is the result of :py:func:`~goldenui.profiler.batch_stats` on the batch of
+        the manager, and an ``updates`` key, which is the result of
+        :py:meth:`.UpdateQueue.stats` on :py:attr:`.updates`, and a ``culling`` key, which
+        is the number of drawn (``visible``), ``culled`` and ``hidden`` widgets, see
+        :py:attr:`.culling` and :py:attr:`.WidgetBase.visible`. The ``batch`` key only
+        covers the ``base`` layer, the ``layers`` key maps names of all layers to
+        :py:func:`~goldenui.profiler.batch_stats` on their batches.
+        """
+        stats = self._profiler.stats()
+        stats["batch"] = batch_stats(self._batch)
+        stats["layers"] = {
+            layer.name: batch_stats(layer.batch) for layer in self._layers
+        }
+        stats["updates"] = self._updates.stats()
+        hidden = sum(not widget._visible for widget in self._ranges)
+        culled = sum(widget._culled and widget._visible for widget in self._ranges)
+        stats["culling"] = {
+            "visible": len(self._ranges) - hidden - culled,
+            "culled": culled,
+            "hidden": hidden,
+        }
+        return stats
+
+    @property
+    def accelerators(self) -> AcceleratorTable:
+        """Keyboard shortcuts, which are looked up before widgets receive key presses.
+
+        While a modal layer blocks events, only shortcuts scoped to widgets in it or in
+        the layers above it fire.
+        """
+        return self._accelerators
+
+    @property
+    def focus(self) -> Optional[WidgetBase]:
+        """The focused widget, which decides scoped shortcuts of :py:attr:`.accelerators`.
+
+        It can be a widget in the manager or inside one of its containers, and is reset to
+        ``None`` when it is removed from the manager. Pressing a mouse button focuses the
+        innermost enabled widget under the pointer, or nobody. The widget losing focus receives
+        :py:meth:`~.WidgetBase.on_blur`, and the widget gaining it receives
+        :py:meth:`~.WidgetBase.on_focus`.
+        """
+        return self._focus
+
+    @focus.setter
+    def focus(self, widget: Optional[WidgetBase]):
+        old_focus = self._focus
+        if old_focus is widget:
+            return
+        self._focus = widget
+        if old_focus is not None:
+            old_focus.dispatch_event("on_blur")
+        if widget is not None:
+            widget.dispatch_event("on_focus")
+
+    @property
+    def layers(self) -> tuple[Layer, ...]:
+        """Layers of the manager from bottom to top, see :py:mod:`goldenui.layer`."""
+        return tuple(self._layers)
+
+    def get_layer(self, name: str) -> Layer:
+        """Get a layer by its name.
+
+        Raises:
+            ValueError: There is no such layer.
+        """
+        for layer in self._layers:
+            if layer.name == name:
+                return layer
+        raise ValueError(f"no layer named {name!r}")
+
+    def add_layer(
+        self, name: str, order: int, *, modal: bool = False, events: bool = True
+    ) -> Layer:
+        """Add a layer.
+
+        Args:
+            name:
+                Name of the layer.
+            order:
+                Layers with a greater order are drawn above and receive events first.
+                Among layers of the same order, the last added one is on top.
+            modal:
+                Whether to stop events and shortcuts from going to lower layers while
+                the layer has visible and enabled widgets.
+            events:
+                Whether widgets of the layer receive events.
+
+        Raises:
+            ValueError: There is already a layer with the name.
+        """
+        if any(layer.name == name for layer in self._layers):
+            raise ValueError(f"there is already a layer named {name!r}")
+        layer = Layer(name, order, modal=modal, events=events)
+        self._layers.append(layer)
+        self._layers.sort(key=lambda layer: layer.order)
+        return layer
+
+    def layer_of(self, widget: WidgetBase) -> Optional[Layer]:
+        """The layer of an added widget, ``None`` if it is not in the manager."""
+        return self._layer_of.get(widget)
+
+    def set_layer(self, widget: WidgetBase, name: str):
+        """Move an added widget to another layer, on top of widgets in the layer.
+
+        The widget moves to the batch of the new layer if it was in the batch of the old
+        one.
+
+        Args:
+            widget:
+                The widget to move.
+            name:
+                Name of the new layer.
+        """
+        layer, old_layer = self.get_layer(name), self._layer_of[widget]
+        if layer is old_layer:
+            return
+        self._erase(widget)
+        self._layer_of[widget] = layer
+        self._insert(widget, self._ranges[widget])
+        self._stacking[widget] = self._next_stacking
+        self._next_stacking += 1
+        if widget.batch is old_layer.batch:
+            widget.batch = layer.batch
+        self._forget_paths(widget)
+        self.on_mouse_motion(*self._mouse_pos, 0, 0)
+
+    def _event_layers(self) -> list[Layer]:
+        """Layers receiving events from top to bottom, down to the first blocking one."""
+        layers = []
+        for layer in reversed(self._layers):
+            if not (layer.events and layer._visible):
+                continue
+            layers.append(layer)
+            if layer.modal and layer._routed:
+                break
+        return layers
+
+    def _routed_widgets(self) -> list[WidgetBase]:
+        """Widgets receiving keyboard events, those of upper layers first."""
+        widgets = []
+        for layer in self._event_layers():
+            widgets.extend(layer._routed)
+        return widgets
+
+    def _cell_widgets(self, x: int, y: int) -> list[WidgetBase]:
+        """Widgets receiving pointer events at a point, those of upper layers first."""
+        cell = self._cells.get(self._hash(x, y), ())
+        widgets = []
+        for layer in self._event_layers():
+            routed = layer._routed
+            widgets.extend(widget for widget in cell if widget in routed)
+        return widgets
+
+    @property
+    def propagation(self) -> bool:
+        """Whether to pass pointer events along the widget tree.
+
+        By default, pointer events are given to every widget whose cell contains the
+        pointer, and containers give them to all their children. With propagation, they
+        only go along the path from the topmost widget under the pointer down to the
+        innermost one, with capture and bubble phases, see :py:mod:`goldenui.event`.
+        Dragging and releasing go along the path where the button was pressed.
+        """
+        return self._propagation
+
+    @propagation.setter
+    def propagation(self, new_propagation: bool):
+        self._propagation = new_propagation
+        self._hover_path = []
+        self._press_path = []
+
+    def _hit_path(self, x: int, y: int) -> list[tuple[WidgetBase, int, int]]:
+        """Widgets from the topmost one under a point down to the innermost one.
+
+        Returns:
+            ``(widget, dx, dy)``, where ``(x - dx, y - dy)`` is the point in the space
+            of the widget's position.
+        """
+        cell = self._cells.get(self._hash(x, y), ())
+        for layer in self._event_layers():
+            routed = layer._routed
+            hits = [
+                widget
+                for widget in cell
+                if widget in routed and widget._check_hit(x, y) >= 0
+            ]
+            if hits:
+                break
+        else:
+            return []
+        widget = max(hits, key=self._stacking.__getitem__)
+        dx = dy = 0
+        path = [(widget, dx, dy)]
+        while True:
+            dx, dy = dx + widget._x, dy + widget._y
+            widget = widget._child_at(x - dx, y - dy)
+            if widget is None:
+                return path
+            path.append((widget, dx, dy))
+
+    def _forget_paths(self, widget: WidgetBase):
+        """Stop routing to a top-level widget which no longer receives events."""
+        if self._hover_path and self._hover_path[0][0] is widget:
+            self._hover_path = []
+        if self._press_path and self._press_path[0][0] is widget:
+            self._press_path = []
+
+    def _route(
+        self,
+        path: list[tuple[WidgetBase, int, int]],
+        event_type: str,
+        x: int,
+        y: int,
+        *args: Any,
+    ):
+        """Pass a pointer event along a path of widgets."""
+        if not path:
+            return
+        if not self._profiling:
+            propagate(path, event_type, x, y, *args)
+            return
+        start = perf_counter()
+        propagate(path, event_type, x, y, *args)
+        self._profiler.record_event(event_type, len(path), perf_counter() - start)
+
+    @property
+    def culling(self) -> bool:
+        """Whether to stop drawing widgets which are entirely outside :py:attr:`.viewport`.
+
+        Vertex lists of culled widgets are moved out of the batch until they can be seen
+        again, see :py:attr:`.WidgetBase.culled`, while they still receive events. Don't
+        enable it if the batch is drawn to something larger than the viewport, e.g. an
+        :py:class:`~goldenui.offscreen.OffscreenTarget` larger than the window.
+        """
+        return self._culling
+
+    @culling.setter
+    def culling(self, new_culling: bool):
+        if self._culling == new_culling:
+            return
+        self._culling = new_culling
+        if new_culling:
+            for widget in self._ranges:
+                self._cull(widget, self._visible_rect())
+        else:
+            self._cull_all()
+
+    @property
+    def viewport(self) -> tuple[int, int, int, int]:
+        """``(x, y, width, height)`` of the visible area, used by :py:attr:`.culling`.
+
+        It is the window by default. Set it when the view of the window is translated or
+        scaled, e.g. when scrolling a large board, and set it to ``None`` to follow the
+        window again.
+        """
+        if self._viewport is None:
+            return 0, 0, self._window.width, self._window.height
+        return self._viewport
+
+    @viewport.setter
+    def viewport(self, new_viewport: Optional[tuple[int, int, int, int]]):
+        self._viewport = None if new_viewport is None else tuple(new_viewport)
+        self._cull_all()
+
+    def _visible_rect(self) -> tuple[int, int, int, int]:
+        x, y, width, height = self.viewport
+        return x, y, x + width, y + height
+
+    def _cull(self, widget: WidgetBase, rect: tuple[int, int, int, int]):
+        x1, y1, x2, y2 = widget.aabb
+        culled = not (x1 < rect[2] and rect[0] < x2 and y1 < rect[3] and rect[1] < y2)
+        widget._set_culled(culled)
+        if culled:
+            self._shown.discard(widget)
+        else:
+            self._shown.add(widget)
+
+    def _cull_all(self):
+        if not self._culling:
+            for widget in self._shown.union(self._ranges):
+                widget._set_culled(False)
+            self._shown.clear()
+            return
+        rect = self._visible_rect()
+        min_i, min_j = self._hash(rect[0], rect[1])
+        max_i, max_j = self._hash(rect[2], rect[3])
+        # Only widgets in cells covering the viewport can be seen, and only widgets
+        # which were shown need to be culled.
+        candidates = set()
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                candidates.update(self._cells.get((i, j), ()))
+        for widget in self._shown - candidates:
+            widget._set_culled(True)
+        self._shown &= candidates
+        for widget in candidates:
+            self._cull(widget, rect)
+
+    @property
+    def geometry(self) -> Optional["GeometryStore"]:
+        """The geometry store of widgets, if the manager is created with one."""
+        return self._geometry
+
+    @property
+    def updates(self) -> UpdateQueue:
+        """The queue of changes posted by :py:meth:`.post`."""
+        return self._updates
+
+    def post(self, widget: WidgetBase, name: str, value: Any) -> bool:
+        """Change a property of a widget from any thread.
+
+        The change is applied on the main thread by the next :py:meth:`.draw`, and an
+        earlier change to the same property which is still pending is overwritten.
+        Changes to widgets which are not in the manager by then, directly or inside a
+        container, are dropped.
+
+        Args:
+            widget:
+                The widget to change.
+            name:
+                Name of the property, e.g. ``"text"`` or ``"enabled"``.
+            value:
+                New value of the property.
+
+        Returns:
+            ``False`` if the change was dropped because the queue is full.
+        """
+        return self._updates.post(widget, name, value)
+
+    def process_updates(self) -> int:
+        """Apply changes posted by :py:meth:`.post` within :py:attr:`.update_budget`.
+
+        It is called by :py:meth:`.draw`, call it yourself only if the manager is not
+        drawn.
+
+        Returns:
+            The number of applied changes.
+        """
+        return self._updates.drain(self.update_budget, self._owns)
+
+    def _owns(self, widget: WidgetBase) -> bool:
+        """Whether the widget is in the manager, directly or inside a container."""
+        while widget is not None:
+            if widget._manager is self:
+                return True
+            widget = widget._parent
+        return False
+
     def _hash(self, x: int, y: int) -> tuple[int, int]:
         """Normalize position to cell."""
-        return x // self._cell_size, y // self._cell_size
+        return int(x // self._cell_size), int(y // self._cell_size)
+
+    @staticmethod
+    def _add_to_cells(
+        cells: dict[tuple[int, int], set[WidgetBase]],
+        widget: WidgetBase,
+        cell_range: tuple[int, int, int, int],
+    ):
+        min_i, min_j, max_i, max_j = cell_range
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                cell = cells.get((i, j))
+                if cell is None:
+                    cells[(i, j)] = {widget}
+                else:
+                    cell.add(widget)
+
+    @staticmethod
+    def _discard_from_cells(
+        cells: dict[tuple[int, int], set[WidgetBase]],
+        widget: WidgetBase,
+        cell_range: tuple[int, int, int, int],
+    ):
+        min_i, min_j, max_i, max_j = cell_range
+        for i in range(min_i, max_i + 1):
+            for j in range(min_j, max_j + 1):
+                cell = cells[(i, j)]
+                cell.discard(widget)
+                if not cell:
+                    del cells[(i, j)]
+
+    def _get_range(self, widget: WidgetBase) -> tuple[int, int, int, int]:
+        x1, y1, x2, y2 = widget.aabb
+        return self._hash(x1, y1) + self._hash(x2, y2)
+
+    def _insert(
+        self, widget: WidgetBase, cells: Optional[tuple[int, int, int, int]] = None
+    ):
+        """Hash a widget into cells, which are computed if not given."""
+        if cells is None:
+            cells = self._get_range(widget)
+        self._ranges[widget] = cells
+        self._add_to_cells(self._cells, widget, cells)
+        if widget._visible and widget._enabled:
+            self._layer_of[widget]._routed[widget] = None
+
+    def _erase(self, widget: WidgetBase):
+        """Remove a widget from cells it was hashed into."""
+        self._discard_from_cells(self._cells, widget, self._ranges[widget])
+        self._layer_of[widget]._routed.pop(widget, None)
 
     def _on_repositioning_hook(self, widget: WidgetBase):
-        self._another_behaviour = True
-        self.remove(widget)
-        self.add(widget)
-        self._another_behaviour = False
+        if widget not in self._ranges:
+            return
+        if self._profiling:
+            start = perf_counter()
+        old_range, new_range = self._ranges[widget], self._get_range(widget)
+        if old_range != new_range:
+            self._ranges[widget] = new_range
+            self._discard_from_cells(self._cells, widget, old_range)
+            self._add_to_cells(self._cells, widget, new_range)
+        if self._geometry is not None:
+            self._geometry.update(widget)
+        if self._culling:
+            self._cull(widget, self._visible_rect())
+        if self._profiling:
+            self._profiler.record_rehash(perf_counter() - start)
         self.on_mouse_motion(*self._mouse_pos, 0, 0)
 
-    def add(self, *widgets: WidgetBase):
+    def _dispatch(self, widgets: Iterable[WidgetBase], event_type: str, *args: Any):
+        """Pass an event to widgets."""
+        # Handlers may hide, disable or remove widgets, which changes the indexes.
+        widgets = tuple(widgets)
+        if self._profiling:
+            self._dispatch_profiled(widgets, event_type, args)
+            return
+        for widget in widgets:
+            widget.dispatch_event(event_type, *args)
+
+    def _dispatch_profiled(
+        self, widgets: Iterable[WidgetBase], event_type: str, args: tuple
+    ):
+        profiler = self._profiler
+        visited = 0
+        event_start = perf_counter()
+        for widget in widgets:
+            start = perf_counter()
+            widget.dispatch_event(event_type, *args)
+            profiler.record_handler(type(widget).__qualname__, perf_counter() - start)
+            visited += 1
+        profiler.record_event(event_type, visited, perf_counter() - event_start)
+
+    def add(self, *widgets: WidgetBase, layer: str = "base"):
         """Add some widgets to the manager.
 
         Args:
             widgets:
                 Widgets want to add.
+            layer:
+                Name of the layer to add them to, see :py:mod:`goldenui.layer`.
+                Widgets without a batch are drawn from the batch of the layer.
         """
-        for widget in widgets:
-            min_vec = self._hash(*widget.aabb[0:2])
-            max_vec = self._hash(*widget.aabb[2:4])
-            for i in range(min_vec[0], max_vec[0] + 1):
-                for j in range(min_vec[1], max_vec[1] + 1):
-                    self._cells.setdefault((i, j), set()).add(widget)
+        target = self.get_layer(layer)
+        new_widgets = list(dict.fromkeys(w for w in widgets if w not in self._ranges))
+        for widget in new_widgets:
+            self._layer_of[widget] = target
+        if self._geometry is None:
+            for widget in new_widgets:
+                self._insert(widget)
+        else:
+            rows = self._geometry.add(new_widgets)
+            cells = self._geometry.cell_ranges(rows, self._cell_size).tolist()
+            for widget, widget_cells in zip(new_widgets, cells):
+                self._insert(widget, tuple(widget_cells))
+        for widget in new_widgets:
+            widget._manager = self
+            self._stacking[widget] = self._next_stacking
+            self._next_stacking += 1
             if widget.batch is None:
-                widget.batch = self._batch
-            if not self._another_behaviour:
-                if hasattr(widget, "on_resize"):
-                    self._window.push_handlers(on_resize=widget.on_resize)
-                widget.set_handler("on_repositioning", self._on_repositioning_hook)
+                widget.batch = target.batch
+            if hasattr(widget, "on_resize"):
+                self._resize_widgets.add(widget)
+        if self._culling:
+            rect = self._visible_rect()
+            for widget in new_widgets:
+                self._cull(widget, rect)
 
     def remove(self, *widgets: WidgetBase):
         """Remove some added widgets.
 
+        Tasks started by coroutine handlers of removed widgets are cancelled, see
+        :py:mod:`goldenui.aio`.
+
         Args:
             widgets:
                 Widgets want to remove.
         """
-        for widget in widgets:
-            for cell in self._cells.values():
-                if widget in cell:
-                    cell.remove(widget)
-            if widget.batch is self._batch:
+        old_widgets = list(dict.fromkeys(w for w in widgets if w in self._ranges))
+        if self._geometry is not None:
+            self._geometry.remove(old_widgets)
+        for widget in old_widgets:
+            widget._manager = None
+            widget._set_culled(False)
+            self._shown.discard(widget)
+            self._erase(widget)
+            del self._ranges[widget]
+            del self._stacking[widget]
+            self._forget_paths(widget)
+            self._active_widgets.discard(widget)
+            self._blur_inside(widget)
+            if widget.batch is self._layer_of.pop(widget).batch:
                 widget.batch = None
-            if not self._another_behaviour:
-                if hasattr(widget, "on_resize"):
-                    self._window.remove_handlers(on_resize=widget.on_resize)
-                widget.set_handler("on_repositioning", lambda w: None)
+            self._resize_widgets.discard(widget)
+            aio._on_remove(widget)
+
+    def _blur_inside(self, widget: WidgetBase):
+        """Reset :py:attr:`.focus` if it is the widget or inside it."""
+        focus = self._focus
+        while focus is not None and focus is not widget:
+            focus = focus._parent
+        if focus is not None:
+            self.focus = None
+
+    def dispose(self):
+        """Dispose all widgets of the manager and stop receiving window events.
+
+        See :py:meth:`.WidgetBase.dispose`. The manager shouldn't be used afterwards.
+        """
+        self.enabled = False
+        for widget in list(self._ranges):
+            widget.dispose()
+        self._updates.clear()
+
+    def _on_widget_state(self, widget: WidgetBase):
+        """Route events to a widget only while it is visible and enabled."""
+        if widget not in self._ranges:
+            return
+        if self._geometry is not None:
+            self._geometry.update(widget)
+        routed = widget._visible and widget._enabled
+        layer = self._layer_of[widget]
+        if routed == (widget in layer._routed):
+            return
+        if routed:
+            layer._routed[widget] = None
+            # Let it catch up with the pointer, e.g. to show hovering.
+            widget.dispatch_event("on_mouse_motion", *self._mouse_pos, 0, 0)
+        else:
+            del layer._routed[widget]
+            self._active_widgets.discard(widget)
+            self._forget_paths(widget)
+
+    def widgets_at(self, x: int, y: int) -> list[WidgetBase]:
+        """Widgets whose bounding box contains a point, the last added first.
+
+        Without a :py:attr:`.geometry` store, the widgets in the cell of the point are
+        checked one by one.
+
+        Args:
+            x:
+                X coordinate of the point.
+            y:
+                Y coordinate of the point.
+        """
+        if self._geometry is not None:
+            return self._geometry.query_point(x, y)
+        hits = [
+            widget
+            for widget in self._cells.get(self._hash(x, y), ())
+            if widget.aabb[0] < x < widget.aabb[2]
+            and widget.aabb[1] < y < widget.aabb[3]
+        ]
+        hits.sort(key=self._stacking.__getitem__, reverse=True)
+        return hits
+
+    def widgets_in(self, x1: int, y1: int, x2: int, y2: int) -> list[WidgetBase]:
+        """Widgets whose bounding box intersects a rectangle, the last added first.
+
+        It is useful for selection boxes and culling. Without a :py:attr:`.geometry`
+        store, every widget is checked one by one.
+
+        Args:
+            x1:
+                Left of the rectangle.
+            y1:
+                Bottom of the rectangle.
+            x2:
+                Right of the rectangle.
+            y2:
+                Top of the rectangle.
+        """
+        if self._geometry is not None:
+            return self._geometry.query_rect(x1, y1, x2, y2)
+        result = []
+        for widget in reversed(self._ranges):
+            wx1, wy1, wx2, wy2 = widget.aabb
+            if wx1 < x2 and x1 < wx2 and wy1 < y2 and y1 < wy2:
+                result.append(widget)
+        return result
 
     def draw(self):
-        """Draw all widgets in the manager."""
-        self._batch.draw()
+        """Draw all widgets in the manager, visible layers from bottom to top."""
+        if self._updates:
+            self.process_updates()
+        _prune_detached_batch()
+        if not self._profiling:
+            for layer in self._layers:
+                if layer._visible:
+                    layer._batch.draw()
+            return
+        uploads = upload_bytes = 0
+        for layer in self._layers:
+            if layer._visible:
+                layer_uploads, layer_bytes = pending_uploads(layer._batch)
+                uploads += layer_uploads
+                upload_bytes += layer_bytes
+        start = perf_counter()
+        for layer in self._layers:
+            if layer._visible:
+                layer._batch.draw()
+        self._profiler.record_draw(perf_counter() - start, uploads, upload_bytes)
+
+    def on_resize(self, width: int, height: int):
+        for widget in list(self._resize_widgets):
+            widget.on_resize(width, height)
+        if self._culling and self._viewport is None:
+            self._cull_all()
 
     def on_file_drop(self, x: int, y: int, paths: list[str]):
-        for widget in self._cells.get(self._hash(x, y), set()):
-            widget.dispatch_event("on_file_drop", x, y, paths)
+        if self._propagation:
+            self._route(self._hit_path(x, y), "on_file_drop", x, y, paths)
+            self._mouse_pos = x, y
+            return
+        cell = self._cell_widgets(x, y)
+        self._dispatch(cell, "on_file_drop", x, y, paths)
         self._mouse_pos = x, y
 
     def on_key_press(self, symbol: int, modifiers: int):
-        for cell in self._cells.values():
-            for widget in cell:
-                widget.dispatch_event("on_key_press", symbol, modifiers)
+        layers = self._event_layers()
+        accept = None
+        if layers and layers[-1].modal and layers[-1]._routed:
+
+            def accept(scope: Optional[WidgetBase]) -> bool:
+                # Shortcuts of the whole window and of blocked layers don't fire.
+                while scope is not None and scope._parent is not None:
+                    scope = scope._parent
+                return scope is not None and self._layer_of.get(scope) in layers
+
+        if self._accelerators.dispatch(symbol, modifiers, self._focus, accept):
+            return EVENT_HANDLED
+        widgets = []
+        for layer in layers:
+            widgets.extend(layer._routed)
+        self._dispatch(widgets, "on_key_press", symbol, modifiers)
 
     def on_key_release(self, symbol: int, modifiers: int):
-        for cell in self._cells.values():
-            for widget in cell:
-                widget.dispatch_event("on_key_release", symbol, modifiers)
+        self._dispatch(self._routed_widgets(), "on_key_release", symbol, modifiers)
 
     def on_mouse_press(self, x: int, y: int, buttons: int, modifiers: int):
-        for widget in self._cells.get(self._hash(x, y), set()):
-            widget.dispatch_event("on_mouse_press", x, y, buttons, modifiers)
-            self._active_widgets.add(widget)
+        path = self._hit_path(x, y)
+        # Widgets only receive presses in their cells, so they can't blur themselves.
+        self.focus = path[-1][0] if path and path[-1][0]._enabled else None
+        if self._propagation:
+            self._press_path = path
+            self._route(self._press_path, "on_mouse_press", x, y, buttons, modifiers)
+            return
+        cell = self._cell_widgets(x, y)
+        self._dispatch(cell, "on_mouse_press", x, y, buttons, modifiers)
+        self._active_widgets.update(cell)
 
     def on_mouse_release(self, x: int, y: int, buttons: int, modifiers: int):
-        for widget in self._active_widgets:
-            widget.dispatch_event("on_mouse_release", x, y, buttons, modifiers)
+        if self._propagation:
+            path, self._press_path = self._press_path, []
+            self._route(path, "on_mouse_release", x, y, buttons, modifiers)
+            return
+        self._dispatch(
+            self._active_widgets, "on_mouse_release", x, y, buttons, modifiers
+        )
         self._active_widgets.clear()
 
     def on_mouse_drag(
         self, x: int, y: int, dx: int, dy: int, buttons: int, modifiers: int
     ):
-        for widget in self._active_widgets:
-            widget.dispatch_event("on_mouse_drag", x, y, dx, dy, buttons, modifiers)
+        if self._propagation:
+            self._route(
+                self._press_path, "on_mouse_drag", x, y, dx, dy, buttons, modifiers
+            )
+            self._mouse_pos = x, y
+            return
+        self._dispatch(
+            self._active_widgets, "on_mouse_drag", x, y, dx, dy, buttons, modifiers
+        )
         self._mouse_pos = x, y
 
     def on_mouse_motion(self, x: int, y: int, dx: int, dy: int):
-        for widget in self._cells.get(self._hash(x, y), set()):
-            widget.dispatch_event("on_mouse_motion", x, y, dx, dy)
+        if self._propagation:
+            path = self._hit_path(x, y)
+            if self._hover_path and (
+                not path or path[-1][0] is not self._hover_path[-1][0]
+            ):
+                # Let the widget which the pointer leaves know it, e.g. to unhover.
+                widget, ox, oy = self._hover_path[-1]
+                widget.dispatch_event("on_mouse_motion", x - ox, y - oy, dx, dy)
+            self._hover_path = path
+            self._route(path, "on_mouse_motion", x, y, dx, dy)
+            self._mouse_pos = x, y
+            return
+        cell = self._cell_widgets(x, y)
+        self._dispatch(cell, "on_mouse_motion", x, y, dx, dy)
         self._mouse_pos = x, y
 
     def on_mouse_scroll(self, x: int, y: int, scroll_x: int, scroll_y: int):
-        for widget in self._cells.get(self._hash(x, y), set()):
-            widget.on_mouse_scroll(x, y, scroll_x, scroll_y)
+        if self._propagation:
+            path = self._hit_path(x, y)
+            self._route(path, "on_mouse_scroll", x, y, scroll_x, scroll_y)
+            return
+        cell = self._cell_widgets(x, y)
+        self._dispatch(cell, "on_mouse_scroll", x, y, scroll_x, scroll_y)
 
     def on_text(self, text: str):
-        for cell in self._cells.values():
-            for widget in cell:
-                widget.dispatch_event("on_text", text)
+        self._dispatch(self._routed_widgets(), "on_text", text)
 
     def on_text_motion(self, motion: int):
-        for cell in self._cells.values():
-            for widget in cell:
-                widget.dispatch_event("on_text_motion", motion)
+        self._dispatch(self._routed_widgets(), "on_text_motion", motion)
 
     def on_text_motion_select(self, motion: int):
-        for cell in self._cells.values():
-            for widget in cell:
-                widget.dispatch_event("on_text_motion_select", motion)
+        self._dispatch(self._routed_widgets(), "on_text_motion_select", motion)
 
 
 __all__ = ("GUIManager",)
@@ -0,0 +1,269 @@
+"""Render widgets without showing a window.
+
+:py:class:`OffscreenTarget` draws a :py:class:`~goldenui.manager.GUIManager` into a
+framebuffer object and reads the pixels back as RGBA bytes, which is useful for
+generating screenshots in bulk.
+
+The manager still needs a window for its GL context, but it can be invisible. On a
+headless Linux box, enable pyglet's headless mode before importing ``pyglet.window``, so
+that the context is created by EGL (e.g. Mesa's software renderer) instead of X11::
+
+    import pyglet
+
+    pyglet.options["headless"] = True
+
+    from pyglet.window import Window
+
+    window = Window(800, 600, visible=False)
+    manager = GUIManager(window)
+    target = OffscreenTarget(manager)
+    pixels = target.snapshot(copy=True)
+"""
+
+import ctypes
+from collections import deque
+from typing import TYPE_CHECKING, Optional
+
+from pyglet.gl import (
+    GL_COLOR_BUFFER_BIT,
+    GL_MAP_READ_BIT,
+    GL_PACK_ALIGNMENT,
+    GL_PIXEL_PACK_BUFFER,
+    GL_RGBA,
+    GL_RGBA8,
+    GL_STREAM_READ,
+    GL_UNSIGNED_BYTE,
+    GL_VIEWPORT,
+    GLint,
+    GLuint,
+    glBindBuffer,
+    glBufferData,
+    glClear,
+    glClearColor,
+    glDeleteBuffers,
+    glGenBuffers,
+    glGetIntegerv,
+    glMapBufferRange,
+    glPixelStorei,
+    glReadPixels,
+    glUnmapBuffer,
+    glViewport,
+)
+from pyglet.image.buffer import Framebuffer, Renderbuffer
+from pyglet.math import Mat4
+
+if TYPE_CHECKING:
+    from goldenui.manager import GUIManager
+
+
+class OffscreenTarget:
+    """An offscreen RGBA target to render a manager into.
+
+    Pixels are tightly packed RGBA, 4 bytes per pixel, and rows go from bottom to top as
+    OpenGL stores them. Flip the rows (e.g. ``Image.transpose`` of Pillow) when saving
+    them as an ordinary image.
+
+    :py:meth:`.snapshot` waits for the GPU to finish every frame. When rendering many
+    frames back-to-back, :py:meth:`.snapshot_async` reads pixels through a ring of pixel
+    buffer objects instead, so the GPU can render the next frame while the previous one
+    is being copied.
+    """
+
+    def __init__(
+        self,
+        manager: "GUIManager",
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        *,
+        pbo_count: int = 2,
+    ):
+        """Create an ``OffscreenTarget``.
+
+        Args:
+            manager:
+                The manager to render.
+            width:
+                Width of the target, defaults to the width of the window.
+            height:
+                Height of the target, defaults to the height of the window.
+            pbo_count:
+                Number of pixel buffer objects used by :py:meth:`.snapshot_async`, which
+                is also how many frames a result lags behind.
+        """
+        if pbo_count < 1:
+            raise ValueError("pbo_count should be at least 1")
+        self._manager = manager
+        self._window = manager._window
+        self._width = width or self._window.width
+        self._height = height or self._window.height
+        self._pbo_count = pbo_count
+        self._framebuffer = None
+        self._renderbuffer = None
+        self._pbos = None
+        self._pending: deque[int] = deque()
+        self._next_pbo = 0
+        self._buffer = None
+        self._create()
+
+    @property
+    def width(self) -> int:
+        """Width of the target."""
+        return self._width
+
+    @property
+    def height(self) -> int:
+        """Height of the target."""
+        return self._height
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """The ``(width, height)`` of the target, as a tuple."""
+        return self._width, self._height
+
+    @property
+    def _nbytes(self) -> int:
+        return 4 * self._width * self._height
+
+    def _create(self):
+        self._renderbuffer = Renderbuffer(self._width, self._height, GL_RGBA8)
+        self._framebuffer = Framebuffer()
+        self._framebuffer.attach_renderbuffer(self._renderbuffer)
+        self._pbos = (GLuint * self._pbo_count)()
+        glGenBuffers(self._pbo_count, self._pbos)
+        for pbo in self._pbos:
+            glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+            glBufferData(GL_PIXEL_PACK_BUFFER, self._nbytes, None, GL_STREAM_READ)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._pending.clear()
+        self._next_pbo = 0
+        self._buffer = (ctypes.c_ubyte * self._nbytes)()
+
+    def _destroy(self):
+        if self._framebuffer is not None:
+            self._framebuffer.delete()
+            self._renderbuffer.delete()
+            glDeleteBuffers(self._pbo_count, self._pbos)
+            self._framebuffer = self._renderbuffer = self._pbos = None
+
+    def resize(self, width: int, height: int):
+        """Change the size of the target.
+
+        Frames pending in :py:meth:`.snapshot_async` are discarded.
+
+        Args:
+            width:
+                New width of the target.
+            height:
+                New height of the target.
+        """
+        if (width, height) == (self._width, self._height):
+            return
+        self._destroy()
+        self._width, self._height = width, height
+        self._create()
+
+    def render(self):
+        """Draw the manager into the target.
+
+        The window's viewport and projection are restored afterwards, so a visible
+        window can keep drawing as usual.
+        """
+        viewport = (GLint * 4)()
+        glGetIntegerv(GL_VIEWPORT, viewport)
+        projection = self._window.projection
+        self._framebuffer.bind()
+        try:
+            glViewport(0, 0, self._width, self._height)
+            self._window.projection = Mat4.orthogonal_projection(
+                0, self._width, 0, self._height, -255, 255
+            )
+            glClearColor(0, 0, 0, 0)
+            glClear(GL_COLOR_BUFFER_BIT)
+            self._manager.draw()
+        finally:
+            self._framebuffer.unbind()
+            self._window.projection = projection
+            glViewport(*viewport)
+
+    def read(self, copy: bool = False) -> memoryview | bytes:
+        """Read pixels of the last :py:meth:`.render`.
+
+        Args:
+            copy:
+                Return a new ``bytes`` object. Otherwise a memoryview of an internal
+                buffer is returned, which is overwritten by the next read.
+        """
+        self._framebuffer.bind()
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glReadPixels(
+            0, 0, self._width, self._height, GL_RGBA, GL_UNSIGNED_BYTE, self._buffer
+        )
+        self._framebuffer.unbind()
+        return self._result(copy)
+
+    def snapshot(self, copy: bool = False) -> memoryview | bytes:
+        """Render the manager and read the pixels.
+
+        Args:
+            copy:
+                See :py:meth:`.read`.
+        """
+        self.render()
+        return self.read(copy)
+
+    def snapshot_async(self, copy: bool = False) -> Optional[memoryview | bytes]:
+        """Render the manager and start reading the pixels without waiting.
+
+        Returns the pixels of the frame rendered ``pbo_count`` calls ago, or ``None``
+        while the ring of pixel buffers is still filling up. Call :py:meth:`.flush` to
+        get the remaining frames.
+
+        Args:
+            copy:
+                See :py:meth:`.read`.
+        """
+        self.render()
+        result = None
+        if len(self._pending) == self._pbo_count:
+            result = self._collect(copy)
+        pbo = self._pbos[self._next_pbo]
+        self._framebuffer.bind()
+        glPixelStorei(GL_PACK_ALIGNMENT, 1)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, pbo)
+        # With a buffer bound, the last argument is an offset into it.
+        glReadPixels(0, 0, self._width, self._height, GL_RGBA, GL_UNSIGNED_BYTE, 0)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        self._framebuffer.unbind()
+        self._pending.append(pbo)
+        self._next_pbo = (self._next_pbo + 1) % self._pbo_count
+        return result
+
+    def flush(self) -> list[bytes]:
+        """Wait for and return the frames pending in :py:meth:`.snapshot_async`."""
+        frames = []
+        while self._pending:
+            frames.append(self._collect(True))
+        return frames
+
+    def _collect(self, copy: bool) -> memoryview | bytes:
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, self._pending.popleft())
+        pointer = glMapBufferRange(
+            GL_PIXEL_PACK_BUFFER, 0, self._nbytes, GL_MAP_READ_BIT
+        )
+        ctypes.memmove(self._buffer, pointer, self._nbytes)
+        glUnmapBuffer(GL_PIXEL_PACK_BUFFER)
+        glBindBuffer(GL_PIXEL_PACK_BUFFER, 0)
+        return self._result(copy)
+
+    def _result(self, copy: bool) -> memoryview | bytes:
+        if copy:
+            return bytes(self._buffer)
+        return memoryview(self._buffer).cast("B")
+
+    def delete(self):
+        """Release the framebuffer and pixel buffers."""
+        self._destroy()
+        self._pending.clear()
+
+
+__all__ = ("OffscreenTarget",)
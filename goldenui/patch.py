@@ -3,100 +3,153 @@
 Patches are like :py:class:`~pyglet.sprite.Sprite`, but they split a whole image into
 several parts to avoid distortion when scaling them.
 
+A patch is a single vertex list rather than several sprites, so all parts of a patch must
+be in the same texture, e.g. regions of the same texture atlas.
+
 Patches are for internal use only.
 """
 
 from collections.abc import Sequence
 from typing import Optional
 
+from pyglet.gl import GL_ONE_MINUS_SRC_ALPHA, GL_SRC_ALPHA, GL_TRIANGLES
 from pyglet.graphics import Batch, Group
 from pyglet.image import AbstractImage
-from pyglet.sprite import Sprite
+from pyglet.sprite import SpriteGroup, get_default_shader
+
+
+class _PatchBase:
+    """Common part of patches.
+
+    Subclasses should set ``_images`` before calling :py:meth:`._create_vertex_list`,
+    and implement :py:meth:`._get_quads`.
+    """
 
+    __slots__ = (
+        "_x",
+        "_y",
+        "_width",
+        "_height",
+        "_images",
+        "_batch",
+        "_user_group",
+        "_group",
+        "_vertex_list",
+    )
 
-class ThreePatch:
     def __init__(
         self,
         x: int,
         y: int,
         width: int,
         height: int,
-        left: AbstractImage,
-        middle: AbstractImage,
-        right: AbstractImage,
-        batch: Optional[Batch] = None,
-        group: Optional[Group] = None,
+        images: list[AbstractImage],
+        batch: Optional[Batch],
+        group: Optional[Group],
     ):
-        """Create a ``ThreePatch``.
-
-        Args:
-            x:
-                X coordinate of the ThreePatch.
-            y:
-                Y coordinate of the ThreePatch.
-            width:
-                The desire width of ThreePatch.
-            height:
-                The desire height of ThreePatch.
-            left:
-                The left part.
-            middle:
-                The middle part.
-            right:
-                The right part.
-            batch:
-                Optional batch to add the patch to.
-            group:
-                Optional parent group of the patch.
-        """
         self._x, self._y = x, y
         self._width = width
         self._height = height
-        self._sprites = []
-        self._sprites.append(Sprite(left, batch=batch, group=group))
-        self._sprites.append(Sprite(middle, batch=batch, group=group))
-        self._sprites.append(Sprite(right, batch=batch, group=group))
-        self._update()
+        self._images = images
+        self._batch = batch
+        self._user_group = group
+        self._vertex_list = None
+        self._check_texture(images)
+        self._group = self._get_group()
+        self._create_vertex_list()
+
+    def __del__(self):
+        try:
+            if self._vertex_list is not None:
+                self._vertex_list.delete()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _check_texture(images: Sequence[AbstractImage]):
+        if len({image.get_texture().id for image in images}) != 1:
+            raise ValueError("all parts of a patch must be in the same texture")
+
+    def _get_group(self) -> SpriteGroup:
+        return SpriteGroup(
+            self._images[0].get_texture(),
+            GL_SRC_ALPHA,
+            GL_ONE_MINUS_SRC_ALPHA,
+            get_default_shader(),
+            self._user_group,
+        )
 
-    def __getitem__(self, key: int | slice) -> Sprite | list[Sprite]:
-        if isinstance(key, int):
-            return self._sprites[key]
-        elif isinstance(key, slice):
-            return self._sprites[key]
-        else:
-            raise ValueError("unsupported operation")
+    def _get_quads(self) -> list[tuple[float, float, float, float]]:
+        """Return ``(x1, y1, x2, y2)`` of every part, relative to the patch."""
+        raise NotImplementedError("quads depend on patch type")
+
+    def _get_vertices(self) -> list[float]:
+        vertices = []
+        for x1, y1, x2, y2 in self._get_quads():
+            vertices.extend((x1, y1, 0, x2, y1, 0, x2, y2, 0, x1, y2, 0))
+        return vertices
+
+    def _get_tex_coords(self) -> list[float]:
+        tex_coords = []
+        for image in self._images:
+            tex_coords.extend(image.tex_coords)
+        return tex_coords
+
+    def _create_vertex_list(self):
+        count = 4 * len(self._images)
+        indices = []
+        for i in range(0, count, 4):
+            indices.extend((i, i + 1, i + 2, i, i + 2, i + 3))
+        self._vertex_list = get_default_shader().vertex_list_indexed(
+            count,
+            GL_TRIANGLES,
+            indices,
+            self._batch,
+            self._group,
+            position=("f", self._get_vertices()),
+            colors=("Bn", (255, 255, 255, 255) * count),
+            translate=("f", (self._x, self._y, 0) * count),
+            scale=("f", (1.0, 1.0) * count),
+            rotation=("f", (0.0,) * count),
+            tex_coords=("f", self._get_tex_coords()),
+        )
 
-    def __setitem__(
-        self, key: int | slice, value: AbstractImage | Sequence[AbstractImage]
-    ):
-        if isinstance(key, int) and isinstance(value, AbstractImage):
-            self._sprites[key].image = value
-        elif isinstance(key, slice) and not isinstance(value, AbstractImage):
-            for i in [0, 1, 2][key]:
-                self._sprites[i].image = value[i]
-        else:
-            raise ValueError("unsupported operation")
+    def _set_images(self, images: list[AbstractImage]):
+        self._check_texture(images)
+        texture_changed = images[0].get_texture().id != self._group.texture.id
+        self._images = images
+        if texture_changed:
+            self._group = self._get_group()
+            if self._batch is None:
+                self._vertex_list.delete()
+                self._create_vertex_list()
+                return
+            # Keep the vertex list, only its group and texture coordinates change.
+            self._batch.migrate(
+                self._vertex_list, GL_TRIANGLES, self._group, self._batch
+            )
+        self._vertex_list.tex_coords[:] = self._get_tex_coords()
         self._update()
 
     @property
     def x(self) -> int:
-        """X coordinate of the ThreePatch."""
+        """X coordinate of the patch."""
         return self._x
 
     @x.setter
     def x(self, x: int):
         self._x = x
-        self._update()
+        self._update_translate()
 
     @property
     def y(self) -> int:
-        """Y coordinate of the ThreePatch."""
+        """Y coordinate of the patch."""
         return self._y
 
     @y.setter
     def y(self, y: int):
         self._y = y
-        self._update()
+        self._update_translate()
 
     @property
     def position(self) -> tuple[int, int]:
@@ -106,11 +159,11 @@ class ThreePatch:
     @position.setter
     def position(self, position: tuple[int, int]):
         self._x, self._y = position
-        self._update()
+        self._update_translate()
 
     @property
     def width(self) -> int:
-        """The desire width of ThreePatch."""
+        """The desire width of the patch."""
         return self._width
 
     @width.setter
@@ -120,7 +173,7 @@ class ThreePatch:
 
     @property
     def height(self) -> int:
-        """The desire height of ThreePatch."""
+        """The desire height of the patch."""
         return self._height
 
     @height.setter
@@ -131,39 +184,41 @@ class ThreePatch:
     @property
     def batch(self) -> Optional[Batch]:
         """Graphics batch."""
-        return self._sprites[0].batch
+        return self._batch
 
     @batch.setter
     def batch(self, batch: Optional[Batch]):
-        for sprite in self._sprites:
-            sprite.batch = batch
+        if self._batch is batch:
+            return
+        if batch is not None and self._batch is not None:
+            self._batch.migrate(self._vertex_list, GL_TRIANGLES, self._group, batch)
+            self._batch = batch
+        else:
+            self._vertex_list.delete()
+            self._batch = batch
+            self._create_vertex_list()
 
     @property
     def group(self) -> Optional[Group]:
         """Parent graphics group."""
-        return self._sprites[0].group
+        return self._user_group
 
     @group.setter
     def group(self, group: Optional[Group]):
-        for sprite in self._sprites:
-            sprite.group = group
+        if self._user_group == group:
+            return
+        self._user_group = group
+        self._group = self._get_group()
+        if self._batch is not None:
+            self._batch.migrate(
+                self._vertex_list, GL_TRIANGLES, self._group, self._batch
+            )
+
+    def _update_translate(self):
+        self._vertex_list.translate[:] = (self._x, self._y, 0) * (4 * len(self._images))
 
     def _update(self):
-        if 2 * self._height > self._width:
-            raise ValueError("width should larger than twice of height")
-
-        corner_width = self._sprites[0].image.width
-        corner_height = self._sprites[0].image.height
-        corner_width *= self._height / corner_height
-
-        self._sprites[0].scale = self._height / corner_height
-        self._sprites[2].scale = self._height / corner_height
-        self._sprites[1].width = self._width - 2 * corner_width
-        self._sprites[1].height = self._height
-
-        self._sprites[0].position = (self._x, self._y, 0)
-        self._sprites[1].position = (self._x + corner_width, self._y, 0)
-        self._sprites[2].position = (self._x + self._width - corner_width, self._y, 0)
+        self._vertex_list.position[:] = self._get_vertices()
 
     def draw(self):
         """Draw the patch at its current position.
@@ -171,8 +226,15 @@ class ThreePatch:
         Using this method is not recommended, please see pyglet's documentation for more
         information.
         """
-        for sprite in self._sprites:
-            sprite.draw()
+        self._group.set_state_recursive()
+        self._vertex_list.draw(GL_TRIANGLES)
+        self._group.unset_state_recursive()
+
+    def delete(self):
+        """Force immediate removal of the patch from video memory."""
+        if self._vertex_list is not None:
+            self._vertex_list.delete()
+            self._vertex_list = None
 
     def update(
         self,
@@ -184,6 +246,47 @@ class ThreePatch:
     ):
         """Simultaneously change the position and size.
 
+        Args:
+            x:
+                X coordinate of the patch.
+            y:
+                Y coordinate of the patch.
+            width:
+                The desire width of the patch.
+            height:
+                The desire height of the patch.
+        """
+        if x is not None or y is not None:
+            if x is not None:
+                self._x = x
+            if y is not None:
+                self._y = y
+            self._update_translate()
+        if width is not None or height is not None:
+            if width is not None:
+                self._width = width
+            if height is not None:
+                self._height = height
+            self._update()
+
+
+class ThreePatch(_PatchBase):
+    __slots__ = ()
+
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        left: AbstractImage,
+        middle: AbstractImage,
+        right: AbstractImage,
+        batch: Optional[Batch] = None,
+        group: Optional[Group] = None,
+    ):
+        """Create a ``ThreePatch``.
+
         Args:
             x:
                 X coordinate of the ThreePatch.
@@ -193,19 +296,54 @@ class ThreePatch:
                 The desire width of ThreePatch.
             height:
                 The desire height of ThreePatch.
+            left:
+                The left part.
+            middle:
+                The middle part.
+            right:
+                The right part.
+            batch:
+                Optional batch to add the patch to.
+            group:
+                Optional parent group of the patch.
         """
-        if x is not None:
-            self._x = x
-        if y is not None:
-            self._y = y
-        if width is not None:
-            self._width = width
-        if height is not None:
-            self._height = height
-        self._update()
+        super().__init__(x, y, width, height, [left, middle, right], batch, group)
 
+    def __getitem__(self, key: int | slice) -> AbstractImage | list[AbstractImage]:
+        if isinstance(key, (int, slice)):
+            return self._images[key]
+        else:
+            raise ValueError("unsupported operation")
+
+    def __setitem__(
+        self, key: int | slice, value: AbstractImage | Sequence[AbstractImage]
+    ):
+        images = list(self._images)
+        if isinstance(key, int) and isinstance(value, AbstractImage):
+            images[key] = value
+        elif isinstance(key, slice) and not isinstance(value, AbstractImage):
+            for i, image in zip([0, 1, 2][key], value):
+                images[i] = image
+        else:
+            raise ValueError("unsupported operation")
+        self._set_images(images)
+
+    def _get_quads(self) -> list[tuple[float, float, float, float]]:
+        if 2 * self._height > self._width:
+            raise ValueError("width should larger than twice of height")
+
+        left, middle, right = self._images
+        corner_width = left.width * self._height / left.height
+        return [
+            (0, 0, corner_width, self._height),
+            (corner_width, 0, self._width - corner_width, self._height),
+            (self._width - corner_width, 0, self._width, self._height),
+        ]
+
+
+class NinePatch(_PatchBase):
+    __slots__ = ("_scale",)
 
-class NinePatch:
     def __init__(
         self,
         x: int,
@@ -254,30 +392,25 @@ class NinePatch:
             group:
                 Optional parent group of the patch.
         """
-        # The `scale` property doesn't scale all sprites, it just scales
-        # tl, tr, bl and br sprites.
+        # The `scale` property doesn't scale all parts, it just scales
+        # tl, tr, bl and br parts.
         self._scale = 1
-        self._x, self._y = x, y
-        self._width = width
-        self._height = height
-        self._sprites = {}
-        self._sprites[(0, 0)] = Sprite(tl, batch=batch, group=group)
-        self._sprites[(0, 1)] = Sprite(tm, batch=batch, group=group)
-        self._sprites[(0, 2)] = Sprite(tr, batch=batch, group=group)
-        self._sprites[(1, 0)] = Sprite(ml, batch=batch, group=group)
-        self._sprites[(1, 1)] = Sprite(mm, batch=batch, group=group)
-        self._sprites[(1, 2)] = Sprite(mr, batch=batch, group=group)
-        self._sprites[(2, 0)] = Sprite(bl, batch=batch, group=group)
-        self._sprites[(2, 1)] = Sprite(bm, batch=batch, group=group)
-        self._sprites[(2, 2)] = Sprite(br, batch=batch, group=group)
-        self._update()
+        images = [tl, tm, tr, ml, mm, mr, bl, bm, br]
+        super().__init__(x, y, width, height, images, batch, group)
+
+    def __getitem__(self, key: tuple[int, int]) -> AbstractImage:
+        row, column = key
+        return self._images[3 * row + column]
 
-    def __getitem__(self, key: slice) -> Sprite:
-        return self._sprites[key]
+    def __setitem__(self, key: tuple[int, int], value: AbstractImage):
+        row, column = key
+        images = list(self._images)
+        images[3 * row + column] = value
+        self._set_images(images)
 
     @property
     def scale(self) -> float:
-        """Scale the corner sprites."""
+        """Scale the corner parts."""
         return self._scale
 
     @scale.setter
@@ -285,168 +418,29 @@ class NinePatch:
         self._scale = scale
         self._update()
 
-    @property
-    def x(self) -> int:
-        """X coordinate of the ThreePatch."""
-        return self._x
-
-    @x.setter
-    def x(self, x: int):
-        self._x = x
-        self._update()
-
-    @property
-    def y(self) -> int:
-        """Y coordinate of the ThreePatch."""
-        return self._y
-
-    @y.setter
-    def y(self, y: int):
-        self._y = y
-        self._update()
-
-    @property
-    def position(self) -> tuple[int, int]:
-        """The ``(x, y)`` coordinates of the patch, as a tuple."""
-        return self._x, self._y
-
-    @position.setter
-    def position(self, position: tuple[int, int]):
-        self._x, self._y = position
-        self._update()
-
-    @property
-    def width(self) -> int:
-        """The desire width of ThreePatch."""
-        return self._width
-
-    @width.setter
-    def width(self, width: int):
-        self._width = width
-        self._update()
-
-    @property
-    def height(self) -> int:
-        """The desire height of ThreePatch."""
-        return self._height
-
-    @height.setter
-    def height(self, height: int):
-        self._height = height
-        self._update()
-
-    @property
-    def batch(self) -> Optional[Batch]:
-        """Graphics batch."""
-        return self._sprites[(0, 0)].batch
-
-    @batch.setter
-    def batch(self, batch: Optional[Batch]):
-        for sprite in self._sprites.values():
-            sprite.batch = batch
-
-    @property
-    def group(self) -> Optional[Group]:
-        """Parent graphics group."""
-        return self._sprites[(0, 0)].group
-
-    @group.setter
-    def group(self, group: Optional[Group]):
-        for sprite in self._sprites.values():
-            sprite.group = group
-
-    def _update(self):
-        for coord in [(0, 0), (0, 2), (2, 0), (2, 2)]:
-            self._sprites[coord].scale = self._scale
-
-        top_width = self._sprites[(0, 0)].width
-        top_height = self._sprites[(0, 0)].height
-        bottom_width = self._sprites[(2, 0)].width
-        bottom_height = self._sprites[(2, 0)].height
+    def _get_quads(self) -> list[tuple[float, float, float, float]]:
+        tl, _, tr, _, _, _, bl, _, br = self._images
+        top_width = int(tl.width * self._scale)
+        top_height = int(tl.height * self._scale)
+        bottom_width = int(bl.width * self._scale)
+        bottom_height = int(bl.height * self._scale)
         middle_width = self._width - 2 * top_width
         middle_height = self._height - top_height - bottom_height
 
-        self._sprites[(0, 1)].width = self._sprites[(2, 1)].width = middle_width
-        self._sprites[(0, 1)].height = top_height
-        self._sprites[(2, 1)].height = bottom_height
-
-        self._sprites[(1, 0)].width = self._sprites[(1, 2)].width = top_width
-        self._sprites[(1, 0)].height = self._sprites[(1, 2)].height = middle_height
-        self._sprites[(1, 1)].width = middle_width
-        self._sprites[(1, 1)].height = middle_height
-
-        self._sprites[(2, 0)].position = (self._x, self._y, 0)
-        self._sprites[(2, 1)].position = (self._x + bottom_width, self._y, 0)
-        self._sprites[(2, 2)].position = (
-            self._x + bottom_width + middle_width,
-            self._y,
-            0,
-        )
-        self._sprites[(1, 0)].position = (self._x, self._y + bottom_height, 0)
-        self._sprites[(1, 1)].position = (
-            self._x + bottom_width,
-            self._y + bottom_height,
-            0,
-        )
-        self._sprites[(1, 2)].position = (
-            self._x + bottom_width + middle_width,
-            self._y + bottom_height,
-            0,
-        )
-        self._sprites[(0, 0)].position = (
-            self._x,
-            self._y + bottom_height + middle_height,
-            0,
-        )
-        self._sprites[(0, 1)].position = (
-            self._x + top_width,
-            self._y + bottom_height + middle_height,
-            0,
-        )
-        self._sprites[(0, 2)].position = (
-            self._x + top_width + middle_width,
-            self._y + bottom_height + middle_height,
-            0,
-        )
-
-    def draw(self):
-        """Draw the patch at its current position.
-
-        Using this method is not recommended, please see pyglet's documentation for more
-        information.
-        """
-        for sprite in self._sprites.values():
-            sprite.draw()
-
-    def update(
-        self,
-        *,
-        x: Optional[int] = None,
-        y: Optional[int] = None,
-        width: Optional[int] = None,
-        height: Optional[int] = None,
-    ):
-        """Simultaneously change the position and size.
-
-        Args:
-            x:
-                X coordinate of the NinePatch.
-            y:
-                Y coordinate of the NinePatch.
-            width:
-                The desire width of NinePatch.
-            height:
-                The desire height of NinePatch.
-        """
-        if x is not None:
-            self._x = x
-        if y is not None:
-            self._y = y
-        if width is not None:
-            self._width = width
-        if height is not None:
-            self._height = height
-        self._update()
+        # Columns of the bottom row and the other rows, then heights of rows.
+        bottom_xs = (0, bottom_width, bottom_width + middle_width)
+        bottom_ws = (bottom_width, middle_width, int(br.width * self._scale))
+        xs = (0, top_width, top_width + middle_width)
+        ws = (top_width, middle_width, int(tr.width * self._scale))
+        top_y = bottom_height + middle_height
+        quads = []
+        for x, w in zip(xs, ws):
+            quads.append((x, top_y, x + w, top_y + top_height))
+        for x, w in zip(bottom_xs, (top_width, middle_width, top_width)):
+            quads.append((x, bottom_height, x + w, top_y))
+        for x, w in zip(bottom_xs, bottom_ws):
+            quads.append((x, 0, x + w, bottom_height))
+        return quads
 
 
 __all__ = "ThreePatch", "NinePatch"
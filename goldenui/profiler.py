@@ -0,0 +1,290 @@
+"""Collect statistics of a manager.
+
+:py:class:`~.Profiler` records how many events a manager dispatches, how many widgets are
+visited, how long the handlers of every widget class take, how often widgets are rehashed,
+how long drawing the batch takes and how many buffer uploads drawing it issues.
+
+Profiling is disabled by default, set :py:attr:`.GUIManager.profiling` to ``True``.
+"""
+
+from typing import Any
+
+from pyglet.event import EventDispatcher
+from pyglet.graphics import Batch, Group
+
+from goldenui import is_sphinx_run
+from goldenui.group import ContainerGroup
+
+
+def batch_stats(batch: Batch) -> dict[str, int]:
+    """Count what drawing a batch will do.
+
+    Only visible groups are taken into account, just like :py:meth:`Batch.draw`.
+
+    Args:
+        batch:
+            The batch to inspect.
+
+    Returns:
+        A dict with the following keys:
+
+        - ``groups``: number of groups in the batch.
+        - ``draw_list``: number of functions in the draw list of the batch.
+        - ``draw_calls``: number of vertex domains to draw.
+        - ``vertices``: number of allocated vertices.
+        - ``texture_binds``: number of groups which bind a texture.
+        - ``container_switches``: number of :py:class:`~goldenui.group.ContainerGroup`
+          state switches.
+    """
+    if batch._draw_list_dirty:
+        batch._update_draw_list()
+    stats = {
+        "groups": len(batch.group_map),
+        "draw_list": len(batch._draw_list),
+        "draw_calls": 0,
+        "vertices": 0,
+        "texture_binds": 0,
+        "container_switches": 0,
+    }
+
+    def visit(group: Group):
+        if not group.visible:
+            return
+        if getattr(group, "texture", None) is not None:
+            stats["texture_binds"] += 1
+        if isinstance(group, ContainerGroup):
+            stats["container_switches"] += 1
+        for domain in batch.group_map.get(group, {}).values():
+            if domain.is_empty:
+                continue
+            stats["draw_calls"] += 1
+            stats["vertices"] += sum(domain.allocator.get_allocated_regions()[1])
+        for child in batch.group_children.get(group, ()):
+            visit(child)
+
+    for group in batch.top_groups:
+        visit(group)
+    return stats
+
+
+def pending_uploads(batch: Batch) -> tuple[int, int]:
+    """Count the buffer uploads drawing a batch will issue.
+
+    Vertex data of pyglet lives in system memory, and changes are only marked dirty.
+    Right before a vertex domain is drawn, every dirty buffer of it is uploaded once,
+    covering all its changes. Only visible groups are taken into account, just like
+    :py:meth:`Batch.draw`.
+
+    Args:
+        batch:
+            The batch to inspect.
+
+    Returns:
+        The number of uploads and of uploaded bytes.
+    """
+    uploads = size = 0
+
+    def visit(group: Group):
+        nonlocal uploads, size
+        if not group.visible:
+            return
+        for domain in batch.group_map.get(group, {}).values():
+            if domain.is_empty:
+                continue
+            buffers = [buffer for buffer, _ in domain.buffer_attributes]
+            if hasattr(domain, "index_buffer"):
+                buffers.append(domain.index_buffer)
+            for buffer in buffers:
+                dirty = buffer._dirty_max - buffer._dirty_min
+                if buffer._dirty and dirty > 0:
+                    uploads += 1
+                    size += dirty
+        for child in batch.group_children.get(group, ()):
+            visit(child)
+
+    for group in batch.top_groups:
+        visit(group)
+    return uploads, size
+
+
+class Profiler(EventDispatcher):
+    """Counters of a :py:class:`~goldenui.manager.GUIManager`.
+
+    All times are measured on CPU side in seconds. Note that OpenGL commands are
+    executed asynchronously, so the time of drawing is the time to submit commands.
+    """
+
+    def __init__(self):
+        """Create a ``Profiler``."""
+        self.reset()
+
+    def reset(self):
+        """Clear all counters."""
+        # event type -> [count, widgets visited, max widgets visited, total time]
+        self._events: dict[str, list] = {}
+        # widget class -> [calls, total time, max time]
+        self._handlers: dict[str, list] = {}
+        self._rehash_count = 0
+        self._rehash_time = 0.0
+        self._draw_count = 0
+        self._draw_time = 0.0
+        self._draw_max = 0.0
+        self._draw_last = 0.0
+        self._upload_count = 0
+        self._upload_bytes = 0
+        self._upload_last = 0
+        self._upload_last_bytes = 0
+
+    def record_event(self, event_type: str, visited: int, elapsed: float):
+        """Record a dispatched event.
+
+        Args:
+            event_type:
+                Name of the event.
+            visited:
+                Number of widgets the event was passed to.
+            elapsed:
+                Time spent on dispatching, including handlers.
+        """
+        record = self._events.get(event_type)
+        if record is None:
+            self._events[event_type] = [1, visited, visited, elapsed]
+            return
+        record[0] += 1
+        record[1] += visited
+        if visited > record[2]:
+            record[2] = visited
+        record[3] += elapsed
+
+    def record_handler(self, widget_class: str, elapsed: float):
+        """Record time spent on the handler of a widget.
+
+        Args:
+            widget_class:
+                Qualified name of the widget's class.
+            elapsed:
+                Time spent on the handler.
+        """
+        record = self._handlers.get(widget_class)
+        if record is None:
+            self._handlers[widget_class] = [1, elapsed, elapsed]
+            return
+        record[0] += 1
+        record[1] += elapsed
+        if elapsed > record[2]:
+            record[2] = elapsed
+
+    def record_rehash(self, elapsed: float):
+        """Record a widget which was rehashed after repositioning.
+
+        Args:
+            elapsed:
+                Time spent on rehashing.
+        """
+        self._rehash_count += 1
+        self._rehash_time += elapsed
+
+    def record_draw(self, elapsed: float, uploads: int = 0, upload_bytes: int = 0):
+        """Record a frame and dispatch :py:meth:`.on_stats` if there are handlers.
+
+        Args:
+            elapsed:
+                Time spent on drawing the batch.
+            uploads:
+                Number of buffer uploads issued by drawing, see
+                :py:func:`pending_uploads`.
+            upload_bytes:
+                Number of bytes uploaded by drawing.
+        """
+        self._draw_count += 1
+        self._draw_time += elapsed
+        self._draw_last = elapsed
+        if elapsed > self._draw_max:
+            self._draw_max = elapsed
+        self._upload_count += uploads
+        self._upload_bytes += upload_bytes
+        self._upload_last = uploads
+        self._upload_last_bytes = upload_bytes
+        if self._event_stack:
+            self.dispatch_event("on_stats", self.stats())
+
+    def stats(self) -> dict[str, Any]:
+        """A snapshot of all counters.
+
+        Returns:
+            A dict like this::
+
+                {
+                    "events": {
+                        "on_mouse_motion": {
+                            "count": 120,
+                            "visited": 360,
+                            "max_visited": 3,
+                            "time": 0.0021,
+                        },
+                    },
+                    "handlers": {
+                        "TextButton": {"calls": 360, "time": 0.0017, "max_time": 4e-05},
+                    },
+                    "rehash": {"count": 2, "time": 0.0001},
+                    "draw": {
+                        "count": 60,
+                        "time": 0.012,
+                        "max_time": 0.0005,
+                        "last_time": 0.0002,
+                        "uploads": 240,
+                        "upload_bytes": 46080,
+                        "last_uploads": 4,
+                        "last_upload_bytes": 768,
+                    },
+                }
+        """
+        events = {}
+        for event_type, record in self._events.items():
+            count, visited, max_visited, elapsed = record
+            events[event_type] = {
+                "count": count,
+                "visited": visited,
+                "max_visited": max_visited,
+                "time": elapsed,
+            }
+        handlers = {}
+        for widget_class, record in self._handlers.items():
+            calls, elapsed, max_elapsed = record
+            handlers[widget_class] = {
+                "calls": calls,
+                "time": elapsed,
+                "max_time": max_elapsed,
+            }
+        return {
+            "events": events,
+            "handlers": handlers,
+            "rehash": {"count": self._rehash_count, "time": self._rehash_time},
+            "draw": {
+                "count": self._draw_count,
+                "time": self._draw_time,
+                "max_time": self._draw_max,
+                "last_time": self._draw_last,
+                "uploads": self._upload_count,
+                "upload_bytes": self._upload_bytes,
+                "last_uploads": self._upload_last,
+                "last_upload_bytes": self._upload_last_bytes,
+            },
+        }
+
+    if is_sphinx_run:
+
+        def on_stats(self, stats: dict[str, Any]):
+            """This event will be triggered after the manager draws a frame.
+
+            Args:
+                stats:
+                    The same as the return value of :py:meth:`.stats`.
+            """
+            pass
+
+
+Profiler.register_event_type("on_stats")
+
+
+__all__ = "Profiler", "batch_stats", "pending_uploads"
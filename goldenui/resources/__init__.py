@@ -1,10 +1,145 @@
+"""Resources of GoldenUI.
+
+Images are loaded by :py:data:`loader`, either synchronously by ``loader.image`` or in the
+background by ``loader.image_async``, which returns an :py:class:`AsyncImage`.
+"""
+
+import os
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Optional
 
-from pyglet.image import Texture, TextureRegion
+import pyglet
+from pyglet.event import EventDispatcher
+from pyglet.image import (
+    AbstractImage,
+    ImageData,
+    SolidColorImagePattern,
+    Texture,
+    TextureRegion,
+)
+from pyglet.image.atlas import AllocatorException, TextureAtlas
 from pyglet.resource import Loader
 
+from goldenui import is_sphinx_run
+
+placeholder_color = (128, 128, 128, 96)
+pack_page_size = 1024
+
+# (ids of parts, ) -> (parts, packed parts) of skins whose parts were loaded into
+# different textures, parts are kept so that their ids aren't reused.
+_packed: dict[tuple[int, ...], tuple[tuple, tuple[TextureRegion, ...]]] = {}
+_pack_pages: list[TextureAtlas] = []
+
+
+class AsyncImage(EventDispatcher):
+    """An image which is being loaded by :py:meth:`_ResourcesLoader.image_async`.
+
+    Until the image is ready, :py:attr:`.image` is a placeholder, and widgets given an
+    ``AsyncImage`` show the placeholder, then swap to the image on
+    :py:meth:`.on_ready`.
+    """
+
+    def __init__(self, path: str, placeholder: AbstractImage):
+        self._path = path
+        self._placeholder = placeholder
+        self._image: Optional[AbstractImage] = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def path(self) -> str:
+        """Path of the image in the resources."""
+        return self._path
+
+    @property
+    def ready(self) -> bool:
+        """Whether the image has been uploaded."""
+        return self._image is not None
+
+    @property
+    def image(self) -> AbstractImage:
+        """The image if it is ready, otherwise the placeholder."""
+        return self._placeholder if self._image is None else self._image
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """The exception raised while loading the image, if any.
+
+        The placeholder is used forever in this case.
+        """
+        return self._error
+
+    def _finish(self, image: Optional[AbstractImage], error: Optional[BaseException]):
+        self._image = image
+        self._error = error
+        if image is not None:
+            self.dispatch_event("on_ready", self)
+        # Every widget swaps once, so don't keep them alive.
+        self._event_stack = []
+
+    if is_sphinx_run:
+
+        def on_ready(self, image: "AsyncImage"):
+            """The image has been uploaded and :py:attr:`.image` is the real one."""
+            pass
+
+
+AsyncImage.register_event_type("on_ready")
+
+
+def resolve_images(images: tuple) -> tuple[AbstractImage, ...]:
+    """Get images which can be drawn from images and :py:class:`AsyncImage` handles.
+
+    Parts of a patch must share a texture, so if any handle is not ready, all images are
+    replaced by the placeholder of the first pending handle. Handles are uploaded one by
+    one into atlases of the loader, so when the parts end up in different textures, they
+    are copied into the same atlas page once.
+
+    Args:
+        images:
+            Images and handles.
+    """
+    for image in images:
+        if isinstance(image, AsyncImage) and not image.ready:
+            return (image.image,) * len(images)
+    resolved = tuple(
+        image.image if isinstance(image, AsyncImage) else image for image in images
+    )
+    if any(isinstance(image, AsyncImage) for image in images):
+        if len({image.get_texture().id for image in resolved}) > 1:
+            return _pack_parts(resolved)
+    return resolved
+
+
+def _pack_parts(images: tuple[AbstractImage, ...]) -> tuple[TextureRegion, ...]:
+    """Copy parts of a skin into the same atlas page, once."""
+    key = tuple(map(id, images))
+    entry = _packed.get(key)
+    if entry is not None:
+        return entry[1]
+    data = [image.get_image_data() for image in images]
+    packed = None
+    if _pack_pages:
+        try:
+            packed = tuple(_pack_pages[-1].add(image, 1) for image in data)
+        except AllocatorException:
+            pass
+    if packed is None:
+        # A larger page is created for parts which don't fit.
+        width = max(pack_page_size, sum(image.width + 2 for image in data))
+        height = max(pack_page_size, max(image.height + 2 for image in data))
+        page = TextureAtlas(width, height)
+        _pack_pages.append(page)
+        packed = tuple(page.add(image, 1) for image in data)
+    _packed[key] = images, packed
+    return packed
+
 
 class _ResourcesLoader:
+    """Load images from the resources of GoldenUI."""
+
     def __init__(self):
         if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
             path = "goldenui_res"
@@ -13,11 +148,118 @@ class _ResourcesLoader:
             path = "@goldenui.resources"
             self._frozen = False
         self.loader = Loader([path])
+        #: Seconds spent at most on uploading decoded images to textures per frame. At
+        #: least one image is uploaded per frame.
+        self.upload_budget = 0.004
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._placeholder: Optional[AbstractImage] = None
+        self._handles: dict[str, AsyncImage] = {}
+        # Decoded images waiting for upload, appended by worker threads.
+        self._decoded: deque[tuple[AsyncImage, Future]] = deque()
+        self._in_flight = 0
 
     def image(self, path: str, **kwargs) -> Texture | TextureRegion:
         return self.loader.image(path, **kwargs)
 
+    def image_async(
+        self, path: str, *, placeholder: Optional[AbstractImage] = None
+    ) -> AsyncImage:
+        """Load an image in the background.
+
+        The image is decoded by a thread pool and uploaded on the main thread by the
+        pyglet clock, under :py:attr:`upload_budget`. Loading the same path again gives
+        the same handle.
+
+        Args:
+            path:
+                Path of the image, like :py:meth:`image`, or an absolute path of a file.
+            placeholder:
+                Image to show until the image is ready, a translucent gray square will be
+                used if not given.
+        """
+        handle = self._handles.get(path)
+        if handle is not None:
+            return handle
+        if placeholder is None:
+            placeholder = self._get_placeholder()
+        handle = self._handles[path] = AsyncImage(path, placeholder)
+        if path in self.loader._cached_images:
+            handle._finish(self.loader._cached_images[path], None)
+            return handle
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="goldenui-image")
+        # Opening is done here, as the index of the loader isn't thread-safe.
+        try:
+            if os.path.isabs(path):
+                file = open(path, "rb")
+            else:
+                file = self.loader.file(path)
+        except Exception as exc:
+            handle._finish(None, exc)
+            return handle
+        future = self._executor.submit(self._decode, path, file)
+        future.add_done_callback(lambda f: self._decoded.append((handle, f)))
+        if self._in_flight == 0:
+            pyglet.clock.schedule(self._process_uploads)
+        self._in_flight += 1
+        return handle
+
+    def _get_placeholder(self) -> AbstractImage:
+        if self._placeholder is None:
+            pattern = SolidColorImagePattern(placeholder_color)
+            self._placeholder = pattern.create_image(4, 4).get_texture()
+        return self._placeholder
+
+    @staticmethod
+    def _decode(path: str, file) -> ImageData:
+        try:
+            return pyglet.image.load(path, file=file).get_image_data()
+        finally:
+            file.close()
+
+    def _upload(self, path: str, image_data: ImageData) -> AbstractImage:
+        border = 1
+        texture_bin = self.loader._get_texture_atlas_bin(
+            image_data.width, image_data.height, border
+        )
+        if texture_bin is None:
+            image = image_data.get_texture()
+        else:
+            image = texture_bin.add(image_data, border)
+        self.loader._cached_images[path] = image
+        return image
+
+    def _process_uploads(self, dt: float = 0):
+        self.process_uploads()
+
+    def process_uploads(self) -> int:
+        """Upload decoded images within :py:attr:`upload_budget`.
+
+        It is called by the pyglet clock while images are being loaded, call it yourself
+        only if the clock is not ticking.
+
+        Returns:
+            The number of finished images.
+        """
+        start = perf_counter()
+        finished = 0
+        while self._decoded:
+            handle, future = self._decoded.popleft()
+            error = future.exception()
+            if error is None:
+                handle._finish(self._upload(handle.path, future.result()), None)
+            else:
+                handle._finish(None, error)
+            finished += 1
+            if perf_counter() - start >= self.upload_budget:
+                break
+        self._in_flight -= finished
+        if self._in_flight == 0:
+            pyglet.clock.unschedule(self._process_uploads)
+        return finished
+
 
+#: The loader of GoldenUI.
 loader = _ResourcesLoader()
 
-__all__ = ("loader",)
+__all__ = "loader", "AsyncImage", "resolve_images"
@@ -0,0 +1,174 @@
+"""Pixel-perfect scaling of skins.
+
+Patches stretch their parts to any height, so a pixel of the skin may cover a fractional
+number of pixels on the screen, which blurs the pixel art. A widget which is pixel-perfect
+instead snaps its height down to an integer multiple of the skin height by
+:py:func:`snap`, and draws parts pre-scaled by that integer with nearest-neighbour
+filtering, so that every pixel of the scaled parts is copied to exactly one pixel::
+
+    button = TextButton("OK", width=200, height=60, pixel_perfect=True)
+
+Pre-scaled parts are generated on demand into atlas pages of :py:data:`skin_cache`, which
+drops the least recently used pages when they take more than
+:py:attr:`SkinCache.budget` bytes of GPU memory. Widgets still using parts of a dropped
+page keep its texture alive until they change their look.
+"""
+
+from collections import OrderedDict
+from typing import Any
+
+from pyglet.image import AbstractImage, ImageData, TextureRegion
+from pyglet.image.atlas import AllocatorException, TextureAtlas
+
+
+def snap(size: int, unit: int) -> int:
+    """Snap a size to the largest integer multiple of a unit which isn't above it.
+
+    The result is at least one unit, so that the size never shrinks to zero.
+
+    Args:
+        size:
+            The size, e.g. height of a widget.
+        unit:
+            The unit, e.g. height of its skin.
+    """
+    return max(1, int(size // unit)) * unit
+
+
+def _scale_nearest(data: bytes, width: int, height: int, factor: int) -> bytes:
+    """Scale RGBA pixels up by an integer factor with nearest-neighbour filtering."""
+    pitch = width * 4
+    rows = []
+    for y in range(height):
+        row = data[y * pitch : (y + 1) * pitch]
+        scaled = b"".join(row[i : i + 4] * factor for i in range(0, pitch, 4))
+        rows.append(scaled * factor)
+    return b"".join(rows)
+
+
+class SkinCache:
+    """Parts of skins pre-scaled by integer factors, in an LRU cache of atlas pages."""
+
+    def __init__(self, budget: int = 8 * 1024 * 1024, page_size: int = 512):
+        """Create a ``SkinCache``.
+
+        Args:
+            budget:
+                Bytes of GPU memory the atlas pages take at most.
+            page_size:
+                Width and height of atlas pages, a larger page is created for parts
+                which don't fit.
+        """
+        #: Bytes of GPU memory the atlas pages take at most, at least one page is kept.
+        self.budget = budget
+        self._page_size = page_size
+        # (ids of parts, factor) -> (parts, page, scaled parts), parts are kept so that
+        # their ids aren't reused.
+        self._entries: dict[tuple, tuple[tuple, TextureAtlas, tuple]] = {}
+        # page -> keys of entries on it, the least recently used first.
+        self._pages: OrderedDict[TextureAtlas, list[tuple]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of GPU memory the atlas pages take."""
+        return sum(page.texture.width * page.texture.height * 4 for page in self._pages)
+
+    def scaled(
+        self, images: tuple[AbstractImage, ...], factor: int
+    ) -> tuple[AbstractImage, ...]:
+        """Get parts scaled by an integer factor, which are in the same texture.
+
+        Args:
+            images:
+                Parts of a skin, e.g. left, middle and right parts of a button.
+            factor:
+                The scale factor, the parts themselves are returned for ``1``.
+        """
+        if factor == 1:
+            return images
+        key = tuple(map(id, images)), factor
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._hits += 1
+            self._pages.move_to_end(entry[1])
+            return entry[2]
+        self._misses += 1
+        data = []
+        for image in images:
+            image_data = image.get_image_data()
+            pixels = image_data.get_data("RGBA", image.width * 4)
+            data.append(
+                ImageData(
+                    image.width * factor,
+                    image.height * factor,
+                    "RGBA",
+                    _scale_nearest(pixels, image.width, image.height, factor),
+                )
+            )
+        page, scaled = self._pack(data)
+        self._entries[key] = images, page, scaled
+        self._pages[page].append(key)
+        self._pages.move_to_end(page)
+        return scaled
+
+    def clear(self):
+        """Drop all pre-scaled parts."""
+        self._entries.clear()
+        self._pages.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Statistics of the cache.
+
+        Returns:
+            A dict with ``entries``, ``pages``, ``bytes``, ``hits``, ``misses`` and
+            ``evictions``, where evictions are the number of dropped pages.
+        """
+        return {
+            "entries": len(self._entries),
+            "pages": len(self._pages),
+            "bytes": self.nbytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+        }
+
+    def _pack(
+        self, data: list[ImageData]
+    ) -> tuple[TextureAtlas, tuple[TextureRegion, ...]]:
+        """Copy images into the same atlas page, adding a page if needed."""
+        if self._pages:
+            page = next(reversed(self._pages))
+            try:
+                return page, tuple(page.add(image, 1) for image in data)
+            except AllocatorException:
+                pass
+        width = sum(image.width + 2 for image in data)
+        height = max(image.height + 2 for image in data)
+        size = max(self._page_size, width, height)
+        page = TextureAtlas(size, size)
+        self._pages[page] = []
+        self._evict(page)
+        return page, tuple(page.add(image, 1) for image in data)
+
+    def _evict(self, keep: TextureAtlas):
+        """Drop the least recently used pages until the budget is met."""
+        while len(self._pages) > 1 and self.nbytes > self.budget:
+            page = next(iter(self._pages))
+            if page is keep:
+                self._pages.move_to_end(page)
+                continue
+            for key in self._pages.pop(page):
+                del self._entries[key]
+            self._evictions += 1
+
+
+#: The cache used by pixel-perfect widgets.
+skin_cache = SkinCache()
+
+__all__ = "SkinCache", "skin_cache", "snap"
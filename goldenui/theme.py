@@ -0,0 +1,205 @@
+"""Themes which change the look of live widgets.
+
+A :py:class:`Theme` describes styles of widget types, e.g. a
+:py:class:`~goldenui.widget.button.TextButtonStyle` for
+:py:class:`~goldenui.widget.button.TextButton`, and the font of their text. Widgets created
+without a style follow the current theme, and :py:func:`set_theme` retargets all of them
+at once::
+
+    dark = Theme("dark", {TextButton: dark_button_style}, font_size=12)
+    set_theme(dark)
+    # Back to the built-in look.
+    set_theme(None)
+
+When a theme is set for the first time, images of its styles are baked into texture
+atlas pages owned by the theme, so that all parts of a widget type share a texture. Setting
+the theme again reuses the pages without uploading anything, and a widget only rewrites
+texture coordinates of its vertex lists to switch.
+"""
+
+from typing import TYPE_CHECKING, Any, Optional
+from weakref import WeakSet
+
+from pyglet.image import AbstractImage, TextureRegion
+from pyglet.image.atlas import AllocatorException, TextureAtlas
+
+if TYPE_CHECKING:
+    from goldenui.widget.base import WidgetBase
+
+_current: Optional["Theme"] = None
+# Widgets following the current theme.
+_followers: WeakSet = WeakSet()
+
+
+class Theme:
+    """Styles and fonts of widget types.
+
+    Styles are named tuples like :py:class:`~goldenui.widget.button.TextButtonStyle`.
+    Fields holding tuples of images are baked into atlas pages of the theme, other fields
+    like colors are used as they are.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        styles: dict[type, Any],
+        *,
+        font_name: Optional[str] = None,
+        font_size: Optional[int] = None,
+        page_size: int = 1024,
+    ):
+        """Create a ``Theme``.
+
+        Args:
+            name:
+                Name of the theme.
+            styles:
+                Styles of widget types, widget types without a style use their
+                built-in one.
+            font_name:
+                Font family name(s) of text, the font of each widget if not given.
+            font_size:
+                Font size of text, the font of each widget if not given.
+            page_size:
+                Width and height of atlas pages.
+        """
+        self._name = name
+        self._styles = dict(styles)
+        self._font_name = font_name
+        self._font_size = font_size
+        self._page_size = page_size
+        self._pages: list[TextureAtlas] = []
+        self._baked: Optional[dict[type, Any]] = None
+
+    @property
+    def name(self) -> str:
+        """Name of the theme."""
+        return self._name
+
+    @property
+    def font_name(self) -> Optional[str]:
+        """Font family name(s) of text."""
+        return self._font_name
+
+    @property
+    def font_size(self) -> Optional[int]:
+        """Font size of text."""
+        return self._font_size
+
+    @property
+    def baked(self) -> bool:
+        """Whether images of the theme have been baked into atlas pages."""
+        return self._baked is not None
+
+    @property
+    def pages(self) -> int:
+        """The number of atlas pages of the theme."""
+        return len(self._pages)
+
+    def bake(self):
+        """Bake images of all styles into atlas pages, nothing happens if baked already.
+
+        It is called by :py:func:`set_theme`, call it yourself to do the work ahead of
+        time, e.g. on a loading screen. Images which are
+        :py:class:`~goldenui.resources.AsyncImage` handles are not baked.
+        """
+        if self._baked is not None:
+            return
+        self._baked = {
+            widget_type: self._bake_style(style)
+            for widget_type, style in self._styles.items()
+        }
+
+    def style(self, widget_type: type, default: Any = None) -> Any:
+        """The baked style of a widget type.
+
+        Args:
+            widget_type:
+                The widget type.
+            default:
+                Style to return if the theme has no style for the type.
+        """
+        self.bake()
+        return self._baked.get(widget_type, default)
+
+    def _bake_style(self, style: Any) -> Any:
+        changes = {}
+        for field in style._fields:
+            value = getattr(style, field)
+            if (
+                isinstance(value, tuple)
+                and value
+                and all(isinstance(image, AbstractImage) for image in value)
+            ):
+                changes[field] = self._pack(value)
+        return style._replace(**changes)
+
+    def _pack(self, images: tuple[AbstractImage, ...]) -> tuple[TextureRegion, ...]:
+        """Copy images into the same atlas page."""
+        data = [image.get_image_data() for image in images]
+        if self._pages:
+            try:
+                return tuple(self._pages[-1].add(image, 1) for image in data)
+            except AllocatorException:
+                pass
+        page = TextureAtlas(self._page_size, self._page_size)
+        self._pages.append(page)
+        return tuple(page.add(image, 1) for image in data)
+
+
+def get_theme() -> Optional[Theme]:
+    """The current theme, ``None`` means the built-in look."""
+    return _current
+
+
+def theme_style(widget_type: type, default: Any) -> Any:
+    """The style of a widget type in the current theme.
+
+    Args:
+        widget_type:
+            The widget type.
+        default:
+            The built-in style of the type.
+    """
+    if _current is None:
+        return default
+    return _current.style(widget_type, default)
+
+
+def follow(widget: "WidgetBase"):
+    """Let a widget follow the current theme.
+
+    :py:func:`set_theme` calls ``widget._apply_theme(theme)`` on it. Widgets only need to
+    call it in their ``__init__`` when they are created without a style.
+    """
+    _followers.add(widget)
+
+
+def unfollow(widget: "WidgetBase"):
+    """Stop a widget from following the current theme, e.g. when it is given a style."""
+    _followers.discard(widget)
+
+
+def set_theme(theme: Optional[Theme]):
+    """Change the current theme and retarget every widget following it.
+
+    Args:
+        theme:
+            The new theme, ``None`` for the built-in look.
+    """
+    global _current
+    if theme is not None:
+        theme.bake()
+    _current = theme
+    for widget in list(_followers):
+        widget._apply_theme(theme)
+
+
+__all__ = (
+    "Theme",
+    "get_theme",
+    "theme_style",
+    "follow",
+    "unfollow",
+    "set_theme",
+)
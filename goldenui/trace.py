@@ -0,0 +1,334 @@
+"""Record window events into trace files and replay them.
+
+:py:class:`TraceRecorder` captures every window event a
+:py:class:`~goldenui.manager.GUIManager` receives, with timestamps, into a compact binary
+file. :py:func:`replay` feeds a trace into a manager, as fast as possible or in real time,
+and reports throughput, latency of events and a digest of the state of widgets, so that
+versions can be compared on traces recorded from real sessions::
+
+    with TraceRecorder(manager, "session.trace"):
+        pyglet.app.run()
+
+    # Later, with the same widgets in a manager whose window is not visible.
+    report = replay("session.trace", manager)
+    print(report["events_per_second"], report["latency"]["p99"], report["digest"])
+
+A trace starts with the magic bytes ``GUITRACE`` and a version, followed by records. Every
+record is the index of the event type (one byte) and microseconds since the previous
+record (four bytes), then the arguments of the event packed by :py:mod:`struct`.
+"""
+
+import hashlib
+import struct
+from collections.abc import Iterator
+from time import perf_counter, sleep
+from typing import Any, BinaryIO, Optional
+
+import pyglet
+
+from goldenui.manager import GUIManager
+
+_magic = b"GUITRACE"
+_version = 1
+_header = struct.Struct("<BI")
+_length = struct.Struct("<I")
+# Event types and formats of their arguments, "s" is a string and "S" a list of them.
+# The index of an event type is its code in traces, so only append to it.
+_events = (
+    ("on_mouse_motion", "<iiff"),
+    ("on_mouse_press", "<iiii"),
+    ("on_mouse_release", "<iiii"),
+    ("on_mouse_drag", "<iiffii"),
+    ("on_mouse_scroll", "<iiff"),
+    ("on_key_press", "<qi"),
+    ("on_key_release", "<qi"),
+    ("on_text", "s"),
+    ("on_text_motion", "<i"),
+    ("on_text_motion_select", "<i"),
+    ("on_file_drop", "<iiS"),
+    ("on_resize", "<ii"),
+)
+_codes = {event_type: code for code, (event_type, _) in enumerate(_events)}
+_structs = [
+    struct.Struct(fmt.rstrip("sS")) if fmt.rstrip("sS") else None for _, fmt in _events
+]
+_fields = [len(fmt.strip("<sS")) for _, fmt in _events]
+# Flush the buffer of a recorder when it gets larger than this.
+_flush_size = 1 << 16
+
+
+def _pack_string(buffer: bytearray, text: str):
+    data = text.encode("utf-8", "surrogateescape")
+    buffer += _length.pack(len(data))
+    buffer += data
+
+
+def _unpack_string(data: bytes, offset: int) -> tuple[str, int]:
+    (length,) = _length.unpack_from(data, offset)
+    offset += _length.size
+    end = offset + length
+    return data[offset:end].decode("utf-8", "surrogateescape"), end
+
+
+def _integral(value: float) -> int | float:
+    return int(value) if value.is_integer() else value
+
+
+class TraceRecorder:
+    """Record window events received by a manager into a trace.
+
+    Events are only recorded while the manager is enabled, as it receives nothing
+    otherwise. A recorder is a context manager which starts on entering and stops on
+    exiting.
+    """
+
+    def __init__(self, manager: GUIManager, file: str | BinaryIO):
+        """Create a ``TraceRecorder``.
+
+        Args:
+            manager:
+                The manager whose events are recorded.
+            file:
+                Path of the trace, or a binary file object, which is not closed by the
+                recorder.
+        """
+        self._manager = manager
+        self._file = file
+        self._stream: Optional[BinaryIO] = None
+        self._buffer = bytearray()
+        self._last_time = 0.0
+        self._count = 0
+        self._handlers = {
+            event_type: self._make_handler(event_type) for event_type, _ in _events
+        }
+
+    @property
+    def recording(self) -> bool:
+        """Whether the recorder has started and not stopped."""
+        return self._stream is not None
+
+    @property
+    def count(self) -> int:
+        """Number of recorded events."""
+        return self._count
+
+    def start(self):
+        """Write the header and start recording."""
+        if self._stream is not None:
+            return
+        if isinstance(self._file, str):
+            self._stream = open(self._file, "wb")
+        else:
+            self._stream = self._file
+        self._buffer += _magic + struct.pack("<H", _version)
+        self._last_time = perf_counter()
+        self._manager._window.push_handlers(**self._handlers)
+
+    def stop(self):
+        """Stop recording and flush the trace."""
+        if self._stream is None:
+            return
+        self._manager._window.remove_handlers(**self._handlers)
+        self.flush()
+        if isinstance(self._file, str):
+            self._stream.close()
+        self._stream = None
+
+    def flush(self):
+        """Write buffered records to the file."""
+        if self._stream is not None and self._buffer:
+            self._stream.write(self._buffer)
+            self._buffer.clear()
+
+    def __enter__(self) -> "TraceRecorder":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _make_handler(self, event_type: str):
+        def handler(*args):
+            if self._manager.enabled:
+                self.record(event_type, *args)
+
+        return handler
+
+    def record(self, event_type: str, *args: Any):
+        """Append an event to the trace.
+
+        It is called for events of the window, call it yourself to record events which
+        are given to the manager directly.
+
+        Args:
+            event_type:
+                Name of the event, e.g. ``"on_mouse_press"``.
+            args:
+                Arguments of the event.
+        """
+        code = _codes[event_type]
+        now = perf_counter()
+        delta = min(round((now - self._last_time) * 1_000_000), 0xFFFFFFFF)
+        self._last_time = now
+        buffer = self._buffer
+        buffer += _header.pack(code, delta)
+        fmt, packer = _events[code][1], _structs[code]
+        if packer is not None:
+            buffer += packer.pack(*args[: _fields[code]])
+        if fmt.endswith("s"):
+            _pack_string(buffer, args[-1])
+        elif fmt.endswith("S"):
+            buffer += _length.pack(len(args[-1]))
+            for path in args[-1]:
+                _pack_string(buffer, path)
+        self._count += 1
+        if len(buffer) >= _flush_size:
+            self.flush()
+
+
+def read_trace(file: str | BinaryIO) -> Iterator[tuple[float, str, tuple]]:
+    """Read records of a trace.
+
+    Args:
+        file:
+            Path of the trace, or a binary file object.
+
+    Yields:
+        ``(timestamp, event_type, args)``, where timestamp is in seconds since the
+        recording started.
+
+    Raises:
+        ValueError: The file is not a trace, or is of an unsupported version.
+    """
+    if isinstance(file, str):
+        with open(file, "rb") as stream:
+            data = stream.read()
+    else:
+        data = file.read()
+    if data[: len(_magic)] != _magic:
+        raise ValueError("not a GoldenUI trace")
+    (version,) = struct.unpack_from("<H", data, len(_magic))
+    if version != _version:
+        raise ValueError(f"unsupported trace version {version}")
+    offset = len(_magic) + 2
+    timestamp = 0
+    while offset < len(data):
+        code, delta = _header.unpack_from(data, offset)
+        offset += _header.size
+        if code >= len(_events):
+            raise ValueError(f"unknown event code {code} at byte {offset}")
+        timestamp += delta
+        event_type, fmt = _events[code]
+        args = ()
+        packer = _structs[code]
+        if packer is not None:
+            args = tuple(
+                _integral(value) if isinstance(value, float) else value
+                for value in packer.unpack_from(data, offset)
+            )
+            offset += packer.size
+        if fmt.endswith("s"):
+            text, offset = _unpack_string(data, offset)
+            args += (text,)
+        elif fmt.endswith("S"):
+            (count,) = _length.unpack_from(data, offset)
+            offset += _length.size
+            paths = []
+            for _ in range(count):
+                path, offset = _unpack_string(data, offset)
+                paths.append(path)
+            args += (paths,)
+        yield timestamp / 1_000_000, event_type, args
+
+
+def state_digest(manager: GUIManager) -> str:
+    """A digest of the state of all widgets in a manager.
+
+    It covers the class, :py:meth:`~goldenui.widget.base.WidgetBase._state` and the order
+    of widgets, so two runs with the same widgets and events give the same digest.
+
+    Args:
+        manager:
+            The manager.
+
+    Returns:
+        A SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    for widget in manager._ranges:
+        digest.update(repr((type(widget).__name__, widget._state())).encode())
+    return digest.hexdigest()
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def replay(
+    trace: str | BinaryIO | list[tuple[float, str, tuple]],
+    manager: GUIManager,
+    *,
+    realtime: bool = False,
+) -> dict[str, Any]:
+    """Feed events of a trace into a manager.
+
+    Events are given to the manager directly, so its window doesn't need to be visible,
+    or even enabled. Resizes are given to the manager and its widgets, the window itself
+    keeps its size.
+
+    Args:
+        trace:
+            Path of a trace, a binary file object, or records from
+            :py:func:`read_trace`.
+        manager:
+            The manager, which should contain the same widgets as when the trace was
+            recorded.
+        realtime:
+            Whether to keep the timing of the trace, ticking the pyglet clock while
+            waiting. Otherwise events are replayed as fast as possible.
+
+    Returns:
+        A dict like this::
+
+            {
+                "events": 12000,
+                "time": 0.41,
+                "events_per_second": 29268.3,
+                "latency": {"p50": 2e-05, "p90": 4e-05, "p99": 9e-05, "max": 0.0012},
+                "digest": "9f2c...",
+            }
+
+        ``time`` and ``events_per_second`` only count time spent on events.
+    """
+    records = trace if isinstance(trace, list) else list(read_trace(trace))
+    handlers = {event_type: getattr(manager, event_type) for event_type, _ in _events}
+    latencies = []
+    begin = perf_counter()
+    for timestamp, event_type, args in records:
+        if realtime:
+            pyglet.clock.tick()
+            delay = begin + timestamp - perf_counter()
+            if delay > 0:
+                sleep(delay)
+        start = perf_counter()
+        handlers[event_type](*args)
+        latencies.append(perf_counter() - start)
+    total = sum(latencies)
+    latencies.sort()
+    return {
+        "events": len(latencies),
+        "time": total,
+        "events_per_second": len(latencies) / total if total else 0.0,
+        "latency": {
+            "p50": _percentile(latencies, 0.5),
+            "p90": _percentile(latencies, 0.9),
+            "p99": _percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "digest": state_digest(manager),
+    }
+
+
+__all__ = "TraceRecorder", "read_trace", "replay", "state_digest"
@@ -0,0 +1,151 @@
+"""Update widgets from other threads.
+
+Widgets must only be changed on the thread which owns the GL context. Worker threads post
+property changes to an :py:class:`UpdateQueue` instead, and the main thread applies them
+once per frame. :py:class:`~goldenui.manager.GUIManager` has a queue, which is drained
+by :py:meth:`~goldenui.manager.GUIManager.draw`::
+
+    def worker():
+        while True:
+            manager.post(label_button, "text", read_sensor())
+"""
+
+import threading
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+
+class UpdateQueue:
+    """A thread-safe queue of property changes, coalesced by ``(widget, name)``.
+
+    Posting a change to a property which already has a pending change overwrites it, so
+    a worker producing faster than the frame rate only costs one assignment per property
+    per frame. Changes are applied in the order their properties were first posted.
+    """
+
+    def __init__(self, max_pending: int = 10000):
+        """Create an ``UpdateQueue``.
+
+        Args:
+            max_pending:
+                Maximum number of pending ``(widget, name)`` pairs, changes to new pairs
+                are dropped when the queue is full.
+        """
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[Any, str], Any] = {}
+        self._posted = 0
+        self._applied = 0
+        self._coalesced = 0
+        self._dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def post(self, widget: Any, name: str, value: Any) -> bool:
+        """Set a property of a widget later. Safe to call from any thread.
+
+        Args:
+            widget:
+                The widget to change.
+            name:
+                Name of the property, e.g. ``"text"`` or ``"enabled"``.
+            value:
+                New value of the property.
+
+        Returns:
+            ``False`` if the change was dropped because the queue is full.
+        """
+        key = (widget, name)
+        with self._lock:
+            self._posted += 1
+            if key in self._pending:
+                self._coalesced += 1
+            elif len(self._pending) >= self._max_pending:
+                self._dropped += 1
+                return False
+            self._pending[key] = value
+        return True
+
+    def drain(
+        self,
+        budget: Optional[float] = None,
+        accept: Optional[Callable[[Any], bool]] = None,
+    ) -> int:
+        """Apply pending changes. Call it on the main thread.
+
+        Args:
+            budget:
+                Seconds to spend at most, changes left are kept for the next call.
+            accept:
+                Changes to widgets for which it returns ``False`` are dropped, e.g. the
+                widgets which have been removed from the manager.
+
+        Returns:
+            The number of applied changes.
+
+        Raises:
+            Exception: What a property setter raises. The failed change is dropped and
+                the changes after it are kept for the next call.
+        """
+        if not self._pending:
+            return 0
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        start = perf_counter()
+        applied = dropped = 0
+        failed = False
+        items = iter(pending.items())
+        try:
+            for (widget, name), value in items:
+                if accept is not None and not accept(widget):
+                    dropped += 1
+                else:
+                    failed = True
+                    setattr(widget, name, value)
+                    failed = False
+                    applied += 1
+                if budget is not None and perf_counter() - start >= budget:
+                    break
+        finally:
+            dropped += failed
+            left = dict(items)
+            with self._lock:
+                if left:
+                    # Left changes go first, newer changes to the same properties win.
+                    self._coalesced += len(left.keys() & self._pending.keys())
+                    left.update(self._pending)
+                    self._pending = left
+                self._applied += applied
+                self._dropped += dropped
+        return applied
+
+    def clear(self):
+        """Drop all pending changes."""
+        with self._lock:
+            self._dropped += len(self._pending)
+            self._pending = {}
+
+    def stats(self) -> dict[str, int]:
+        """Counters of the queue.
+
+        Returns:
+            A dict with keys ``pending``, ``posted``, ``applied``, ``coalesced`` (changes
+            overwritten by later ones) and ``dropped``.
+        """
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "posted": self._posted,
+                "applied": self._applied,
+                "coalesced": self._coalesced,
+                "dropped": self._dropped,
+            }
+
+    def reset_stats(self):
+        """Set all counters except ``pending`` to zero."""
+        with self._lock:
+            self._posted = self._applied = self._coalesced = self._dropped = 0
+
+
+__all__ = ("UpdateQueue",)
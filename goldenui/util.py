@@ -8,6 +8,8 @@ class space:
     Used for ``margin`` and ``padding`` parameters.
     """
 
+    __slots__ = ("_top", "_right", "_bottom", "_left")
+
     def __init__(self, *value: int):
         """Create a ``space`` object.
 
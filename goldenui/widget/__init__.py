@@ -1,2 +1,6 @@
 from goldenui.widget.button import TextButton
 from goldenui.widget.container import CenterContainer
+from goldenui.widget.image import ImageView
+from goldenui.widget.perf import PerfOverlay
+from goldenui.widget.plot import Plot
+from goldenui.widget.text import TextInput
@@ -1,16 +1,64 @@
 """Base class of all widgets.
 """
 
-from typing import Any, Optional
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Optional
 
 from pyglet.event import EventDispatcher
 from pyglet.graphics import Batch, Group
 
 from goldenui import is_sphinx_run
+from goldenui.aio import CoroutineHandler, cancel_tasks, is_coroutine_handler
+from goldenui.theme import unfollow
+
+if TYPE_CHECKING:
+    from goldenui.event import PointerEvent
+    from goldenui.manager import GUIManager
+    from goldenui.theme import Theme
+
+_detached_batch: Optional[Batch] = None
+
+
+def _get_detached_batch() -> Batch:
+    """The batch holding vertex lists of hidden or culled widgets, which is never drawn."""
+    global _detached_batch
+    if _detached_batch is None:
+        _detached_batch = Batch()
+    return _detached_batch
+
+
+def _prune_detached_batch():
+    """Drop empty vertex domains and groups of the detached batch, which is never drawn."""
+    if _detached_batch is not None and _detached_batch._draw_list_dirty:
+        _detached_batch._update_draw_list()
 
 
 class WidgetBase(EventDispatcher):
-    """The base class of all widgets."""
+    """The base class of all widgets.
+
+    Widgets define ``__slots__`` to keep thousands of them small, so subclasses should
+    declare their attributes in ``__slots__`` as well. Widgets still have a
+    ``__dict__``, because :py:class:`~pyglet.event.EventDispatcher` has no
+    ``__slots__``: it holds the event handlers, and a misspelled attribute is set there
+    without an error.
+    """
+
+    __slots__ = (
+        "_x",
+        "_y",
+        "_width",
+        "_height",
+        "_enabled",
+        "_batch",
+        "_parent_group",
+        "_manager",
+        "_event_stack",
+        "_animator",
+        "_culled",
+        "_visible",
+        "_parent",
+        "_disposed",
+    )
 
     def __init__(
         self,
@@ -49,6 +97,12 @@ class WidgetBase(EventDispatcher):
         self._batch = batch
         self._parent_group = group
         self._manager = None
+        self._event_stack = ()
+        self._animator = None
+        self._culled = False
+        self._visible = True
+        self._parent = None
+        self._disposed = False
 
     @property
     def x(self) -> int:
@@ -59,7 +113,7 @@ class WidgetBase(EventDispatcher):
     def x(self, value: int):
         self._x = value
         self._update_position()
-        self.dispatch_event("on_repositioning", self)
+        self._repositioned()
 
     @property
     def y(self) -> int:
@@ -70,7 +124,7 @@ class WidgetBase(EventDispatcher):
     def y(self, value: int):
         self._y = value
         self._update_position()
-        self.dispatch_event("on_repositioning", self)
+        self._repositioned()
 
     @property
     def position(self) -> tuple[int, int]:
@@ -81,7 +135,7 @@ class WidgetBase(EventDispatcher):
     def position(self, values: tuple[int, int]):
         self._x, self._y = values
         self._update_position()
-        self.dispatch_event("on_repositioning", self)
+        self._repositioned()
 
     @property
     def width(self) -> int:
@@ -92,7 +146,7 @@ class WidgetBase(EventDispatcher):
     def width(self, value: int):
         self._width = value
         self._update_position()
-        self.dispatch_event("on_repositioning", self)
+        self._repositioned()
 
     @property
     def height(self) -> int:
@@ -103,7 +157,7 @@ class WidgetBase(EventDispatcher):
     def height(self, value: int):
         self._height = value
         self._update_position()
-        self.dispatch_event("on_repositioning", self)
+        self._repositioned()
 
     @property
     def batch(self) -> Optional[Batch]:
@@ -113,7 +167,9 @@ class WidgetBase(EventDispatcher):
     @batch.setter
     def batch(self, new_batch: Optional[Batch]):
         self._batch = new_batch
-        self._update_batch()
+        # A detached widget moves to its batch when it is attached again.
+        if self._visible and not self._culled and not self._disposed:
+            self._update_batch()
 
     @property
     def group(self) -> Optional[Group]:
@@ -123,7 +179,8 @@ class WidgetBase(EventDispatcher):
     @group.setter
     def group(self, new_group: Optional[Group]):
         self._parent_group = new_group
-        self._update_group()
+        if not self._disposed:
+            self._update_group()
 
     @property
     def enabled(self) -> bool:
@@ -139,6 +196,47 @@ class WidgetBase(EventDispatcher):
             return
         self._enabled = new_enabled
         self._set_enabled(new_enabled)
+        if self._manager is not None:
+            self._manager._on_widget_state(self)
+
+    @property
+    def visible(self) -> bool:
+        """Whether the widget is shown.
+
+        A hidden widget keeps its state and vertex lists, but it is not drawn and doesn't
+        receive events from the manager or its container. Hiding a container hides its
+        children as well.
+        """
+        return self._visible
+
+    @visible.setter
+    def visible(self, new_visible: bool):
+        if self._visible == new_visible:
+            return
+        detached = self._culled or not self._visible
+        self._visible = new_visible
+        self._attach(detached)
+        if self._manager is not None:
+            self._manager._on_widget_state(self)
+
+    @property
+    def parent(self) -> Optional["WidgetBase"]:
+        """The container which the widget is added to, if any."""
+        return self._parent
+
+    @property
+    def culled(self) -> bool:
+        """Whether the widget is not drawn because it can't be seen.
+
+        Culling is done by :py:class:`~goldenui.manager.GUIManager` for widgets outside
+        its viewport, and by containers for widgets outside their area.
+        """
+        return self._culled
+
+    @property
+    def disposed(self) -> bool:
+        """Whether :py:meth:`.dispose` has been called."""
+        return self._disposed
 
     @property
     def aabb(self) -> tuple[int, ...]:
@@ -165,6 +263,108 @@ class WidgetBase(EventDispatcher):
     def value(self, value: Any):
         raise NotImplementedError("value depends on widget type")
 
+    def set_handler(self, name: str, handler: Callable):
+        """Attach a single event handler.
+
+        Coroutine functions are accepted as well, they are run by
+        :py:mod:`goldenui.aio` and owned by the widget.
+        """
+        if is_coroutine_handler(handler):
+            handler = CoroutineHandler(self, handler)
+        super().set_handler(name, handler)
+
+    def dispose(self):
+        """Release the widget for good.
+
+        The widget is removed from its manager and its container, its animations, tasks
+        and shortcuts are stopped, all its event handlers are removed, and vertex lists
+        and textures are freed right away instead of whenever the garbage collector
+        gets to them. Disposing a container disposes its children as well. Nothing
+        happens if the widget is disposed already, and it shouldn't be used afterwards.
+        """
+        if self._disposed:
+            return
+        # Set first, so that removing the widget doesn't move its vertex lists around.
+        self._disposed = True
+        detached = self._culled or not self._visible or self._batch is None
+        batch = _get_detached_batch() if detached else self._batch
+        manager = self._get_manager()
+        if manager is not None:
+            # Children of containers aren't in the manager, so look for the whole tree.
+            subtree = [self]
+            for widget in subtree:
+                manager.accelerators.remove_scope(widget)
+                subtree.extend(widget._children())
+            manager._blur_inside(self)
+        if self._manager is not None:
+            self._manager.remove(self)
+        if self._parent is not None:
+            self._parent.remove(self)
+        if self._animator is not None:
+            self._animator.cancel(self)
+            self._animator = None
+        unfollow(self)
+        cancel_tasks(self)
+        self._dispose()
+        self._event_stack = ()
+        # Empty vertex domains and groups are only dropped when the draw list of the
+        # batch is updated.
+        batch.invalidate()
+
+    def _set_culled(self, culled: bool):
+        """Cull the widget, or stop culling it."""
+        if self._culled == culled:
+            return
+        detached = self._culled or not self._visible
+        self._culled = culled
+        self._attach(detached)
+
+    def _attach(self, was_detached: bool):
+        """Detach vertex lists of the widget from its batch, or attach them again.
+
+        The widget is detached while it is hidden or culled. Vertex lists are moved to a
+        batch which is never drawn by :py:meth:`._update_batch`, while :py:attr:`.batch`
+        stays the same.
+
+        Args:
+            was_detached:
+                Whether the widget was detached before its state changed.
+        """
+        detached = self._culled or not self._visible
+        if detached == was_detached or self._batch is None or self._disposed:
+            return
+        if detached:
+            batch, self._batch = self._batch, _get_detached_batch()
+            self._update_batch()
+            self._batch = batch
+        else:
+            self._update_batch()
+
+    def _get_manager(self) -> Optional["GUIManager"]:
+        """The manager of the widget, or of the outermost container it is in."""
+        widget = self
+        while widget._parent is not None:
+            widget = widget._parent
+        return widget._manager
+
+    def _children(self) -> list["WidgetBase"]:
+        """Internal hook to get widgets inside the widget, which containers have."""
+        return []
+
+    def _child_at(self, x: int, y: int) -> Optional["WidgetBase"]:
+        """Internal hook to find the topmost child containing a point.
+
+        Args:
+            x:
+                X coordinate in the space of children's positions.
+            y:
+                Y coordinate in the space of children's positions.
+
+        Returns:
+            ``None`` if the widget has no children there.
+        """
+        return None
+
     def _check_hit(self, x: int, y: int) -> int:
         """Internal hook to check which part of widget has been hitted.
 
@@ -196,6 +396,54 @@ class WidgetBase(EventDispatcher):
         """Internal hook to change widget's position and size."""
         pass
 
+    def _apply_theme(self, theme: Optional["Theme"]):
+        """Internal hook to restyle the widget when the theme changes.
+
+        It is only called on widgets which :py:func:`~goldenui.theme.follow` the theme.
+
+        Args:
+            theme:
+                The new theme, ``None`` for the built-in look.
+        """
+        pass
+
+    def _dispose(self):
+        """Internal hook to free vertex lists, textures and handlers of the widget."""
+        pass
+
+    def _state(self) -> tuple:
+        """Internal hook to describe the state for :py:func:`~goldenui.trace.state_digest`.
+
+        Subclasses extend the tuple with their own state, e.g. text or values.
+        """
+        return self.aabb, self._enabled
+
+    def _vertex_targets(self) -> Optional[list[tuple[Any, str, int, int]]]:
+        """Internal hook to let :py:class:`~goldenui.animation.Animator` move vertices.
+
+        Returns:
+            ``None`` if the widget can only be moved by :py:meth:`._update_position`,
+            otherwise a list of ``(vertex_list, attribute, dx, dy)``. The first two
+            components of ``attribute`` of every vertex are set to the position of the
+            widget plus ``(dx, dy)``.
+        """
+        return None
+
+    def _repositioned(self):
+        """Tell the manager and ``on_repositioning`` handlers that the widget moved.
+
+        The manager is told directly, a handler on every widget would cost more memory
+        than the widget itself.
+        """
+        if self._manager is not None:
+            self._manager._on_repositioning_hook(self)
+        self.dispatch_event("on_repositioning", self)
+
+    def _vertices_changed(self):
+        """Call it when vertex lists returned by :py:meth:`._vertex_targets` change."""
+        if self._animator is not None:
+            self._animator._invalidate()
+
     if is_sphinx_run:
 
         # Events for GoldenUI.
@@ -203,6 +451,22 @@ class WidgetBase(EventDispatcher):
         def on_repositioning(self, widget: "WidgetBase"):
             pass
 
+        def on_focus(self):
+            """The widget becomes :py:attr:`~goldenui.manager.GUIManager.focus`."""
+            pass
+
+        def on_blur(self):
+            """The widget is no longer :py:attr:`~goldenui.manager.GUIManager.focus`."""
+            pass
+
+        def on_pointer(self, event: "PointerEvent"):
+            """A pointer event passes the widget, see :py:mod:`goldenui.event`.
+
+            It is only dispatched when
+            :py:attr:`~goldenui.manager.GUIManager.propagation` is enabled.
+            """
+            pass
+
         # Events for pyglet.
 
         def on_file_drop(self, x: int, y: int, paths: list[str]):
@@ -244,13 +508,17 @@ class WidgetBase(EventDispatcher):
             pass
 
 
+WidgetBase.register_event_type("on_blur")
 WidgetBase.register_event_type("on_file_drop")
+WidgetBase.register_event_type("on_focus")
 WidgetBase.register_event_type("on_key_press")
 WidgetBase.register_event_type("on_key_release")
 WidgetBase.register_event_type("on_mouse_press")
 WidgetBase.register_event_type("on_mouse_release")
 WidgetBase.register_event_type("on_mouse_drag")
 WidgetBase.register_event_type("on_mouse_motion")
+WidgetBase.register_event_type("on_mouse_scroll")
+WidgetBase.register_event_type("on_pointer")
 WidgetBase.register_event_type("on_repositioning")
 WidgetBase.register_event_type("on_resize")
 WidgetBase.register_event_type("on_text")
@@ -5,16 +5,24 @@ In this submodule, GoldenUI defines several buttons.
 :py:class:`TextButton` is a button that shows one line of text.
 """
 
-from typing import Optional
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
 
 from pyglet.graphics import Batch, Group
+from pyglet.image import AbstractImage
 from pyglet.text import Label
 from pyglet.window import mouse
 
 from goldenui import is_sphinx_run
+from goldenui.aio import next_event
+from goldenui.group import get_group, migrate_vertex_lists
 from goldenui.patch import ThreePatch
-from goldenui.resources import loader
-from goldenui.widget.base import WidgetBase
+from goldenui.resources import AsyncImage, loader, resolve_images
+from goldenui.scaling import skin_cache, snap
+from goldenui.theme import follow, get_theme, theme_style, unfollow
+from goldenui.widget.base import WidgetBase, _get_detached_batch
+
+if TYPE_CHECKING:
+    from goldenui.theme import Theme
 
 text_color_white = (255, 255, 255, 255)
 text_color_gray = (170, 170, 170, 255)
@@ -32,9 +40,50 @@ for status in ["normal", "hover", "pressed"]:
             )
 
 
+class TextButtonStyle(NamedTuple):
+    """Immutable look of :py:class:`TextButton`.
+
+    A style is shared by all buttons using it instead of being copied into every button.
+    Parts can be :py:class:`~goldenui.resources.AsyncImage` handles, buttons show a
+    placeholder until they are ready.
+    """
+
+    #: Left, middle and right parts when the button is normal.
+    normal: tuple[AbstractImage, ...]
+    #: Left, middle and right parts when the cursor is on the button.
+    hover: tuple[AbstractImage, ...]
+    #: Left, middle and right parts when the button is pressed or disabled.
+    pressed: tuple[AbstractImage, ...]
+    #: Color of text when the button is normal.
+    text_color: tuple[int, int, int, int] = text_color_white
+    #: Color of text when the cursor is on the button.
+    hover_text_color: tuple[int, int, int, int] = text_color_gray
+    #: Color of text when the button is disabled.
+    disabled_text_color: tuple[int, int, int, int] = text_color_gray
+
+
+default_style = TextButtonStyle(
+    tuple(text_button_image["normal"]),
+    tuple(text_button_image["hover"]),
+    tuple(text_button_image["pressed"]),
+)
+
+
 class TextButton(WidgetBase):
     """A button with text."""
 
+    __slots__ = (
+        "_style",
+        "_button_group",
+        "_label_group",
+        "_button",
+        "_label",
+        "_pressed",
+        "_look",
+        "_themed",
+        "_pixel_perfect",
+    )
+
     def __init__(
         self,
         text: str,
@@ -46,6 +95,8 @@ class TextButton(WidgetBase):
         enabled: bool = True,
         font_name: Optional[str] = None,
         font_size: Optional[int] = None,
+        style: Optional[TextButtonStyle] = None,
+        pixel_perfect: bool = False,
         batch: Optional[Batch] = None,
         group: Optional[Group] = None,
     ):
@@ -66,28 +117,51 @@ class TextButton(WidgetBase):
                 Font family name(s) for text.
             font_size:
                 Font size for text.
+            style:
+                Look of the button. If not given, the button follows the current
+                theme, see :py:mod:`goldenui.theme`, and uses :py:data:`default_style`
+                without one. The font follows the theme as well if neither
+                ``font_name`` nor ``font_size`` is given.
+            pixel_perfect:
+                Whether to snap the height to integer multiples of the skin height, see
+                :py:attr:`.pixel_perfect`.
             batch:
                 Optional batch to add the button to.
             group:
                 Optional parent group of the button.
         """
         super().__init__(x, y, width, height, enabled=enabled, batch=batch, group=group)
-        self._button_group = Group(order=0, parent=group)
-        self._label_group = Group(order=1, parent=group)
+        # Whether the style and the font follow the theme.
+        self._themed = style is None, font_name is None and font_size is None
+        if any(self._themed):
+            follow(self)
+        theme = get_theme()
+        if style is None:
+            style = theme_style(TextButton, default_style)
+        if self._themed[1] and theme is not None:
+            font_name, font_size = theme.font_name, theme.font_size
+        self._style = style
+        self._pixel_perfect = pixel_perfect
+        self._snap_height()
+        self._button_group = get_group(order=0, parent=group)
+        self._label_group = get_group(order=1, parent=group)
+        self._look = "normal"
+        # Groups inside containers are their own, and would stay in the default batch of
+        # pyglet forever, so the patch lives in the detached batch until it gets a batch.
         self._button = ThreePatch(
             self._x,
             self._y,
             self._width,
             self._height,
-            *text_button_image["normal"],
-            batch=batch,
+            *resolve_images(self._style.normal),
+            batch=batch or _get_detached_batch(),
             group=self._button_group,
         )
         self._label = Label(
             text,
             x=self._x + self._width // 2,
             y=self._y + self._height // 2,
-            color=text_color_white,
+            color=self._style.text_color,
             anchor_x="center",
             anchor_y="center",
             align="center",
@@ -97,6 +171,7 @@ class TextButton(WidgetBase):
             group=self._label_group,
         )
         self._pressed = False
+        self._watch_style()
         self._set_enabled(enabled)
 
     @property
@@ -107,6 +182,29 @@ class TextButton(WidgetBase):
     @text.setter
     def text(self, text: str):
         self._label.text = text
+        self._vertices_changed()
+
+    @property
+    def style(self) -> TextButtonStyle:
+        """Look of the button."""
+        return self._style
+
+    @style.setter
+    def style(self, style: TextButtonStyle):
+        self._themed = False, self._themed[1]
+        if not self._themed[1]:
+            unfollow(self)
+        self._restyle(style)
+
+    @property
+    def pixel_perfect(self) -> bool:
+        """Whether the skin is drawn without fractional scaling.
+
+        The height of a pixel-perfect button is snapped down to an integer multiple of the
+        skin height whenever it is set, see :py:func:`~goldenui.scaling.snap`, and the
+        skin is drawn from parts pre-scaled by :py:data:`~goldenui.scaling.skin_cache`.
+        """
+        return self._pixel_perfect
 
     @property
     def value(self) -> bool:
@@ -117,34 +215,157 @@ class TextButton(WidgetBase):
     def value(self, value: bool):
         pass
 
+    async def clicked(self):
+        """Wait until the button is clicked.
+
+        Requires :py:func:`goldenui.aio.install`. The wait is cancelled if the button is
+        removed from its manager.
+        """
+        await next_event(self, "on_click")
+
+    def _watch_style(self):
+        """Swap images when async parts of the style are ready."""
+        for parts in (self._style.normal, self._style.hover, self._style.pressed):
+            for part in parts:
+                if isinstance(part, AsyncImage) and not part.ready:
+                    part.push_handlers(on_ready=self._on_image_ready)
+
+    def _restyle(self, style: TextButtonStyle):
+        """Change the style, keeping the current look."""
+        self._style = style
+        self._watch_style()
+        self._show_parts(self._look)
+        if not self._enabled:
+            self._set_text_color(style.disabled_text_color)
+        elif self._look == "normal":
+            self._set_text_color(style.text_color)
+        else:
+            self._set_text_color(style.hover_text_color)
+
+    def _apply_theme(self, theme: Optional["Theme"]):
+        style_themed, font_themed = self._themed
+        if style_themed:
+            style = default_style if theme is None else theme.style(TextButton)
+            style = default_style if style is None else style
+            # Themes without a style of their own resolve to the same one, whose
+            # images are in the same textures, so there is nothing to migrate.
+            if style is not self._style:
+                self._restyle(style)
+        if font_themed:
+            font = (None, None) if theme is None else (theme.font_name, theme.font_size)
+            label = self._label
+            if font != (label.font_name, label.font_size):
+                # One style change lays out the text once, unlike two setters.
+                label.document.set_style(
+                    0,
+                    len(label.document.text),
+                    {"font_name": font[0], "font_size": font[1]},
+                )
+                self._vertices_changed()
+
+    def _on_image_ready(self, image: AsyncImage):
+        self._show_parts(self._look)
+
+    def _skin_height(self) -> Optional[int]:
+        """Height of the skin, ``None`` if it is still being loaded."""
+        part = self._style.normal[0]
+        if isinstance(part, AsyncImage):
+            if not part.ready:
+                return None
+            part = part.image
+        return part.height
+
+    def _snap_height(self):
+        if self._pixel_perfect:
+            unit = self._skin_height()
+            if unit is not None:
+                self._height = snap(self._height, unit)
+
+    def _show_parts(self, look: str):
+        images = resolve_images(getattr(self._style, look))
+        unit = self._skin_height() if self._pixel_perfect else None
+        if unit is not None and images[0].height == unit:
+            images = skin_cache.scaled(images, self._height // unit)
+        # Mouse motion shows the same look over and over, which shouldn't dirty vertices.
+        if look == self._look and list(images) == self._button[:]:
+            return
+        self._look = look
+        self._button[:] = images
+        self._vertices_changed()
+
+    def _set_text_color(self, color: tuple[int, ...]):
+        if tuple(self._label.color) != tuple(color):
+            self._label.color = color
+
     def _set_enabled(self, enabled: bool):
         if enabled:
-            self._button[:] = text_button_image["normal"]
-            self._label.color = text_color_white
+            self._show_parts("normal")
+            self._set_text_color(self._style.text_color)
         else:
-            self._button[:] = text_button_image["pressed"]
-            self._label.color = text_color_gray
+            self._show_parts("pressed")
+            self._set_text_color(self._style.disabled_text_color)
+
+    def _show_hover(self, hover: bool):
+        if hover:
+            self._show_parts("hover")
+            self._set_text_color(self._style.hover_text_color)
+        else:
+            self._show_parts("normal")
+            self._set_text_color(self._style.text_color)
 
     def _update_batch(self):
-        self._button.batch = self._batch
-        self._label.batch = self._batch
+        old_batch = self._button.batch
+        self._button.batch = self._batch or _get_detached_batch()
+        if self._button.batch is not old_batch:
+            # Drop the emptied domains from the old batch when it is drawn or pruned.
+            old_batch.invalidate()
+        label = self._label
+        if self._batch is None or label._own_batch or label._batch is self._batch:
+            label.batch = self._batch
+        else:
+            migrate_vertex_lists(label._vertex_lists, label._batch, self._batch)
+            label._batch = self._batch
+        self._vertices_changed()
+
+    def _dispose(self):
+        for parts in (self._style.normal, self._style.hover, self._style.pressed):
+            for part in parts:
+                if isinstance(part, AsyncImage):
+                    part.remove_handlers(on_ready=self._on_image_ready)
+        self._button.delete()
+        self._label.delete()
 
     def _update_group(self):
-        self._button_group = Group(order=0, parent=self._parent_group)
-        self._label_group = Group(order=1, parent=self._parent_group)
+        self._button_group = get_group(order=0, parent=self._parent_group)
+        self._label_group = get_group(order=1, parent=self._parent_group)
         self._button.group = self._button_group
         self._label.group = self._label_group
+        self._vertices_changed()
 
     def _update_position(self):
+        self._snap_height()
         self._button.update(
             x=self._x, y=self._y, width=self._width, height=self._height
         )
+        if self._pixel_perfect and self._skin_height() is not None:
+            if self._button[0].height != self._height:
+                self._show_parts(self._look)
         self._label.position = (
             self._x + self._width // 2,
             self._y + self._height // 2,
             0,
         )
 
+    def _vertex_targets(self) -> list[tuple[Any, str, int, int]]:
+        targets = [(self._button._vertex_list, "translate", 0, 0)]
+        center = self._width // 2, self._height // 2
+        for vertex_list in self._label._vertex_lists:
+            targets.append((vertex_list, "translation", *center))
+        return targets
+
+    def _state(self) -> tuple:
+        return super()._state() + (self._label.text, self._pressed, self._look)
+
     def on_mouse_press(self, x: int, y: int, buttons: int, modifiers: int):
         if (
             not self._enabled
@@ -152,39 +373,27 @@ class TextButton(WidgetBase):
             or not buttons & mouse.LEFT
         ):
             return
-        self._button[:] = text_button_image["pressed"]
+        self._show_parts("pressed")
         self._pressed = True
 
     def on_mouse_release(self, x: int, y: int, buttons: int, modifiers: int):
         if not self._enabled or not self._pressed:
             return
-        self._label.color = (
-            text_color_gray if self._check_hit(x, y) >= 0 else text_color_white
-        )
-        status = "hover" if self._check_hit(x, y) >= 0 else "normal"
-        self._button[:] = text_button_image[status]
+        self._show_hover(self._check_hit(x, y) >= 0)
         self._pressed = False
         self.dispatch_event("on_click")
 
     def on_mouse_motion(self, x: int, y: int, dx: int, dy: int):
         if not self._enabled or self._pressed:
             return
-        self._label.color = (
-            text_color_gray if self._check_hit(x, y) >= 0 else text_color_white
-        )
-        status = "hover" if self._check_hit(x, y) >= 0 else "normal"
-        self._button[:] = text_button_image[status]
+        self._show_hover(self._check_hit(x, y) >= 0)
 
     def on_mouse_drag(
         self, x: int, y: int, dx: int, dy: int, buttons: int, modifiers: int
     ):
         if not self._enabled or self._pressed:
             return
-        self._label.color = (
-            text_color_gray if self._check_hit(x, y) >= 0 else text_color_white
-        )
-        status = "hover" if self._check_hit(x, y) >= 0 else "normal"
-        self._button[:] = text_button_image[status]
+        self._show_hover(self._check_hit(x, y) >= 0)
 
     if is_sphinx_run:
 
@@ -196,4 +405,4 @@ class TextButton(WidgetBase):
 TextButton.register_event_type("on_click")
 
 
-__all__ = ("TextButton",)
+__all__ = "TextButton", "TextButtonStyle"
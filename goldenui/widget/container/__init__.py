@@ -5,3 +5,4 @@ container has its own coordinate system.
 """
 
 from goldenui.widget.container.center import CenterContainer
+from goldenui.widget.container.table import Table
@@ -13,6 +13,8 @@ from goldenui.widget.base import WidgetBase
 class ContainerBase(WidgetBase):
     """The base class of all containers."""
 
+    __slots__ = ("_toplevel", "_window", "_group", "_widgets")
+
     def __init__(
         self,
         toplevel: Union[Window, "ContainerBase"],
@@ -52,37 +54,55 @@ class ContainerBase(WidgetBase):
         else:
             self._toplevel = toplevel
             self._window = toplevel._window
+        self._widgets: list[WidgetBase] = []
         self._group = ContainerGroup(
-            self._window, (x, y, width, height), parent=self._parent_group
+            self._window, self._get_area(), parent=self._parent_group
         )
-        self._widgets: list[WidgetBase] = []
 
     def _update_batch(self):
         for widget in self._widgets:
             widget.batch = self._batch
 
+    def _dispose(self):
+        for widget in list(self._widgets):
+            widget.dispose()
+
+    def _children(self) -> list[WidgetBase]:
+        return self._widgets
+
+    def _get_area(self) -> tuple[int, int, int, int]:
+        """Clipping area of the container in window coordinates."""
+        if self._toplevel is None:
+            return self._x, self._y, self._width, self._height
+        tl_area = self._toplevel._group.area
+        now_x = tl_area[0] + self._x
+        now_y = tl_area[1] + self._y
+        now_w = min(self._width, tl_area[2] - self._x)
+        now_h = min(self._height, tl_area[3] - self._y)
+        return now_x, now_y, now_w, now_h
+
     def _update_group(self):
         self._group = ContainerGroup(
-            self._window,
-            (self._x, self._y, self._width, self._height),
-            parent=self._parent_group,
+            self._window, self._get_area(), parent=self._parent_group
         )
-        self._update_position()
         for widget in self._widgets:
             widget.group = self._group
 
     def _update_position(self):
-        if self._toplevel is None:
-            self._group.area = (self._x, self._y, self._width, self._height)
-        else:
-            tl_area = self._toplevel._group.area
-            now_x = tl_area[0] + self._x
-            now_y = tl_area[1] + self._y
-            now_w = min(self._width, tl_area[2] - self._x)
-            now_h = min(self._height, tl_area[3] - self._y)
-            self._group.area = (now_x, now_y, now_w, now_h)
+        # Children are drawn relative to the area, so only inner containers, whose areas
+        # are in window coordinates, need to follow.
+        self._group.area = self._get_area()
+        for widget in self._widgets:
+            if isinstance(widget, ContainerBase) and not widget._disposed:
+                widget.position = widget.position
+        self._cull_children()
+
+    def _cull_children(self):
+        """Cull children which are entirely outside the clipping area."""
+        _, _, width, height = self._group.area
         for widget in self._widgets:
-            widget.position = widget.position
+            x1, y1, x2, y2 = widget.aabb
+            widget._set_culled(not (x1 < width and 0 < x2 and y1 < height and 0 < y2))
 
     def add(self, *widgets: WidgetBase):
         """Add some widgets to the container.
@@ -94,8 +114,10 @@ class ContainerBase(WidgetBase):
         for widget in widgets:
             if widget not in self._widgets:
                 self._widgets.append(widget)
+                widget._parent = self
                 widget.batch = self._batch
                 widget.group = self._group
+        self._cull_children()
 
     def remove(self, *widgets: WidgetBase):
         """Remove some added widgets.
@@ -104,38 +126,53 @@ class ContainerBase(WidgetBase):
             widgets:
                 Widgets want to remove.
         """
+        manager = self._get_manager()
         for widget in widgets:
             if widget in self._widgets:
+                if manager is not None:
+                    manager._blur_inside(widget)
                 if widget.batch is self._batch:
                     widget.batch = None
                 if widget.group is self._group:
                     widget.group = None
+                widget._set_culled(False)
+                widget._parent = None
                 self._widgets.remove(widget)
 
+    def _child_at(self, x: int, y: int) -> Optional[WidgetBase]:
+        for widget in reversed(self._widgets):
+            if widget._visible and widget._enabled and widget._check_hit(x, y) >= 0:
+                return widget
+        return None
+
+    def _visible_widgets(self) -> list[WidgetBase]:
+        """Children which receive events."""
+        return [widget for widget in self._widgets if widget._visible]
+
     def on_key_press(self, symbol: int, modifiers: int):
         if not self._enabled:
             return
-        for widget in self._widgets:
+        for widget in self._visible_widgets():
             widget.dispatch_event("on_key_press", symbol, modifiers)
 
     def on_key_release(self, symbol: int, modifiers: int):
         if not self._enabled:
             return
-        for widget in self._widgets:
+        for widget in self._visible_widgets():
             widget.dispatch_event("on_key_release", symbol, modifiers)
 
     def on_mouse_press(self, x: int, y: int, buttons: int, modifiers: int):
         if self._check_hit(x, y) < 0 and not self._enabled:
             return
         x, y = x - self._x, y - self._y
-        for widget in self._widgets:
+        for widget in self._visible_widgets():
             widget.dispatch_event("on_mouse_press", x, y, buttons, modifiers)
 
     def on_mouse_release(self, x: int, y: int, buttons: int, modifiers: int):
         if self._check_hit(x, y) < 0 and not self._enabled:
             return
         x, y = x - self._x, y - self._y
-        for widget in self._widgets:
+        for widget in self._visible_widgets():
             widget.dispatch_event("on_mouse_release", x, y, buttons, modifiers)
 
     def on_mouse_drag(
@@ -144,21 +181,21 @@ class ContainerBase(WidgetBase):
         if self._check_hit(x, y) < 0 and not self._enabled:
             return
         x, y = x - self._x, y - self._y
-        for widget in self._widgets:
+        for widget in self._visible_widgets():
             widget.dispatch_event("on_mouse_drag", x, y, dx, dy, buttons, modifiers)
 
     def on_mouse_motion(self, x: int, y: int, dx: int, dy: int):
         if self._check_hit(x, y) < 0 and not self._enabled:
             return
         x, y = x - self._x, y - self._y
-        for widget in self._widgets:
+        for widget in self._visible_widgets():
             widget.dispatch_event("on_mouse_motion", x, y, dx, dy)
 
     def on_mouse_scroll(self, x: int, y: int, scroll_x: int, scroll_y: int):
         if self._check_hit(x, y) < 0 and not self._enabled:
             return
         x, y = x - self._x, y - self._y
-        for widget in self._widgets:
+        for widget in self._visible_widgets():
             widget.dispatch_event("on_mouse_scroll", x, y, scroll_x, scroll_y)
 
 
@@ -11,6 +11,7 @@ from goldenui.widget.container.base import ContainerBase
 
 
 class CenterContainer(ContainerBase):
+    __slots__ = ("_filled",)
 
     def __init__(
         self,
@@ -63,6 +64,7 @@ class CenterContainer(ContainerBase):
         widget.batch = self._batch
         widget.group = self._group
         self._widgets.append(widget)
+        widget._parent = self
         self._filled = filled
         if self._filled:
             self.x, self.y = 0, 0
@@ -79,15 +81,24 @@ class CenterContainer(ContainerBase):
             else:
                 self._width, self._height = self._toplevel.width, self._toplevel.height
         super()._update_position()
+        if not self._widgets:
+            return
         widget = self._widgets[0]
         widget.x = (self._width - widget.width) // 2
         widget.y = (self._height - widget.height) // 2
+        self._cull_children()
 
     def add(self, *widgets: WidgetBase):
-        pass
+        """Center a widget, if the container has none.
 
-    def remove(self, *widgets: WidgetBase):
-        pass
+        Args:
+            widgets:
+                Widgets want to add, only the first one is taken.
+        """
+        if self._widgets or not widgets:
+            return
+        super().add(widgets[0])
+        self._update_position()
 
     def on_resize(self, width: int, height: int):
         if not self._filled:
@@ -0,0 +1,493 @@
+"""A container to show large tables.
+
+:py:class:`Table` shows columnar data, i.e. a sequence per column such as a list, an
+:py:class:`array.array` or a NumPy array, or rows given by a callback. Only rows in view
+are drawn, by a fixed pool of labels which are recycled as the table scrolls, so a table
+of a million rows costs as much as a table of a screen.
+
+Sorting and filtering are done by NumPy, which is required by them only, on permutation
+indices of rows. The indices of each sorted column are cached, and rows appended later are
+merged into them instead of sorting again.
+"""
+
+from collections.abc import Callable, Sequence
+from typing import Any, Optional, Union
+
+from pyglet.graphics import Batch, Group
+from pyglet.text import Label
+from pyglet.window import Window, mouse
+
+from goldenui import is_sphinx_run
+from goldenui.group import migrate_vertex_lists
+from goldenui.widget.container.base import ContainerBase
+
+text_color = (255, 255, 255, 255)
+header_color = (255, 220, 120, 255)
+# Space between the left of a column and its text.
+cell_padding = 4
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("sorting and filtering tables require NumPy") from None
+    return numpy
+
+
+class Table(ContainerBase):
+    """A table which only draws rows in view."""
+
+    __slots__ = (
+        "_headers",
+        "_columns",
+        "_provider",
+        "_row_count",
+        "_column_widths",
+        "_row_height",
+        "_font",
+        "_header_labels",
+        "_cells",
+        "_slot_rows",
+        "_top",
+        "_arrays",
+        "_sorted",
+        "_sort_column",
+        "_descending",
+        "_filter",
+        "_mask",
+        "_view",
+    )
+
+    def __init__(
+        self,
+        toplevel: Union[Window, ContainerBase],
+        headers: Sequence[str],
+        x: int = 0,
+        y: int = 0,
+        width: int = 0,
+        height: int = 0,
+        *,
+        columns: Optional[Sequence[Sequence[Any]]] = None,
+        provider: Optional[Callable[[int], Sequence[Any]]] = None,
+        row_count: int = 0,
+        column_widths: Optional[Sequence[int]] = None,
+        row_height: int = 20,
+        font_name: Optional[str] = None,
+        font_size: Optional[int] = None,
+        enabled: bool = True,
+        batch: Optional[Batch] = None,
+        group: Optional[Group] = None,
+    ):
+        """Create a ``Table``.
+
+        Either ``columns`` or ``provider`` should be given.
+
+        Args:
+            toplevel:
+                Window or container this table belongs to.
+            headers:
+                Titles of columns.
+            x:
+                X coordinate of the table.
+            y:
+                Y coordinate of the table.
+            width:
+                Width of the table.
+            height:
+                Height of the table.
+            columns:
+                A sequence of values per column, e.g. lists, :py:class:`array.array`
+                or NumPy arrays, which all have the same length.
+            provider:
+                Function to get the values of a row by its index, used without
+                ``columns``. Tables of rows given by it can't be sorted or filtered.
+            row_count:
+                The number of rows given by ``provider``.
+            column_widths:
+                Widths of columns, the width is divided equally if not given.
+            row_height:
+                Height of a row, including the header.
+            font_name:
+                Font family name(s) for text.
+            font_size:
+                Font size for text.
+            enabled:
+                Whether allow user input.
+            batch:
+                Optional batch to add the table to.
+            group:
+                Optional parent group of the table.
+
+        Raises:
+            ValueError: Neither or both of ``columns`` and ``provider`` are given, or
+                the number of columns doesn't match ``headers``.
+        """
+        if (columns is None) == (provider is None):
+            raise ValueError("either columns or provider should be given")
+        if columns is not None:
+            if len(columns) != len(headers):
+                raise ValueError("the number of columns doesn't match headers")
+            row_count = len(columns[0]) if columns else 0
+        super().__init__(
+            toplevel, x, y, width, height, enabled=enabled, batch=batch, group=group
+        )
+        self._headers = tuple(headers)
+        self._columns = None if columns is None else list(columns)
+        self._provider = provider
+        self._row_count = row_count
+        if column_widths is None:
+            column_widths = [width // max(1, len(headers))] * len(headers)
+        self._column_widths = tuple(column_widths)
+        self._row_height = row_height
+        self._font = font_name, font_size
+        self._top = 0
+        # NumPy arrays of columns, created when they are sorted or filtered.
+        self._arrays: dict[int, Any] = {}
+        # column -> (indices of rows in ascending order, sorted values)
+        self._sorted: dict[int, tuple[Any, Any]] = {}
+        self._sort_column: Optional[int] = None
+        self._descending = False
+        # (column, function) and the mask of rows it keeps.
+        self._filter: Optional[tuple[int, Callable[[Any], Any]]] = None
+        self._mask = None
+        # Indices of rows in view order, `None` means all rows in their order.
+        self._view = None
+        self._header_labels = [
+            self._create_label(text, header_color, bold=True) for text in headers
+        ]
+        self._cells: list[list[Label]] = []
+        # Row in view order which every slot of cells shows, -1 for nothing.
+        self._slot_rows: list[int] = []
+        self._update_pool()
+
+    @property
+    def headers(self) -> tuple[str, ...]:
+        """Titles of columns."""
+        return self._headers
+
+    @property
+    def row_count(self) -> int:
+        """The number of rows."""
+        return self._row_count
+
+    @property
+    def view_count(self) -> int:
+        """The number of rows which pass the filter."""
+        return self._row_count if self._view is None else len(self._view)
+
+    @property
+    def top_row(self) -> int:
+        """Position of the first row in view, among rows which pass the filter."""
+        return self._top
+
+    @top_row.setter
+    def top_row(self, top: int):
+        top = max(0, min(top, self.view_count - len(self._cells) + 1))
+        if top != self._top:
+            self._top = top
+            self._refresh()
+
+    @property
+    def sort_column(self) -> Optional[int]:
+        """The column rows are sorted by, ``None`` if they are in their own order."""
+        return self._sort_column
+
+    @property
+    def descending(self) -> bool:
+        """Whether rows are sorted in descending order."""
+        return self._descending
+
+    def row_index(self, position: int) -> int:
+        """Index of the row at a position of the view.
+
+        Args:
+            position:
+                Position among rows which pass the filter, in their sorted order.
+        """
+        if self._view is None:
+            return position
+        if self._descending:
+            return int(self._view[len(self._view) - 1 - position])
+        return int(self._view[position])
+
+    def row(self, index: int) -> tuple[Any, ...]:
+        """Values of a row.
+
+        Args:
+            index:
+                Index of the row in the data.
+        """
+        if self._provider is not None:
+            return tuple(self._provider(index))
+        return tuple(column[index] for column in self._columns)
+
+    def sort(self, column: Optional[int], descending: bool = False):
+        """Sort rows by a column, the sort is stable.
+
+        Args:
+            column:
+                Index of the column, ``None`` to show rows in their own order.
+            descending:
+                Whether to sort in descending order.
+
+        Raises:
+            ValueError: The rows are given by a provider.
+        """
+        if column is not None and self._columns is None:
+            raise ValueError("tables of a provider can't be sorted")
+        self._sort_column = column
+        self._descending = descending and column is not None
+        self._update_view()
+
+    def filter(self, column: Optional[int], function: Callable[[Any], Any] = None):
+        """Only show rows whose values of a column pass a test.
+
+        Args:
+            column:
+                Index of the column, ``None`` to show all rows.
+            function:
+                Function given the column as a NumPy array, which returns a boolean
+                mask of rows to show, e.g. ``lambda latency: latency > 100``.
+
+        Raises:
+            ValueError: The rows are given by a provider.
+        """
+        if column is None:
+            self._filter = self._mask = None
+        else:
+            if self._columns is None:
+                raise ValueError("tables of a provider can't be filtered")
+            self._filter = column, function
+            np = _numpy()
+            self._mask = np.asarray(function(self._array(column)), dtype=bool)
+        self._update_view()
+
+    def append(self, *columns: Sequence[Any], count: int = 0):
+        """Add rows to the end.
+
+        Cached sort indices and the filter mask are updated for the new rows only.
+
+        Args:
+            columns:
+                Values of the new rows per column, like ``columns`` of the table.
+            count:
+                The number of new rows given by the provider, used without
+                ``columns``.
+
+        Raises:
+            ValueError: The number of columns doesn't match headers.
+        """
+        if self._columns is None:
+            self._row_count += count
+            self._update_view()
+            return
+        if len(columns) != len(self._columns):
+            raise ValueError("the number of columns doesn't match headers")
+        old_count = self._row_count
+        for i, new_values in enumerate(columns):
+            column = self._columns[i]
+            if hasattr(column, "extend"):
+                column.extend(new_values)
+            else:
+                self._columns[i] = _numpy().concatenate([column, new_values])
+        self._row_count = len(self._columns[0]) if self._columns else 0
+        if self._arrays or self._sorted or self._mask is not None:
+            self._merge_new_rows(old_count)
+        self._update_view()
+
+    def _array(self, column: int):
+        """The NumPy array of a column, which is created once."""
+        array = self._arrays.get(column)
+        if array is None:
+            np = _numpy()
+            values = self._columns[column]
+            # A view of an `array.array` would stop it from being extended.
+            if not isinstance(values, np.ndarray):
+                values = np.array(values)
+            array = self._arrays[column] = values
+        return array
+
+    def _merge_new_rows(self, old_count: int):
+        np = _numpy()
+        for column, array in list(self._arrays.items()):
+            new_values = np.asarray(self._columns[column][old_count:])
+            self._arrays[column] = np.concatenate([array, new_values])
+        for column, (indices, values) in list(self._sorted.items()):
+            new_values = self._arrays[column][old_count:]
+            order = np.argsort(new_values, kind="stable")
+            new_sorted = new_values[order]
+            # Rows equal to old ones go after them to keep the sort stable.
+            positions = np.searchsorted(values, new_sorted, side="right")
+            self._sorted[column] = (
+                np.insert(indices, positions, order + old_count),
+                np.insert(values, positions, new_sorted),
+            )
+        if self._mask is not None:
+            column, function = self._filter
+            new_values = self._arrays[column][old_count:]
+            new_mask = np.asarray(function(new_values), dtype=bool)
+            self._mask = np.concatenate([self._mask, new_mask])
+
+    def _update_view(self):
+        """Compute indices of rows in view order from the sort and the filter."""
+        if self._sort_column is None and self._mask is None:
+            self._view = None
+        else:
+            np = _numpy()
+            if self._sort_column is None:
+                self._view = np.flatnonzero(self._mask)
+            else:
+                cached = self._sorted.get(self._sort_column)
+                if cached is None:
+                    array = self._array(self._sort_column)
+                    indices = np.argsort(array, kind="stable")
+                    cached = self._sorted[self._sort_column] = indices, array[indices]
+                indices = cached[0]
+                self._view = (
+                    indices if self._mask is None else indices[self._mask[indices]]
+                )
+        self._top = max(0, min(self._top, self.view_count - len(self._cells) + 1))
+        self._slot_rows = [-1] * len(self._cells)
+        self._refresh()
+
+    def _create_label(self, text: str, color: tuple, bold: bool = False) -> Label:
+        return Label(
+            text,
+            font_name=self._font[0],
+            font_size=self._font[1],
+            bold=bold,
+            color=color,
+            anchor_y="center",
+            batch=self._batch,
+            group=self._group,
+        )
+
+    def _update_pool(self):
+        """Create or drop cells to fill the height, then lay them out."""
+        slots = max(0, -(-(self._height - self._row_height) // self._row_height) + 1)
+        while len(self._cells) < slots:
+            self._cells.append(
+                [self._create_label("", text_color) for _ in self._headers]
+            )
+        while len(self._cells) > slots:
+            for label in self._cells.pop():
+                label.delete()
+        self._slot_rows = [-1] * len(self._cells)
+        x = 0
+        top = self._height - self._row_height // 2
+        for label, width in zip(self._header_labels, self._column_widths):
+            label.position = (x + cell_padding, top, 0)
+            x += width
+        self._refresh()
+
+    def _refresh(self):
+        """Show rows from :py:attr:`top_row`, only slots showing other rows change."""
+        pool = len(self._cells)
+        count = self.view_count
+        top = self._height - self._row_height // 2 - self._row_height
+        for position in range(self._top, self._top + pool):
+            slot = position % pool
+            labels = self._cells[slot]
+            if self._slot_rows[slot] != position:
+                self._slot_rows[slot] = position
+                if position < count:
+                    values = self.row(self.row_index(position))
+                else:
+                    values = ("",) * len(labels)
+                for label, value in zip(labels, values):
+                    text = str(value)
+                    if label.text != text:
+                        label.text = text
+            y = top - (position - self._top) * self._row_height
+            x = 0
+            for label, width in zip(labels, self._column_widths):
+                if label.y != y or label.x != x + cell_padding:
+                    label.position = (x + cell_padding, y, 0)
+                x += width
+
+    def _labels(self) -> list[Label]:
+        labels = list(self._header_labels)
+        for row in self._cells:
+            labels.extend(row)
+        return labels
+
+    def _update_batch(self):
+        super()._update_batch()
+        batch = self._batch
+        for label in self._labels():
+            if batch is None or label._own_batch or label._batch is batch:
+                label.batch = batch
+            else:
+                migrate_vertex_lists(label._vertex_lists, label._batch, batch)
+                label._batch = batch
+
+    def _dispose(self):
+        super()._dispose()
+        for label in self._labels():
+            label.delete()
+        self._header_labels = []
+        self._cells = []
+
+    def _update_group(self):
+        super()._update_group()
+        for label in self._labels():
+            label.group = self._group
+
+    def _update_position(self):
+        super()._update_position()
+        self._update_pool()
+
+    def _state(self) -> tuple:
+        return super()._state() + (self._top, self._sort_column, self._descending)
+
+    def on_mouse_press(self, x: int, y: int, buttons: int, modifiers: int):
+        super().on_mouse_press(x, y, buttons, modifiers)
+        if not self._enabled or self._check_hit(x, y) < 0 or not buttons & mouse.LEFT:
+            return
+        x, y = x - self._x, y - self._y
+        if y >= self._height - self._row_height:
+            column = self._column_at(x)
+            if column is None or self._columns is None:
+                return
+            if self._sort_column == column and not self._descending:
+                self.sort(column, descending=True)
+            else:
+                self.sort(column)
+            return
+        position = self._top + int(
+            (self._height - self._row_height - y) // self._row_height
+        )
+        if position < self.view_count:
+            self.dispatch_event("on_row_click", self.row_index(position))
+
+    def on_mouse_scroll(self, x: int, y: int, scroll_x: int, scroll_y: int):
+        super().on_mouse_scroll(x, y, scroll_x, scroll_y)
+        if not self._enabled or self._check_hit(x, y) < 0:
+            return
+        self.top_row = self._top - 3 * int(scroll_y)
+
+    def _column_at(self, x: int) -> Optional[int]:
+        left = 0
+        for column, width in enumerate(self._column_widths):
+            if left <= x < left + width:
+                return column
+            left += width
+        return None
+
+    if is_sphinx_run:
+
+        def on_row_click(self, index: int):
+            """A row is clicked.
+
+            Args:
+                index:
+                    Index of the row in the data.
+            """
+            pass
+
+
+Table.register_event_type("on_row_click")
+
+
+__all__ = ("Table",)
@@ -0,0 +1,382 @@
+"""A widget to show streamed frames.
+
+:py:class:`ImageView` shows frames of a camera, a video or a simulation in a texture which
+lives as long as the widget. Frames are given as ``bytes``, ``memoryview`` or NumPy arrays
+and are not copied until they are uploaded, through a ring of pixel buffer objects, with
+``glTexSubImage2D``::
+
+    view = ImageView((640, 480), 10, 10, 320, 240, top_down=True, batch=batch)
+
+    def worker():
+        while True:
+            view.submit(camera.read())
+
+Frames are uploaded right before the widget is drawn, and a frame which is still pending
+when a newer whole frame arrives is dropped, so a producer outrunning the display costs
+nothing but the frames it produces.
+"""
+
+import ctypes
+import threading
+from typing import Any, Optional
+from weakref import ref
+
+from pyglet.gl import (
+    GL_BGRA,
+    GL_LINEAR,
+    GL_MAP_INVALIDATE_BUFFER_BIT,
+    GL_MAP_WRITE_BIT,
+    GL_PIXEL_UNPACK_BUFFER,
+    GL_RGB,
+    GL_RGBA,
+    GL_RGBA8,
+    GL_STREAM_DRAW,
+    GL_TEXTURE0,
+    GL_TEXTURE_2D,
+    GL_UNPACK_ALIGNMENT,
+    GL_UNSIGNED_BYTE,
+    glActiveTexture,
+    glBindBuffer,
+    glBindTexture,
+    glBufferData,
+    glMapBufferRange,
+    glPixelStorei,
+    glTexSubImage2D,
+    glUnmapBuffer,
+)
+from pyglet.graphics import Batch, Group
+from pyglet.graphics.vertexbuffer import BufferObject
+from pyglet.image import Texture
+from pyglet.sprite import Sprite, SpriteGroup
+
+from goldenui.widget.base import WidgetBase, _get_detached_batch
+
+#: Pixel formats of frames, as ``format -> (GL format, bytes per pixel)``.
+pixel_formats = {
+    "RGBA": (GL_RGBA, 4),
+    "BGRA": (GL_BGRA, 4),
+    "RGB": (GL_RGB, 3),
+}
+
+
+class _FrameGroup(SpriteGroup):
+    """A sprite group which uploads pending frames before binding the texture."""
+
+    def __init__(self, view: "ImageView", *args):
+        super().__init__(*args)
+        # The batch may keep an empty group until it is drawn again.
+        self.view = ref(view)
+
+    def set_state(self):
+        view = self.view()
+        if view is not None:
+            view.upload()
+        super().set_state()
+
+    # Every view has its own group, which is compared by identity since the hash of a
+    # sprite group changes when its texture is deleted.
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+
+class _FrameSprite(Sprite):
+    def __init__(self, view: "ImageView", *args, **kwargs):
+        self._view = view
+        super().__init__(*args, **kwargs)
+
+    def get_sprite_group(self) -> SpriteGroup:
+        return _FrameGroup(
+            self._view,
+            self._texture,
+            self._blend_src,
+            self._blend_dest,
+            self._program,
+            self._user_group,
+        )
+
+
+class ImageView(WidgetBase):
+    """A widget which shows frames streamed into a persistent texture.
+
+    Rows of a frame go from bottom to top as OpenGL stores them, unless ``top_down`` is
+    given. The frame is stretched to the size of the widget.
+    """
+
+    __slots__ = (
+        "_frame_size",
+        "_format",
+        "_top_down",
+        "_texture",
+        "_sprite",
+        "_lock",
+        "_pending",
+        "_pbos",
+        "_next_pbo",
+        "_submitted",
+        "_uploaded",
+        "_dropped",
+        "_uploaded_bytes",
+    )
+
+    def __init__(
+        self,
+        frame_size: tuple[int, int],
+        x: int = 0,
+        y: int = 0,
+        width: int = 0,
+        height: int = 0,
+        *,
+        format: str = "RGBA",
+        top_down: bool = False,
+        pbo_count: int = 2,
+        enabled: bool = True,
+        batch: Optional[Batch] = None,
+        group: Optional[Group] = None,
+    ):
+        """Create an ``ImageView``.
+
+        Args:
+            frame_size:
+                The ``(width, height)`` of frames.
+            x:
+                X coordinate of the widget.
+            y:
+                Y coordinate of the widget.
+            width:
+                Width of the widget, the width of frames if it is ``0``.
+            height:
+                Height of the widget, the height of frames if it is ``0``.
+            format:
+                Pixel format of frames, one of :py:data:`pixel_formats`.
+            top_down:
+                Whether rows of frames go from top to bottom, like most cameras and
+                image libraries store them.
+            pbo_count:
+                Number of pixel buffer objects frames are uploaded through in turn, so
+                that filling one doesn't wait for the GPU to read the previous one.
+            enabled:
+                Whether allow user input.
+            batch:
+                Optional batch to add the widget to.
+            group:
+                Optional parent group of the widget.
+
+        Raises:
+            ValueError: The format is unknown or ``pbo_count`` is less than 1.
+        """
+        if format not in pixel_formats:
+            raise ValueError(f"unknown pixel format {format!r}")
+        if pbo_count < 1:
+            raise ValueError("pbo_count should be at least 1")
+        frame_width, frame_height = frame_size
+        super().__init__(
+            x,
+            y,
+            width or frame_width,
+            height or frame_height,
+            enabled=enabled,
+            batch=batch,
+            group=group,
+        )
+        self._frame_size = frame_width, frame_height
+        self._format = format
+        self._top_down = top_down
+        self._texture = Texture.create(
+            frame_width,
+            frame_height,
+            internalformat=GL_RGBA8,
+            min_filter=GL_LINEAR,
+            mag_filter=GL_LINEAR,
+        )
+        # Every view has its own group, which would stay in the default batch of pyglet
+        # forever, so the sprite lives in the detached batch until it gets a batch.
+        self._sprite = _FrameSprite(
+            self, self._texture, batch=batch or _get_detached_batch(), group=group
+        )
+        self._lock = threading.Lock()
+        # rect -> frame, `None` is the whole frame which always goes first.
+        self._pending: dict[Optional[tuple[int, int, int, int]], memoryview] = {}
+        # Buffer objects free themselves if the view is collected without being disposed.
+        capacity = frame_width * frame_height * pixel_formats[format][1]
+        self._pbos = [BufferObject(capacity, GL_STREAM_DRAW) for _ in range(pbo_count)]
+        self._next_pbo = 0
+        self._submitted = 0
+        self._uploaded = 0
+        self._dropped = 0
+        self._uploaded_bytes = 0
+        self._update_position()
+
+    @property
+    def frame_size(self) -> tuple[int, int]:
+        """The ``(width, height)`` of frames."""
+        return self._frame_size
+
+    @property
+    def format(self) -> str:
+        """Pixel format of frames."""
+        return self._format
+
+    @property
+    def texture(self) -> Texture:
+        """The texture frames are uploaded to."""
+        return self._texture
+
+    @property
+    def pending(self) -> int:
+        """The number of frames and rectangles waiting to be uploaded."""
+        return len(self._pending)
+
+    def submit(
+        self, data: Any, rect: Optional[tuple[int, int, int, int]] = None
+    ) -> bool:
+        """Queue a frame to be uploaded before the widget is drawn next time.
+
+        Safe to call from any thread. The data isn't copied, so it shouldn't be changed
+        until the frame is uploaded, or the newer pixels are shown. Pending frames and
+        rectangles are dropped when a whole frame is submitted, and a pending rectangle
+        is dropped when the same rectangle is submitted again.
+
+        Args:
+            data:
+                Tightly packed pixels, e.g. ``bytes``, a ``memoryview`` or a
+                C-contiguous NumPy array of ``uint8``.
+            rect:
+                The ``(x, y, width, height)`` of pixels to update, in frame pixels, the
+                whole frame if not given. ``y`` counts rows in the same direction as
+                the frame stores them.
+
+        Returns:
+            ``False`` if the submission dropped a pending frame or rectangle.
+
+        Raises:
+            ValueError: The rectangle is outside the frame, or the size of the data
+                doesn't match it.
+        """
+        frame_width, frame_height = self._frame_size
+        x, y, width, height = rect or (0, 0, frame_width, frame_height)
+        if x < 0 or y < 0 or x + width > frame_width or y + height > frame_height:
+            raise ValueError("rect is outside the frame")
+        pixels = memoryview(data)
+        if not pixels.c_contiguous:
+            raise ValueError("frame data should be contiguous")
+        pixels = pixels.cast("B")
+        if pixels.nbytes != width * height * pixel_formats[self._format][1]:
+            raise ValueError("size of frame data doesn't match the rect")
+        if rect is not None and (width, height) == self._frame_size:
+            rect = None
+        with self._lock:
+            self._submitted += 1
+            dropped = len(self._pending) if rect is None else int(rect in self._pending)
+            if rect is None:
+                self._pending.clear()
+            else:
+                # Rectangles are uploaded in the order they were last submitted.
+                self._pending.pop(rect, None)
+            self._pending[rect] = pixels
+            self._dropped += dropped
+        return not dropped
+
+    def upload(self) -> int:
+        """Upload pending frames. Call it on the main thread.
+
+        It is called when the widget is drawn, call it yourself only if the texture is
+        used elsewhere.
+
+        Returns:
+            The number of uploaded frames and rectangles.
+        """
+        if not self._pending:
+            return 0
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        gl_format, pixel_bytes = pixel_formats[self._format]
+        frame_width, frame_height = self._frame_size
+        capacity = frame_width * frame_height * pixel_bytes
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, self._texture.id)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        for rect, pixels in pending.items():
+            x, y, width, height = rect or (0, 0, frame_width, frame_height)
+            size = pixels.nbytes
+            self._pbos[self._next_pbo].bind(GL_PIXEL_UNPACK_BUFFER)
+            self._next_pbo = (self._next_pbo + 1) % len(self._pbos)
+            # Orphan the old storage, so that the GPU may still read it meanwhile.
+            glBufferData(GL_PIXEL_UNPACK_BUFFER, capacity, None, GL_STREAM_DRAW)
+            pointer = glMapBufferRange(
+                GL_PIXEL_UNPACK_BUFFER,
+                0,
+                size,
+                GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT,
+            )
+            mapped = (ctypes.c_ubyte * size).from_address(pointer)
+            memoryview(mapped).cast("B")[:] = pixels
+            glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER)
+            # With a buffer bound, the last argument is an offset into it.
+            glTexSubImage2D(
+                GL_TEXTURE_2D, 0, x, y, width, height, gl_format, GL_UNSIGNED_BYTE, 0
+            )
+            self._uploaded_bytes += size
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 4)
+        self._uploaded += len(pending)
+        return len(pending)
+
+    def stats(self) -> dict[str, int]:
+        """Counters of the widget.
+
+        Returns:
+            A dict with keys ``pending``, ``submitted``, ``uploaded``, ``dropped`` (frames
+            replaced by newer ones before being uploaded) and ``bytes`` (uploaded bytes).
+        """
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "submitted": self._submitted,
+                "uploaded": self._uploaded,
+                "dropped": self._dropped,
+                "bytes": self._uploaded_bytes,
+            }
+
+    def _dispose(self):
+        with self._lock:
+            self._dropped += len(self._pending)
+            self._pending.clear()
+        self._sprite.delete()
+        self._texture.delete()
+        for pbo in self._pbos:
+            pbo.delete()
+
+    def _update_batch(self):
+        old_batch = self._sprite.batch
+        self._sprite.batch = self._batch or _get_detached_batch()
+        if self._sprite.batch is not old_batch:
+            # Drop the group of the view from the old batch when it is drawn or pruned.
+            old_batch.invalidate()
+
+    def _update_group(self):
+        self._sprite.group = self._parent_group
+        self._sprite.batch.invalidate()
+
+    def _update_position(self):
+        frame_width, frame_height = self._frame_size
+        scale_y = self._height / frame_height
+        if self._top_down:
+            self._sprite.update(
+                x=self._x,
+                y=self._y + self._height,
+                scale_x=self._width / frame_width,
+                scale_y=-scale_y,
+            )
+        else:
+            self._sprite.update(
+                x=self._x,
+                y=self._y,
+                scale_x=self._width / frame_width,
+                scale_y=scale_y,
+            )
+
+    def _state(self) -> tuple:
+        return super()._state() + (self._frame_size, self._uploaded)
+
+
+__all__ = "ImageView", "pixel_formats"
@@ -0,0 +1,219 @@
+"""A widget to show performance data.
+
+:py:class:`PerfOverlay` shows what :py:class:`~goldenui.profiler.Profiler` collects, so
+that a misbehaving screen can be spotted without attaching a profiler.
+"""
+
+from collections import deque
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Optional
+
+from pyglet.gl import GL_LINES
+from pyglet.graphics import Batch, ShaderGroup
+from pyglet.shapes import Rectangle, get_default_shader
+from pyglet.text import Label
+
+from goldenui.group import get_group
+from goldenui.profiler import batch_stats
+from goldenui.widget.base import WidgetBase
+
+if TYPE_CHECKING:
+    from goldenui.manager import GUIManager
+
+background_color = (0, 0, 0, 160)
+text_color = (255, 255, 255, 255)
+sparkline_color = (80, 220, 80, 255)
+sparkline_height = 32
+
+
+class PerfOverlay(WidgetBase):
+    """A widget which shows frame time, event rate and batch statistics.
+
+    The overlay enables :py:attr:`~goldenui.manager.GUIManager.profiling` and draws
+    itself right after the manager draws a frame. It is rendered from its own batch, which
+    is only rebuilt every ``interval`` seconds, so it doesn't perturb what it measures.
+    There is no need to add it to the manager. Set :py:attr:`.visible` to hide it.
+    """
+
+    __slots__ = (
+        "_watched",
+        "_interval",
+        "_frame_times",
+        "_last_frame",
+        "_last_refresh",
+        "_last_events",
+        "_overlay_batch",
+        "_background",
+        "_label",
+        "_sparkline",
+    )
+
+    def __init__(
+        self,
+        manager: "GUIManager",
+        x: int = 0,
+        y: int = 0,
+        width: int = 220,
+        height: int = 156,
+        *,
+        interval: float = 0.25,
+        samples: int = 120,
+        enabled: bool = True,
+        font_name: Optional[str] = None,
+        font_size: Optional[int] = 9,
+    ):
+        """Create a ``PerfOverlay``.
+
+        Args:
+            manager:
+                The manager to watch.
+            x:
+                X coordinate of the overlay.
+            y:
+                Y coordinate of the overlay.
+            width:
+                Width of the overlay.
+            height:
+                Height of the overlay.
+            interval:
+                Seconds between two refreshes of the text and the sparkline.
+            samples:
+                Number of frame times shown by the sparkline.
+            enabled:
+                Whether allow user input.
+            font_name:
+                Font family name(s) for text.
+            font_size:
+                Font size for text.
+        """
+        super().__init__(x, y, width, height, enabled=enabled)
+        self._watched = manager
+        self._interval = interval
+        self._frame_times: deque[float] = deque(maxlen=samples)
+        self._last_frame = None
+        self._last_refresh = perf_counter()
+        self._last_events = self._count_events(manager.profiler.stats())
+
+        self._overlay_batch = Batch()
+        self._background = Rectangle(
+            x,
+            y,
+            width,
+            height,
+            color=background_color,
+            batch=self._overlay_batch,
+            group=get_group(order=0),
+        )
+        self._label = Label(
+            "",
+            x=x + 4,
+            y=y + height - 4,
+            width=width - 8,
+            color=text_color,
+            anchor_y="top",
+            multiline=True,
+            font_name=font_name,
+            font_size=font_size,
+            batch=self._overlay_batch,
+            group=get_group(order=1),
+        )
+        program = get_default_shader()
+        count = 2 * (samples - 1)
+        self._sparkline = program.vertex_list(
+            count,
+            GL_LINES,
+            batch=self._overlay_batch,
+            group=ShaderGroup(program, order=2),
+            position=("f", (0.0, 0.0) * count),
+            translation=("f", (0.0, 0.0) * count),
+            colors=("Bn", sparkline_color * count),
+        )
+
+        manager.profiling = True
+        manager.profiler.push_handlers(on_stats=self._on_stats)
+
+    @staticmethod
+    def _count_events(stats: dict[str, Any]) -> tuple[int, int]:
+        events = visited = 0
+        for record in stats["events"].values():
+            events += record["count"]
+            visited += record["visited"]
+        return events, visited
+
+    def _on_stats(self, stats: dict[str, Any]):
+        now = perf_counter()
+        if self._last_frame is not None:
+            self._frame_times.append(now - self._last_frame)
+        self._last_frame = now
+        if not self._visible:
+            return
+        if now - self._last_refresh >= self._interval:
+            self._refresh(stats, now - self._last_refresh)
+            self._last_refresh = now
+        self._overlay_batch.draw()
+
+    def _refresh(self, stats: dict[str, Any], elapsed: float):
+        events, visited = self._count_events(stats)
+        new_events = events - self._last_events[0]
+        new_visited = visited - self._last_events[1]
+        self._last_events = events, visited
+        frame_time = 0.0
+        if self._frame_times:
+            frame_time = sum(self._frame_times) / len(self._frame_times)
+        batch = batch_stats(self._watched._batch)
+        self._label.text = "\n".join(
+            [
+                f"frame: {frame_time * 1000:.2f} ms",
+                f"draw: {stats['draw']['last_time'] * 1000:.2f} ms",
+                f"uploads: {stats['draw']['last_uploads']}"
+                f"  ({stats['draw']['last_upload_bytes'] / 1024:.1f} KiB)",
+                f"events: {new_events / elapsed:.0f}/s",
+                f"visited/event: {new_visited / max(new_events, 1):.1f}",
+                f"groups: {batch['groups']}  draw list: {batch['draw_list']}",
+                f"draw calls: {batch['draw_calls']}",
+                f"vertices: {batch['vertices']}",
+                f"texture binds: {batch['texture_binds']}",
+                f"container switches: {batch['container_switches']}",
+            ]
+        )
+        self._update_sparkline()
+
+    def _update_sparkline(self):
+        times = list(self._frame_times)
+        count = self._frame_times.maxlen
+        if len(times) < 2:
+            self._sparkline.position[:] = (0.0, 0.0) * (2 * (count - 1))
+            return
+        peak = max(max(times), 1 / 30)
+        step = self._width / (count - 1)
+        offset = count - len(times)
+        points = [
+            (
+                self._x + (offset + i) * step,
+                self._y + 2 + t / peak * (sparkline_height - 4),
+            )
+            for i, t in enumerate(times)
+        ]
+        vertices = []
+        for start, end in zip(points, points[1:]):
+            vertices.extend(start)
+            vertices.extend(end)
+        vertices.extend((0.0, 0.0) * (2 * (count - 1) - len(vertices) // 2))
+        self._sparkline.position[:] = vertices
+
+    def _dispose(self):
+        self._watched.profiler.remove_handlers(on_stats=self._on_stats)
+        self._background.delete()
+        self._label.delete()
+        self._sparkline.delete()
+
+    def _update_position(self):
+        self._background.position = self._x, self._y
+        self._background.width = self._width
+        self._background.height = self._height
+        self._label.position = (self._x + 4, self._y + self._height - 4, 0)
+        self._label.width = self._width - 8
+        self._update_sparkline()
+
+
+__all__ = ("PerfOverlay",)
@@ -0,0 +1,388 @@
+"""A widget to plot live samples.
+
+:py:class:`Plot` draws line charts of one or more series, which are fed a sample at a
+time, e.g. readings of sensors at kHz rates::
+
+    plot = Plot(10, 10, 300, 80, series=2, history=5000, y_range=(-1.0, 1.0))
+    plot.append(left, right)
+
+Samples are kept in a ring buffer of vertices on the GPU. Each pixel column of the plot
+is a vertical line from the minimum to the maximum of the samples in it, so a sample only
+rewrites the vertices of its column, and the plot scrolls by changing a uniform instead of
+moving vertices. All series of a plot are drawn by one draw call.
+"""
+
+from collections.abc import Iterable, Sequence
+from math import ceil
+from typing import Optional
+from weakref import ref
+
+from pyglet.gl import (
+    GL_BLEND,
+    GL_LINES,
+    GL_ONE_MINUS_SRC_ALPHA,
+    GL_SRC_ALPHA,
+    current_context,
+    glBlendFunc,
+    glDisable,
+    glEnable,
+)
+from pyglet.graphics import Batch, Group
+from pyglet.graphics.shader import ShaderProgram
+
+from goldenui.widget.base import WidgetBase, _get_detached_batch
+
+#: Colors of series, used in turn when colors aren't given.
+default_colors = (
+    (80, 220, 80, 255),
+    (240, 200, 60, 255),
+    (90, 160, 255, 255),
+    (240, 90, 90, 255),
+)
+
+vertex_source = """#version 150 core
+in float column;
+in float value;
+in vec4 colors;
+
+out vec4 vertex_colors;
+
+uniform WindowBlock
+{
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform vec2 origin;
+uniform vec2 size;
+uniform vec2 y_range;
+uniform float columns;
+uniform float head;
+uniform float filled;
+
+void main()
+{
+    // Columns are numbered by their slot in the ring, plus 0.5 for the maximum.
+    float slot = floor(column);
+    float age = mod(head - slot + columns, columns);
+    float x = origin.x + size.x - (age + 0.5) * size.x / columns;
+    float y = origin.y + (value - y_range.x) / (y_range.y - y_range.x) * size.y;
+    // Stretch every column by half a pixel, so that a flat line is still drawn.
+    y = clamp(y + (column > slot ? 0.5 : -0.5), origin.y, origin.y + size.y);
+    gl_Position = window.projection * window.view * vec4(x, y, 0.0, 1.0);
+    if (age >= filled) {
+        // Columns without samples yet are moved out of the clip space.
+        gl_Position = vec4(2.0, 2.0, 0.0, 1.0);
+    }
+    vertex_colors = colors;
+}
+"""
+
+fragment_source = """#version 150 core
+in vec4 vertex_colors;
+out vec4 final_color;
+
+void main()
+{
+    final_color = vertex_colors;
+}
+"""
+
+
+def get_plot_shader() -> ShaderProgram:
+    """The shader program of plots, which is created once per context."""
+    return current_context.create_program(
+        (vertex_source, "vertex"), (fragment_source, "fragment")
+    )
+
+
+class _PlotGroup(Group):
+    """A group setting the uniforms of a plot, so every plot has its own."""
+
+    def __init__(self, plot: "Plot", program: ShaderProgram, parent: Optional[Group]):
+        super().__init__(parent=parent)
+        # The batch may keep an empty group until it is drawn again.
+        self.plot = ref(plot)
+        self.program = program
+
+    def set_state(self):
+        self.program.use()
+        plot = self.plot()
+        if plot is None:
+            return
+        self.program["origin"] = plot._x, plot._y
+        self.program["size"] = plot._width, plot._height
+        self.program["y_range"] = plot._y_range
+        self.program["columns"] = plot._columns
+        self.program["head"] = plot._head
+        self.program["filled"] = plot._filled
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+    def unset_state(self):
+        glDisable(GL_BLEND)
+        self.program.stop()
+
+    # Every plot has its own uniforms, so groups are compared by identity instead of
+    # by order and parent like other groups.
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+
+class Plot(WidgetBase):
+    """A widget which plots series of samples, newest on the right.
+
+    The plot shows the last ``history`` samples of every series. When they are more than
+    the width of the plot in pixels, samples are decimated: each pixel column shows the
+    minimum and the maximum of several samples, so peaks are never lost.
+    """
+
+    __slots__ = (
+        "_series",
+        "_history",
+        "_columns",
+        "_per_column",
+        "_y_range",
+        "_colors",
+        "_group",
+        "_vertex_list",
+        "_list_batch",
+        "_head",
+        "_filled",
+        "_in_column",
+        "_low",
+        "_high",
+        "_last",
+        "_count",
+    )
+
+    def __init__(
+        self,
+        x: int = 0,
+        y: int = 0,
+        width: int = 0,
+        height: int = 0,
+        *,
+        series: int = 1,
+        history: Optional[int] = None,
+        y_range: tuple[float, float] = (0.0, 1.0),
+        colors: Optional[Sequence[tuple[int, int, int, int]]] = None,
+        enabled: bool = True,
+        batch: Optional[Batch] = None,
+        group: Optional[Group] = None,
+    ):
+        """Create a ``Plot``.
+
+        Args:
+            x:
+                X coordinate of the plot.
+            y:
+                Y coordinate of the plot.
+            width:
+                Width of the plot.
+            height:
+                Height of the plot.
+            series:
+                The number of series.
+            history:
+                The number of samples shown of every series, the width if not given.
+            y_range:
+                Values at the bottom and the top of the plot.
+            colors:
+                RGBA colors of series.
+            enabled:
+                Whether allow user input.
+            batch:
+                Optional batch to add the plot to.
+            group:
+                Optional parent group of the plot.
+
+        Raises:
+            ValueError: ``series`` or ``history`` is less than 1, or there are fewer
+                colors than series.
+        """
+        history = width if history is None else history
+        if series < 1 or history < 1:
+            raise ValueError("series and history should be at least 1")
+        if colors is None:
+            colors = [default_colors[i % len(default_colors)] for i in range(series)]
+        if len(colors) < series:
+            raise ValueError("there are fewer colors than series")
+        super().__init__(x, y, width, height, enabled=enabled, batch=batch, group=group)
+        self._series = series
+        self._history = history
+        self._columns = max(1, min(history, width))
+        self._per_column = ceil(history / self._columns)
+        self._y_range = tuple(y_range)
+        self._colors = tuple(colors[:series])
+        self._group = _PlotGroup(self, get_plot_shader(), group)
+        # Every plot has its own group, which would stay in the default batch of pyglet
+        # forever, so the vertex list lives in the detached batch until it gets a batch.
+        self._list_batch = self._batch or _get_detached_batch()
+        self._create_vertex_list()
+        self._reset()
+
+    def _create_vertex_list(self):
+        count = 2 * self._series * self._columns
+        columns = []
+        for column in range(self._columns):
+            columns.extend((column, column + 0.5) * self._series)
+        colors = []
+        for color in self._colors:
+            colors.extend(color * 2)
+        self._vertex_list = self._group.program.vertex_list(
+            count,
+            GL_LINES,
+            self._list_batch,
+            self._group,
+            column=("f", columns),
+            value=("f", (0.0,) * count),
+            colors=("Bn", colors * self._columns),
+        )
+
+    def _reset(self):
+        self._head = 0
+        self._filled = 0
+        self._in_column = 0
+        self._count = 0
+        self._low = [0.0] * self._series
+        self._high = [0.0] * self._series
+        self._last: Optional[list[float]] = None
+
+    @property
+    def series(self) -> int:
+        """The number of series."""
+        return self._series
+
+    @property
+    def history(self) -> int:
+        """The number of samples shown of every series."""
+        return self._history
+
+    @property
+    def samples_per_column(self) -> int:
+        """The number of samples decimated into every pixel column."""
+        return self._per_column
+
+    @property
+    def count(self) -> int:
+        """The number of samples appended to every series since the plot was cleared."""
+        return self._count
+
+    @property
+    def y_range(self) -> tuple[float, float]:
+        """Values at the bottom and the top of the plot."""
+        return self._y_range
+
+    @y_range.setter
+    def y_range(self, new_range: tuple[float, float]):
+        self._y_range = tuple(new_range)
+
+    def append(self, *values: float):
+        """Append a sample to every series.
+
+        Args:
+            values:
+                A value per series.
+
+        Raises:
+            ValueError: The number of values doesn't match the number of series.
+        """
+        if len(values) != self._series:
+            raise ValueError("the number of values doesn't match the number of series")
+        self._add(values)
+        self._write_column()
+
+    def extend(self, samples: Iterable[Sequence[float]]):
+        """Append many samples, e.g. those read since the last frame.
+
+        Every touched column is written once.
+
+        Args:
+            samples:
+                Samples, each of them has a value per series.
+
+        Raises:
+            ValueError: The number of values of a sample doesn't match the number of
+                series.
+        """
+        written = True
+        for values in samples:
+            if len(values) != self._series:
+                raise ValueError(
+                    "the number of values doesn't match the number of series"
+                )
+            if self._in_column == self._per_column and not written:
+                self._write_column()
+            self._add(values)
+            written = False
+        if not written:
+            self._write_column()
+
+    def clear(self):
+        """Remove all samples."""
+        self._reset()
+
+    def _add(self, values: Sequence[float]):
+        """Add a sample to the current column, starting a new column if it is full."""
+        if self._last is None:
+            self._low = list(values)
+            self._high = list(values)
+            self._filled = 1
+        elif self._in_column == self._per_column:
+            self._head = (self._head + 1) % self._columns
+            self._filled = min(self._filled + 1, self._columns)
+            self._in_column = 0
+            # Start from the last sample, so that columns join into a line.
+            self._low = list(self._last)
+            self._high = list(self._last)
+        low, high = self._low, self._high
+        for i, value in enumerate(values):
+            if value < low[i]:
+                low[i] = value
+            elif value > high[i]:
+                high[i] = value
+        self._last = values
+        self._in_column += 1
+        self._count += 1
+
+    def _write_column(self):
+        vertices = []
+        for low, high in zip(self._low, self._high):
+            vertices.append(low)
+            vertices.append(high)
+        start = 2 * self._series * self._head
+        self._vertex_list.value[start : start + len(vertices)] = vertices
+
+    def _update_batch(self):
+        batch = self._batch or _get_detached_batch()
+        if batch is not self._list_batch:
+            self._list_batch.migrate(self._vertex_list, GL_LINES, self._group, batch)
+            # Drop the group of the plot from the old batch when it is drawn or pruned.
+            self._list_batch.invalidate()
+            self._list_batch = batch
+
+    def _update_group(self):
+        self._group = _PlotGroup(self, self._group.program, self._parent_group)
+        self._list_batch.migrate(
+            self._vertex_list, GL_LINES, self._group, self._list_batch
+        )
+        self._list_batch.invalidate()
+
+    def _dispose(self):
+        self._vertex_list.delete()
+
+    def __del__(self):
+        # Like sprites of pyglet, free the vertex list if the plot is collected without
+        # being disposed.
+        try:
+            if not self._disposed:
+                self._vertex_list.delete()
+        except AttributeError:
+            pass
+
+    def _state(self) -> tuple:
+        return super()._state() + (self._count, self._head)
+
+
+__all__ = ("Plot", "default_colors", "get_plot_shader")
@@ -0,0 +1,443 @@
+"""Widgets to edit text.
+
+:py:class:`TextInput` edits a line of text, or many lines when it is multi-line. It is
+built on pyglet's :py:class:`~pyglet.text.layout.IncrementalTextLayout` and
+:py:class:`~pyglet.text.caret.Caret`, and only receives keyboard events while it is
+:py:attr:`~goldenui.manager.GUIManager.focus`, which it becomes when clicked.
+
+Laying out text costs time in proportion to its length, so a multi-line input keeps its
+lines in a list and only gives the layout a window of lines around the view. The window
+moves as the view scrolls, so documents of 100,000 lines are edited as fast as short
+ones. The caret can't select beyond the window, which is a few screens long.
+"""
+
+from itertools import chain
+from typing import Optional
+
+from pyglet.graphics import Batch, Group
+from pyglet.text.caret import Caret
+from pyglet.text.document import UnformattedDocument
+from pyglet.text.layout import IncrementalTextLayout
+from pyglet.window import mouse
+
+from goldenui import is_sphinx_run
+from goldenui.group import get_group, migrate_vertex_lists
+from goldenui.patch import NinePatch
+from goldenui.resources import loader
+from goldenui.widget.base import WidgetBase, _get_detached_batch
+
+text_color = (255, 255, 255, 255)
+disabled_text_color = (170, 170, 170, 255)
+# Space between the frame and the text.
+padding_x = 14
+padding_y = 6
+text_input_image = []
+# The frame is cut from the pressed button, whose corners are 12 by 5 pixels and whose
+# row 19 from the bottom is plain.
+if not is_sphinx_run:
+    _left, _middle, _right = (
+        loader.image(f"buttons/pressed_{part}.png")
+        for part in ["left", "middle", "right"]
+    )
+    for _y, _height in [(23, 5), (19, 1), (0, 5)]:
+        text_input_image.extend(
+            [
+                _left.get_region(0, _y, 12, _height),
+                _middle.get_region(0, _y, _middle.width, _height),
+                _right.get_region(_right.width - 12, _y, 12, _height),
+            ]
+        )
+
+
+class TextInput(WidgetBase):
+    """A box to edit single-line or multi-line text."""
+
+    __slots__ = (
+        "_multiline",
+        "_frame",
+        "_document",
+        "_layout",
+        "_caret",
+        "_lines",
+        "_first",
+        "_window_len",
+        "_syncing",
+        "_selecting",
+    )
+
+    def __init__(
+        self,
+        text: str = "",
+        x: int = 0,
+        y: int = 0,
+        width: int = 0,
+        height: int = 0,
+        *,
+        multiline: bool = False,
+        enabled: bool = True,
+        font_name: Optional[str] = None,
+        font_size: Optional[int] = None,
+        batch: Optional[Batch] = None,
+        group: Optional[Group] = None,
+    ):
+        """Create a ``TextInput``.
+
+        Args:
+            text:
+                Initial text.
+            x:
+                X coordinate of the input.
+            y:
+                Y coordinate of the input.
+            width:
+                Width of the input.
+            height:
+                Height of the input.
+            multiline:
+                Whether the text can have several lines. Lines are not wrapped.
+            enabled:
+                Whether allow user input.
+            font_name:
+                Font family name(s) for text.
+            font_size:
+                Font size for text.
+            batch:
+                Optional batch to add the input to.
+            group:
+                Optional parent group of the input.
+        """
+        super().__init__(x, y, width, height, enabled=enabled, batch=batch, group=group)
+        self._multiline = multiline
+        self._syncing = False
+        self._selecting = False
+        # Like the patch of a button, the frame stays out of the default batch of pyglet.
+        self._frame = NinePatch(
+            x,
+            y,
+            width,
+            height,
+            *text_input_image,
+            batch=batch or _get_detached_batch(),
+            group=get_group(order=0, parent=group),
+        )
+        if multiline:
+            self._lines = text.split("\n")
+        else:
+            self._lines = [text.replace("\n", " ")]
+        self._first = 0
+        self._window_len = 1
+        self._document = UnformattedDocument(self._lines[0])
+        self._document.set_style(
+            0,
+            0,
+            {"font_name": font_name, "font_size": font_size, "color": text_color},
+        )
+        self._layout = IncrementalTextLayout(
+            self._document,
+            max(1, width - 2 * padding_x),
+            max(1, height - 2 * padding_y),
+            x + padding_x,
+            y + padding_y,
+            multiline=multiline,
+            wrap_lines=False,
+            batch=batch,
+            group=get_group(order=1, parent=group),
+        )
+        self._caret = Caret(self._layout, color=text_color[:3])
+        self._caret.visible = False
+        self._load_window(0)
+        self._document.push_handlers(
+            on_insert_text=self._on_document_change,
+            on_delete_text=self._on_document_change,
+        )
+        self._set_enabled(enabled)
+
+    @property
+    def text(self) -> str:
+        """The whole text.
+
+        Setting it lays out the text again, use :py:meth:`.append_text` to add text.
+        """
+        return "\n".join(self._lines)
+
+    @text.setter
+    def text(self, text: str):
+        if self._multiline:
+            self._lines = text.split("\n")
+        else:
+            self._lines = [text.replace("\n", " ")]
+        self._load_window(0)
+        self._caret.position = 0
+        self._caret.mark = None
+
+    @property
+    def value(self) -> str:
+        """The whole text, like :py:attr:`.text`."""
+        return self.text
+
+    @value.setter
+    def value(self, value: str):
+        self.text = value
+
+    @property
+    def multiline(self) -> bool:
+        """Whether the text can have several lines."""
+        return self._multiline
+
+    @property
+    def line_count(self) -> int:
+        """The number of lines of the text."""
+        return len(self._lines)
+
+    @property
+    def top_line(self) -> int:
+        """Index of the first line in view."""
+        return self._first + int(-self._layout.view_y // self._line_height())
+
+    @property
+    def focused(self) -> bool:
+        """Whether the input receives keyboard events.
+
+        It is the same as being :py:attr:`~goldenui.manager.GUIManager.focus` of the
+        manager, so the input must be in a manager, or inside one of its containers.
+        """
+        manager = self._get_manager()
+        return manager is not None and manager.focus is self
+
+    @focused.setter
+    def focused(self, focused: bool):
+        manager = self._get_manager()
+        if manager is None:
+            return
+        if focused:
+            manager.focus = self
+        elif manager.focus is self:
+            manager.focus = None
+
+    def append_text(self, text: str):
+        """Add text to the end.
+
+        Only the new text is laid out. If the end is in view, the view follows it, which
+        is what a log wants.
+
+        Args:
+            text:
+                The text to add.
+        """
+        if not self._multiline:
+            text = text.replace("\n", " ")
+        parts = text.split("\n")
+        window_at_end = self._first + self._window_len == len(self._lines)
+        following = window_at_end and self._at_bottom()
+        self._lines[-1] += parts[0]
+        self._lines.extend(parts[1:])
+        if window_at_end:
+            self._syncing = True
+            self._document.insert_text(len(self._document.text), text)
+            self._syncing = False
+            self._window_len += len(parts) - 1
+        if following:
+            self.scroll_to_line(len(self._lines))
+        else:
+            self._check_window()
+
+    def scroll_to_line(self, line: int):
+        """Scroll the view so that a line is at the top, or as close as possible.
+
+        Args:
+            line:
+                Index of the line.
+        """
+        line = max(0, min(line, len(self._lines) - 1))
+        visible = self._visible_lines()
+        end = self._first + self._window_len
+        # A line near the end of the text can't have a screen below it, e.g. in a log.
+        if not self._first <= line <= end - visible and not (
+            self._first <= line and end == len(self._lines)
+        ):
+            self._load_window(line - 2 * visible)
+        self._layout.view_y = -(line - self._first) * self._line_height()
+        self._check_window()
+
+    def _line_height(self) -> float:
+        line = self._layout.lines[0]
+        return line.ascent - line.descent
+
+    def _visible_lines(self) -> int:
+        return int(self._layout.height // self._line_height()) + 1
+
+    def _at_bottom(self) -> bool:
+        layout = self._layout
+        return layout.view_y <= layout.height - layout.content_height + 1
+
+    def _load_window(self, first: int):
+        """Give the layout the lines from ``first``, keeping the caret where it is."""
+        count = 5 * self._visible_lines() if self._multiline else 1
+        first = max(0, min(first, len(self._lines) - count))
+        location = self._caret_location() if self._window_len else (0, 0)
+        self._syncing = True
+        self._document.text = "\n".join(self._lines[first : first + count])
+        self._syncing = False
+        self._first = first
+        self._window_len = min(count, len(self._lines) - first)
+        line, column = location
+        line = max(first, min(line, first + self._window_len - 1))
+        column = min(column, len(self._lines[line]))
+        position = sum(len(text) + 1 for text in self._lines[first:line]) + column
+        self._caret.position = position
+        self._caret.mark = None
+
+    def _caret_location(self) -> tuple[int, int]:
+        """``(line, column)`` of the caret in the whole text."""
+        text = self._document.text
+        position = min(self._caret.position, len(text))
+        line = text.count("\n", 0, position)
+        column = position - (text.rfind("\n", 0, position) + 1)
+        return self._first + line, column
+
+    def _check_window(self):
+        """Move the window when the view comes close to its edges."""
+        if not self._multiline or self._selecting:
+            return
+        visible = self._visible_lines()
+        top = self.top_line
+        near_start = self._first > 0 and top - self._first < visible
+        near_end = (
+            self._first + self._window_len < len(self._lines)
+            and self._first + self._window_len - top < 2 * visible
+        )
+        if near_start or near_end or self._window_len > 10 * visible:
+            self._load_window(top - 2 * visible)
+            self._layout.view_y = -(top - self._first) * self._line_height()
+
+    def _on_document_change(self, *args):
+        if self._syncing:
+            return
+        # The window is a few screens long, so splitting it is cheap.
+        window = self._document.text.split("\n")
+        self._lines[self._first : self._first + self._window_len] = window
+        self._window_len = len(window)
+
+    def _set_enabled(self, enabled: bool):
+        color = text_color if enabled else disabled_text_color
+        self._document.set_style(0, len(self._document.text), {"color": color})
+        if not enabled:
+            self.focused = False
+
+    def _update_batch(self):
+        old_batch = self._frame.batch
+        self._frame.batch = self._batch or _get_detached_batch()
+        if self._frame.batch is not old_batch:
+            old_batch.invalidate()
+        layout, caret = self._layout, self._caret
+        batch = Batch() if self._batch is None else self._batch
+        # Setting the batch of a layout doesn't move lines which are laid out already.
+        vertex_lists = chain.from_iterable(line.vertex_lists for line in layout.lines)
+        migrate_vertex_lists(vertex_lists, layout._batch, batch)
+        migrate_vertex_lists([caret._list], caret._batch, batch)
+        layout._batch = caret._batch = batch
+        layout._own_batch = self._batch is None
+
+    def _dispose(self):
+        self._document.remove_handlers(
+            on_insert_text=self._on_document_change,
+            on_delete_text=self._on_document_change,
+        )
+        # Hiding the caret stops its blinking.
+        self._caret.visible = False
+        self._caret.delete()
+        self._layout.delete()
+        self._frame.delete()
+
+    def _update_group(self):
+        self._frame.group = get_group(order=0, parent=self._parent_group)
+        layout = self._layout
+        layout.group = get_group(order=1, parent=self._parent_group)
+        layout._invalid_vertex_lines.invalidate(0, len(layout.lines))
+        layout._update()
+        self._caret.layout = layout
+
+    def _update_position(self):
+        self._frame.update(x=self._x, y=self._y, width=self._width, height=self._height)
+        layout = self._layout
+        layout.begin_update()
+        layout.position = (self._x + padding_x, self._y + padding_y, 0)
+        layout.width = max(1, self._width - 2 * padding_x)
+        layout.height = max(1, self._height - 2 * padding_y)
+        layout.end_update()
+        self._check_window()
+
+    def _state(self) -> tuple:
+        return super()._state() + (self.text, self._caret_location())
+
+    def on_focus(self):
+        self._caret.visible = True
+
+    def on_blur(self):
+        self._caret.visible = False
+        self._caret.mark = None
+
+    def on_mouse_press(self, x: int, y: int, buttons: int, modifiers: int):
+        if not self._enabled:
+            return
+        if self._check_hit(x, y) < 0:
+            self.focused = False
+            return
+        if not buttons & mouse.LEFT:
+            return
+        self.focused = True
+        self._selecting = True
+        self._caret.on_mouse_press(x, y, buttons, modifiers)
+
+    def on_mouse_drag(
+        self, x: int, y: int, dx: int, dy: int, buttons: int, modifiers: int
+    ):
+        if self._selecting:
+            self._caret.on_mouse_drag(x, y, dx, dy, buttons, modifiers)
+
+    def on_mouse_release(self, x: int, y: int, buttons: int, modifiers: int):
+        if self._selecting:
+            self._selecting = False
+            self._check_window()
+
+    def on_mouse_scroll(self, x: int, y: int, scroll_x: int, scroll_y: int):
+        if not self._multiline or self._check_hit(x, y) < 0:
+            return
+        self.scroll_to_line(self.top_line - 3 * int(scroll_y))
+
+    def on_text(self, text: str):
+        if not self._enabled or not self.focused:
+            return
+        if not self._multiline and ("\r" in text or "\n" in text):
+            self.dispatch_event("on_commit", self.text)
+            return
+        self._caret.on_text(text)
+        self._check_window()
+
+    def on_text_motion(self, motion: int):
+        if not self._enabled or not self.focused:
+            return
+        self._caret.on_text_motion(motion)
+        self._check_window()
+
+    def on_text_motion_select(self, motion: int):
+        if not self._enabled or not self.focused:
+            return
+        self._caret.on_text_motion_select(motion)
+
+    if is_sphinx_run:
+
+        def on_commit(self, text: str):
+            """Enter is pressed in a single-line input.
+
+            Args:
+                text:
+                    The text of the input.
+            """
+            pass
+
+
+TextInput.register_event_type("on_commit")
+
+
+__all__ = ("TextInput",)